@@ -51,6 +51,8 @@ echo ""
 echo "1. In Terminal 1, run the backend:"
 echo "   cd \"$ROOT_DIR\""
 echo "   \"$VENV_DIR/bin/python\" backend/app.py"
+echo "   (development server; for production use:"
+echo "    \"$VENV_DIR/bin/gunicorn\" -c backend/gunicorn.conf.py)"
 echo ""
 echo "2a. (Static) In Terminal 2, start a web server for frontend:"
 echo "   cd \"$ROOT_DIR/frontend\""
@@ -1,706 +1,473 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, g, jsonify, request, stream_with_context
 from flask_cors import CORS
+import gc
 import json
 import math
 import os
-import re
+import shutil
+import tempfile
+import threading
+import time
+from collections import namedtuple
 from datetime import datetime
+from functools import partial
+
+import numpy as np
+
+import balancer
+from balancer import check_equations
+from calculators import calculate, calculate_many
+from catalog import CatalogLoader
+from chemical_resolver import ChemicalResolver
+from compression import compress_response
+from equations import split_equation
+from fast_json import FastJSONProvider
+from formula import parse_formula
+from findings_store import RETENTION, FindingsStore, build_finding, parse_import
+from kinetics import build_model, frames
+from lru import LRUCache
+from metrics import Metrics
+from reaction_index import ReactionIndex
+from reaction_query import SORT_FIELDS, ReactionQuery, ReactionQueryIndex
+from response_cache import ResponseCache
+from search_index import SearchIndex
+from simulation import (
+    TOOL_NOTES,
+    clamp_number,
+    describe_interaction,
+    estimate_ph,
+    reaction_rate,
+    reaction_rate_grid,
+    temperature_c,
+    temperature_grid,
+    tool_notes,
+)
+import equilibrium
+import jobs
+import spectroscopy
+import tasks
+import titration
 
 app = Flask(__name__)
-CORS(app)
-
-# Chemical Reactions Database (20+ reactions)
-REACTIONS = {
-    "combustion_methane": {
-        "id": "combustion_methane",
-        "name": "Combustion of Methane",
-        "equation": "CH₄ + 2O₂ → CO₂ + 2H₂O",
-        "category": "Combustion",
-        "description": "Methane burns in oxygen to produce carbon dioxide and water",
-        "reactants": [{"name": "Methane", "symbol": "CH₄", "amount": "1"}],
-        "products": [{"name": "Carbon Dioxide", "symbol": "CO₂", "amount": "1"}, {"name": "Water", "symbol": "H₂O", "amount": "2"}],
-        "type": "Exothermic",
-        "energyRelease": 890,
-        "color": "blue to yellow flame",
-        "hazard": "Highly flammable"
-    },
-    "rusting_iron": {
-        "id": "rusting_iron",
-        "name": "Rusting of Iron",
-        "equation": "4Fe + 3O₂ + 6H₂O → 4Fe(OH)₃",
-        "category": "Oxidation-Reduction",
-        "description": "Iron oxidizes when exposed to oxygen and water",
-        "reactants": [{"name": "Iron", "symbol": "Fe", "amount": "4"}],
-        "products": [{"name": "Iron(III) Hydroxide", "symbol": "Fe(OH)₃", "amount": "4"}],
-        "type": "Exothermic",
-        "energyRelease": 150,
-        "color": "Orange-brown precipitate",
-        "hazard": "Non-toxic but can be slippery"
-    },
-    "photosynthesis": {
-        "id": "photosynthesis",
-        "name": "Photosynthesis",
-        "equation": "6CO₂ + 6H₂O + light → C₆H₁₂O₆ + 6O₂",
-        "category": "Biochemical",
-        "description": "Plants convert light energy into chemical energy",
-        "reactants": [{"name": "Carbon Dioxide", "symbol": "CO₂", "amount": "6"}],
-        "products": [{"name": "Glucose", "symbol": "C₆H₁₂O₆", "amount": "1"}],
-        "type": "Endothermic",
-        "energyRelease": -2800,
-        "color": "No visible change",
-        "hazard": "Safe"
-    },
-    "decomposition_water": {
-        "id": "decomposition_water",
-        "name": "Electrolysis of Water",
-        "equation": "2H₂O + electrical energy → 2H₂ + O₂",
-        "category": "Decomposition",
-        "description": "Water decomposes into hydrogen and oxygen under electrical current",
-        "reactants": [{"name": "Water", "symbol": "H₂O", "amount": "2"}],
-        "products": [{"name": "Hydrogen Gas", "symbol": "H₂", "amount": "2"}, {"name": "Oxygen Gas", "symbol": "O₂", "amount": "1"}],
-        "type": "Endothermic",
-        "energyRelease": -286,
-        "color": "Bubbles at electrodes",
-        "hazard": "Explosive mixture"
-    },
-    "neutralization": {
-        "id": "neutralization",
-        "name": "Acid-Base Neutralization",
-        "equation": "HCl + NaOH → NaCl + H₂O",
-        "category": "Acid-Base",
-        "description": "Hydrochloric acid reacts with sodium hydroxide to form salt and water",
-        "reactants": [{"name": "Hydrochloric Acid", "symbol": "HCl", "amount": "1"}],
-        "products": [{"name": "Sodium Chloride", "symbol": "NaCl", "amount": "1"}],
-        "type": "Exothermic",
-        "energyRelease": 57.3,
-        "color": "Heat released",
-        "hazard": "Corrosive acids and bases"
-    },
-    "synthesis_ammonia": {
-        "id": "synthesis_ammonia",
-        "name": "Haber Process - Ammonia Synthesis",
-        "equation": "N₂ + 3H₂ ⇌ 2NH₃",
-        "category": "Synthesis",
-        "description": "Nitrogen and hydrogen form ammonia under high pressure and temperature",
-        "reactants": [{"name": "Nitrogen", "symbol": "N₂", "amount": "1"}],
-        "products": [{"name": "Ammonia", "symbol": "NH₃", "amount": "2"}],
-        "type": "Exothermic",
-        "energyRelease": 92,
-        "color": "Colorless gas",
-        "hazard": "Toxic gas, pungent odor"
-    },
-    "combustion_hydrogen": {
-        "id": "combustion_hydrogen",
-        "name": "Combustion of Hydrogen",
-        "equation": "2H₂ + O₂ → 2H₂O",
-        "category": "Combustion",
-        "description": "Hydrogen burns in oxygen producing water",
-        "reactants": [{"name": "Hydrogen Gas", "symbol": "H₂", "amount": "2"}],
-        "products": [{"name": "Water", "symbol": "H₂O", "amount": "2"}],
-        "type": "Exothermic",
-        "energyRelease": 286,
-        "color": "Blue flame with pale yellow border",
-        "hazard": "Highly explosive"
-    },
-    "thermal_decomposition_limestone": {
-        "id": "thermal_decomposition_limestone",
-        "name": "Thermal Decomposition of Limestone",
-        "equation": "CaCO₃ → CaO + CO₂",
-        "category": "Decomposition",
-        "description": "Calcium carbonate decomposes when heated to produce quicklime",
-        "reactants": [{"name": "Calcium Carbonate", "symbol": "CaCO₃", "amount": "1"}],
-        "products": [{"name": "Calcium Oxide", "symbol": "CaO", "amount": "1"}],
-        "type": "Endothermic",
-        "energyRelease": -178,
-        "color": "White to black",
-        "hazard": "Requires high heat"
-    },
-    "redox_copper_iron": {
-        "id": "redox_copper_iron",
-        "name": "Displacement - Iron and Copper",
-        "equation": "Fe + CuSO₄ → FeSO₄ + Cu",
-        "category": "Oxidation-Reduction",
-        "description": "Iron displaces copper from copper sulfate solution",
-        "reactants": [{"name": "Iron", "symbol": "Fe", "amount": "1"}],
-        "products": [{"name": "Copper", "symbol": "Cu", "amount": "1"}],
-        "type": "Exothermic",
-        "energyRelease": 67,
-        "color": "Blue solution becomes pale green/yellow",
-        "hazard": "Mild corrosive"
-    },
-    "combustion_ethanol": {
-        "id": "combustion_ethanol",
-        "name": "Combustion of Ethanol",
-        "equation": "C₂H₅OH + 3O₂ → 2CO₂ + 3H₂O",
-        "category": "Combustion",
-        "description": "Ethanol burns to produce carbon dioxide and water",
-        "reactants": [{"name": "Ethanol", "symbol": "C₂H₅OH", "amount": "1"}],
-        "products": [{"name": "Carbon Dioxide", "symbol": "CO₂", "amount": "2"}],
-        "type": "Exothermic",
-        "energyRelease": 1367,
-        "color": "Blue flame",
-        "hazard": "Flammable liquid"
-    },
-    "polymerization": {
-        "id": "polymerization",
-        "name": "Polymerization of Ethylene",
-        "equation": "n(C₂H₄) → (C₂H₄)ₙ",
-        "category": "Polymerization",
-        "description": "Ethylene monomers join to form polyethylene polymer",
-        "reactants": [{"name": "Ethylene", "symbol": "C₂H₄", "amount": "n"}],
-        "products": [{"name": "Polyethylene", "symbol": "(C₂H₄)ₙ", "amount": "1"}],
-        "type": "Exothermic",
-        "energyRelease": 101,
-        "color": "Colorless to white solid",
-        "hazard": "Non-toxic but flammable when hot"
-    },
-    "fermentation": {
-        "id": "fermentation",
-        "name": "Alcoholic Fermentation",
-        "equation": "C₆H₁₂O₆ → 2C₂H₅OH + 2CO₂",
-        "category": "Biochemical",
-        "description": "Glucose ferments to produce ethanol and carbon dioxide",
-        "reactants": [{"name": "Glucose", "symbol": "C₆H₁₂O₆", "amount": "1"}],
-        "products": [{"name": "Ethanol", "symbol": "C₂H₅OH", "amount": "2"}],
-        "type": "Exothermic",
-        "energyRelease": 235,
-        "color": "Clear solution with bubbles",
-        "hazard": "Non-toxic but produces flammable gas"
-    },
-    "synthesis_methyl_orange": {
-        "id": "synthesis_methyl_orange",
-        "name": "Synthesis of Methyl Orange",
-        "equation": "C₆H₅N₂⁺ + C₆H₄(OH)SO₃Na → Methyl Orange",
-        "category": "Organic Synthesis",
-        "description": "Formation of azo dye used as a pH indicator",
-        "reactants": [{"name": "Diazonium salt", "symbol": "ArN₂⁺", "amount": "1"}],
-        "products": [{"name": "Methyl Orange", "symbol": "C₁₄H₁₄N₃NaO₃S", "amount": "1"}],
-        "type": "Exothermic",
-        "energyRelease": 50,
-        "color": "Orange solution",
-        "hazard": "May contain toxic chemicals"
-    },
-    "titration_vinegar": {
-        "id": "titration_vinegar",
-        "name": "Titration - Vinegar Analysis",
-        "equation": "CH₃COOH + NaOH → CH₃COONa + H₂O",
-        "category": "Acid-Base",
-        "description": "Determination of acetic acid content in vinegar",
-        "reactants": [{"name": "Acetic Acid", "symbol": "CH₃COOH", "amount": "1"}],
-        "products": [{"name": "Sodium Acetate", "symbol": "CH₃COONa", "amount": "1"}],
-        "type": "Exothermic",
-        "energyRelease": 55,
-        "color": "Colorless to pink (with indicator)",
-        "hazard": "Weak acid, generally safe"
-    },
-    "synthesis_aspirin": {
-        "id": "synthesis_aspirin",
-        "name": "Aspirin Synthesis",
-        "equation": "C₆H₅COOH + (CH₃CO)₂O → C₆H₄(OCOCH₃)COOH + CH₃COOH",
-        "category": "Organic Synthesis",
-        "description": "Salicylic acid reacts with acetic anhydride to form aspirin",
-        "reactants": [{"name": "Salicylic Acid", "symbol": "C₆H₅COOH", "amount": "1"}],
-        "products": [{"name": "Acetylsalicylic Acid (Aspirin)", "symbol": "C₉H₈O₄", "amount": "1"}],
-        "type": "Exothermic",
-        "energyRelease": 60,
-        "color": "White crystalline solid",
-        "hazard": "Toxic in large amounts"
-    },
-    "esterification": {
-        "id": "esterification",
-        "name": "Esterification Reaction",
-        "equation": "CH₃COOH + C₂H₅OH ⇌ CH₃COOC₂H₅ + H₂O",
-        "category": "Organic Chemistry",
-        "description": "Acetic acid reacts with ethanol to form ethyl acetate",
-        "reactants": [{"name": "Acetic Acid", "symbol": "CH₃COOH", "amount": "1"}],
-        "products": [{"name": "Ethyl Acetate", "symbol": "CH₃COOC₂H₅", "amount": "1"}],
-        "type": "Reversible",
-        "energyRelease": 8,
-        "color": "Clear liquid",
-        "hazard": "Flammable"
-    },
-    "calcium_carbide_acetylene": {
-        "id": "calcium_carbide_acetylene",
-        "name": "Calcium Carbide and Water",
-        "equation": "CaC₂ + 2H₂O → Ca(OH)₂ + C₂H₂",
-        "category": "Synthesis",
-        "description": "Calcium carbide reacts with water to produce acetylene gas",
-        "reactants": [{"name": "Calcium Carbide", "symbol": "CaC₂", "amount": "1"}],
-        "products": [{"name": "Acetylene", "symbol": "C₂H₂", "amount": "1"}],
-        "type": "Exothermic",
-        "energyRelease": 130,
-        "color": "Colorless gas",
-        "hazard": "Highly flammable, toxic impurities"
-    },
-    "glucose_oxidation": {
-        "id": "glucose_oxidation",
-        "name": "Cellular Respiration - Glucose Oxidation",
-        "equation": "C₆H₁₂O₆ + 6O₂ → 6CO₂ + 6H₂O + energy (ATP)",
-        "category": "Biochemical",
-        "description": "Glucose oxidation provides energy for living cells",
-        "reactants": [{"name": "Glucose", "symbol": "C₆H₁₂O₆", "amount": "1"}],
-        "products": [{"name": "Carbon Dioxide", "symbol": "CO₂", "amount": "6"}],
-        "type": "Exothermic",
-        "energyRelease": 2808,
-        "color": "No visible change",
-        "hazard": "Safe biochemical process"
-    },
-    "silver_mirror_test": {
-        "id": "silver_mirror_test",
-        "name": "Silver Mirror Test (Tollens Test)",
-        "equation": "RCHO + 2[Ag(NH₃)₂]⁺ + 3OH⁻ → RCOONH₄ + 2Ag + 4NH₃ + H₂O",
-        "category": "Redox",
-        "description": "Detection of aldehydes by formation of silver mirror",
-        "reactants": [{"name": "Aldehyde", "symbol": "RCHO", "amount": "1"}],
-        "products": [{"name": "Silver Metal", "symbol": "Ag", "amount": "2"}],
-        "type": "Exothermic",
-        "energyRelease": 75,
-        "color": "Silver mirror formation",
-        "hazard": "Explosive when dry"
-    },
-    "thermite_reaction": {
-        "id": "thermite_reaction",
-        "name": "Thermite Reaction",
-        "equation": "2Al + Fe₂O₃ → 2Fe + Al₂O₃",
-        "category": "Exothermic",
-        "description": "Aluminum reduces iron oxide with extreme heat release",
-        "reactants": [{"name": "Aluminum", "symbol": "Al", "amount": "2"}],
-        "products": [{"name": "Iron", "symbol": "Fe", "amount": "2"}],
-        "type": "Exothermic",
-        "energyRelease": 3350,
-        "color": "Bright white flame, molten iron",
-        "hazard": "Extremely hot, cannot be extinguished with water"
-    },
-    "iodine_clock": {
-        "id": "iodine_clock",
-        "name": "Iodine Clock Reaction",
-        "equation": "H₂O₂ + 2I⁻ + 2H⁺ ⇌ I₂ + 2H₂O",
-        "category": "Kinetics",
-        "description": "Oscillating chemical reaction that changes color periodically",
-        "reactants": [{"name": "Hydrogen Peroxide", "symbol": "H₂O₂", "amount": "1"}],
-        "products": [{"name": "Iodine", "symbol": "I₂", "amount": "1"}],
-        "type": "Exothermic",
-        "energyRelease": 100,
-        "color": "Blue-to-clear oscillations",
-        "hazard": "Iodine is toxic"
-    },
-    "precipitation_pbno3": {
-        "id": "precipitation_pbno3",
-        "name": "Precipitation of Lead Iodide",
-        "equation": "Pb(NO₃)₂ + 2KI → PbI₂↓ + 2KNO₃",
-        "category": "Precipitation",
-        "description": "Formation of bright yellow precipitate",
-        "reactants": [{"name": "Lead Nitrate", "symbol": "Pb(NO₃)₂", "amount": "1"}],
-        "products": [{"name": "Lead Iodide", "symbol": "PbI₂", "amount": "1"}],
-        "type": "Exothermic",
-        "energyRelease": 20,
-        "color": "Bright yellow precipitate",
-        "hazard": "Lead compound, toxic"
-    }
-}
+app.json = FastJSONProvider(app)
+CORS(app, expose_headers=["X-Next-Cursor", "X-Spectrum-Start-Nm", "X-Spectrum-Stop-Nm", "X-Spectrum-Points",
+                          "X-Spectrum-Rows", "X-Spectrum-Species"])
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+# VLAB_FINDINGS_DB and VLAB_CATALOG_DIR point a server (or a benchmark run) at other data.
+# VLAB_FINDINGS_RETENTION sets how many findings are kept (0 keeps all).
+FINDINGS_STORE = FindingsStore(
+    os.environ.get("VLAB_FINDINGS_DB") or os.path.join(DATA_DIR, "findings.db"),
+    retention=int(os.environ.get("VLAB_FINDINGS_RETENTION") or RETENTION) or None,
+    legacy_json=os.path.join(DATA_DIR, "findings.json"),
+)
+
+# The catalog loaded from data/catalog/ and everything derived from it; see reload_catalog().
+CATALOG_LOADER = CatalogLoader(os.environ.get("VLAB_CATALOG_DIR") or os.path.join(DATA_DIR, "catalog"))
+CATALOG = None
+
+METRICS = Metrics()
+METRICS.describe("http_requests_total", "counter", "HTTP requests by method, route and status")
+METRICS.describe("http_request_duration_seconds", "histogram", "Time spent in the handler (streamed bodies: until the stream starts)")
+METRICS.describe("http_request_size_bytes", "histogram", "Request body size")
+METRICS.describe("http_response_size_bytes", "histogram", "Response body size (streamed bodies are not counted)")
+METRICS.describe("reaction_match_seconds", "histogram", "Reaction index lookup time in run-experiment")
+METRICS.describe("findings_write_seconds", "histogram", "Findings store write time")
+METRICS.describe("findings_import_seconds", "histogram", "Bulk findings import time")
+METRICS.describe("findings_imported_total", "counter", "Findings stored by bulk imports")
+METRICS.describe("findings_import_rejected_total", "counter", "Bulk import lines rejected as invalid")
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
 
-# Tools and Features (30+ tools)
-TOOLS = [
-    {"id": "reaction_explorer", "name": "Reaction Explorer", "description": "Browse and search chemical reactions", "category": "Learning"},
-    {"id": "molecular_weight_calc", "name": "Molecular Weight Calculator", "description": "Calculate molecular weights of compounds", "category": "Calculation"},
-    {"id": "molarity_calculator", "name": "Molarity Calculator", "description": "Calculate molarity, volume, and moles", "category": "Calculation"},
-    {"id": "ph_calculator", "name": "pH Calculator", "description": "Calculate pH and pOH values", "category": "Calculation"},
-    {"id": "electron_config", "name": "Electron Configuration", "description": "Determine electron configurations", "category": "Atomic"},
-    {"id": "lewis_structures", "name": "Lewis Structure Generator", "description": "Generate Lewis dot structures", "category": "Visualization"},
-    {"id": "vsepr_predictor", "name": "VSEPR Predictor", "description": "Predict molecular geometry", "category": "Visualization"},
-    {"id": "oxidation_states", "name": "Oxidation State Finder", "description": "Determine oxidation states", "category": "Calculation"},
-    {"id": "balancing_equations", "name": "Chemical Equation Balancer", "description": "Balance chemical equations", "category": "Tool"},
-    {"id": "percent_composition", "name": "Percent Composition Calculator", "description": "Calculate percent composition of elements", "category": "Calculation"},
-    {"id": "empirical_formula", "name": "Empirical Formula Finder", "description": "Determine empirical formulas", "category": "Calculation"},
-    {"id": "reaction_predictor", "name": "Reaction Type Predictor", "description": "Predict types of chemical reactions", "category": "Tool"},
-    {"id": "spectroscopy_simulator", "name": "Spectroscopy Simulator", "description": "Simulate UV-Vis absorption spectra", "category": "Simulation"},
-    {"id": "phase_diagram", "name": "Phase Diagram Viewer", "description": "View phase diagrams of substances", "category": "Visualization"},
-    {"id": "titration_simulator", "name": "Titration Simulator", "description": "Simulate acid-base titrations", "category": "Simulation"},
-    {"id": "stoichiometry_solver", "name": "Stoichiometry Problem Solver", "description": "Solve stoichiometry problems", "category": "Calculation"},
-    {"id": "thermal_properties", "name": "Thermal Properties Calculator", "description": "Calculate heat and thermodynamics", "category": "Calculation"},
-    {"id": "solubility_predictor", "name": "Solubility Predictor", "description": "Predict solubility of compounds", "category": "Prediction"},
-    {"id": "kinetics_simulator", "name": "Reaction Kinetics Simulator", "description": "Simulate reaction rates and mechanisms", "category": "Simulation"},
-    {"id": "bonding_analyzer", "name": "Chemical Bonding Analyzer", "description": "Analyze types of chemical bonds", "category": "Analysis"},
-    {"id": "isotope_calculator", "name": "Isotope Calculator", "description": "Calculate properties of isotopes", "category": "Calculation"},
-    {"id": "gas_law_calculator", "name": "Gas Law Calculator", "description": "Calculate using ideal gas law", "category": "Calculation"},
-    {"id": "buffer_solver", "name": "Buffer Solution Solver", "description": "Calculate buffer pH and capacity", "category": "Calculation"},
-    {"id": "redox_analyzer", "name": "Redox Analyzer", "description": "Analyze redox reactions", "category": "Analysis"},
-    {"id": "periodic_table", "name": "Interactive Periodic Table", "description": "Explore periodic table with properties", "category": "Reference"},
-    {"id": "nomenclature_tool", "name": "Chemical Nomenclature Tool", "description": "Name and identify chemical compounds", "category": "Tool"},
-    {"id": "reaction_energy", "name": "Reaction Energy Calculator", "description": "Calculate enthalpy and Gibbs energy", "category": "Calculation"},
-    {"id": "virtual_lab", "name": "Virtual Lab Experiments", "description": "Perform virtual experiments safely", "category": "Simulation"},
-    {"id": "molecular_visualizer", "name": "3D Molecular Visualizer", "description": "View 3D molecular structures", "category": "Visualization"},
-    {"id": "quiz_generator", "name": "Chemistry Quiz Generator", "description": "Generate chemistry quizzes", "category": "Learning"},
-]
+@app.after_request
+def record_request_metrics(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        METRICS.observe_request(request.method, route, response.status_code, time.perf_counter() - started,
+                                request.content_length, response.calculate_content_length())
+    return response
+
+# Registered after the metrics hook so it runs first and the metrics see the bytes sent.
+@app.after_request
+def compress(response):
+    return compress_response(response, request)
+
+def parse_fields(args):
+    """``?fields=id,name`` as a sorted tuple of names, or None for every field."""
+    fields = args.get('fields')
+    if not fields:
+        return None
+    return tuple(sorted({f.strip() for f in fields.split(',') if f.strip()})) or None
 
 # Routes
 @app.route('/api/reactions', methods=['GET'])
 def get_reactions():
-    """Get all reactions or filtered reactions"""
+    """Get all reactions or filtered reactions (``?category=``, ``?fields=id,name``)"""
     category = request.args.get('category')
-    if category:
-        filtered = {k: v for k, v in REACTIONS.items() if v['category'].lower() == category.lower()}
-        return jsonify(list(filtered.values()))
-    return jsonify(list(REACTIONS.values()))
+    key = ('reactions', category.lower()) if category else ('reactions',)
+    return CATALOG.response_cache.respond(key, request, default=('empty',), fields=parse_fields(request.args))
 
 @app.route('/api/reactions/<reaction_id>', methods=['GET'])
 def get_reaction(reaction_id):
     """Get specific reaction details"""
-    reaction = REACTIONS.get(reaction_id)
+    reaction = CATALOG.reactions.get(reaction_id)
     if reaction:
         return jsonify(reaction)
     return jsonify({"error": "Reaction not found"}), 404
 
 @app.route('/api/tools', methods=['GET'])
 def get_tools():
-    """Get all tools"""
+    """Get all tools (``?category=``, ``?fields=id,name``)"""
     category = request.args.get('category')
-    if category:
-        filtered = [t for t in TOOLS if t['category'].lower() == category.lower()]
-        return jsonify(filtered)
-    return jsonify(TOOLS)
+    key = ('tools', category.lower()) if category else ('tools',)
+    return CATALOG.response_cache.respond(key, request, default=('empty',), fields=parse_fields(request.args))
 
 @app.route('/api/tools/<tool_id>', methods=['GET'])
 def get_tool(tool_id):
     """Get specific tool details"""
-    tool = next((t for t in TOOLS if t['id'] == tool_id), None)
+    tool = next((t for t in CATALOG.tools if t['id'] == tool_id), None)
     if tool:
         return jsonify(tool)
     return jsonify({"error": "Tool not found"}), 404
 
+def run_calculator(operation):
+    try:
+        return jsonify(calculate(operation, request.json))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
 @app.route('/api/calculate/molecular-weight', methods=['POST'])
 def calculate_molecular_weight():
     """Calculate molecular weight"""
-    data = request.json
-    formula = data.get('formula', '')
-    # Simplified atomic weights
-    atomic_weights = {
-        'H': 1, 'C': 12, 'N': 14, 'O': 16, 'S': 32, 'P': 31,
-        'Na': 23, 'K': 39, 'Ca': 40, 'Mg': 24, 'Fe': 56, 'Cu': 64,
-        'Cl': 35.5, 'Br': 80, 'I': 127, 'F': 19
-    }
-    try:
-        weight = 0
-        i = 0
-        while i < len(formula):
-            if formula[i].isupper():
-                element = formula[i]
-                i += 1
-                if i < len(formula) and formula[i].islower():
-                    element += formula[i]
-                    i += 1
-                count = ''
-                while i < len(formula) and formula[i].isdigit():
-                    count += formula[i]
-                    i += 1
-                count = int(count) if count else 1
-                weight += atomic_weights.get(element, 0) * count
-        return jsonify({"formula": formula, "molecular_weight": weight})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 400
+    return run_calculator('molecular-weight')
 
 @app.route('/api/calculate/molarity', methods=['POST'])
 def calculate_molarity():
     """Calculate molarity"""
-    data = request.json
-    moles = data.get('moles')
-    volume = data.get('volume')  # in liters
-    if moles and volume:
-        molarity = moles / volume
-        return jsonify({"moles": moles, "volume": volume, "molarity": molarity})
-    return jsonify({"error": "Missing parameters"}), 400
+    return run_calculator('molarity')
 
 @app.route('/api/calculate/ph', methods=['POST'])
 def calculate_ph():
     """Calculate pH"""
-    data = request.json
-    h_concentration = data.get('h_concentration')
-    if h_concentration:
-        import math
-        ph = -math.log10(h_concentration)
-        poh = 14 - ph
-        return jsonify({"h_concentration": h_concentration, "pH": round(ph, 2), "pOH": round(poh, 2)})
-    return jsonify({"error": "Missing H+ concentration"}), 400
+    return run_calculator('ph')
 
 @app.route('/api/calculate/stoichiometry', methods=['POST'])
 def calculate_stoichiometry():
     """Calculate stoichiometry"""
+    return run_calculator('stoichiometry')
+
+@app.route('/api/calculate/percent-composition', methods=['POST'])
+def calculate_percent_composition():
+    """Calculate mass percent of each element"""
+    return run_calculator('percent-composition')
+
+@app.route('/api/calculate/empirical-formula', methods=['POST'])
+def calculate_empirical_formula():
+    """Find the empirical formula from a formula or element masses"""
+    return run_calculator('empirical-formula')
+
+@app.route('/api/calculate/balance-equation', methods=['POST'])
+def calculate_balance_equation():
+    """Balance a chemical equation"""
+    return run_calculator('balance-equation')
+
+@app.route('/api/calculate/titration-curve', methods=['POST'])
+def calculate_titration_curve():
+    """Titration curve (pH vs titrant volume) with equivalence points"""
+    return run_calculator('titration-curve')
+
+@app.route('/api/calculate/buffer', methods=['POST'])
+def calculate_buffer():
+    """pH and buffer capacity of a weak acid/base with its conjugate salt"""
+    return run_calculator('buffer')
+
+BATCH_MAX_OPERATIONS = 5000
+
+@app.route('/api/calculate/batch', methods=['POST'])
+def calculate_batch():
+    """Run many calculator operations in one request.
+
+    Body: {"operations": [{"op": "molarity", "moles": 1, "volume": 2}, ...]}.
+    Results come back in order; an invalid item gets {"error": ...} without
+    failing the rest of the batch.
+    """
     data = request.json
-    reactant_moles = data.get('reactant_moles')
-    reactant_coeff = data.get('reactant_coeff')
-    product_coeff = data.get('product_coeff')
-    
-    if all([reactant_moles, reactant_coeff, product_coeff]):
-        product_moles = (reactant_moles * product_coeff) / reactant_coeff
-        return jsonify({
-            "reactant_moles": reactant_moles,
-            "product_moles": round(product_moles, 4)
-        })
-    return jsonify({"error": "Missing parameters"}), 400
+    operations = data.get('operations') if isinstance(data, dict) else None
+    if not isinstance(operations, list):
+        return jsonify({"error": "operations must be a list"}), 400
+    if len(operations) > BATCH_MAX_OPERATIONS:
+        return jsonify({"error": f"At most {BATCH_MAX_OPERATIONS} operations per batch"}), 400
+    return jsonify({"results": calculate_many(operations)})
+
+SEARCH_MAX_LIMIT = 500
 
 @app.route('/api/search', methods=['GET'])
 def search():
-    """Search reactions by name or properties"""
-    query = request.args.get('q', '').lower()
-    results = []
-    
-    for reaction in REACTIONS.values():
-        if (query in reaction['name'].lower() or 
-            query in reaction['equation'].lower() or
-            query in reaction['category'].lower()):
-            results.append(reaction)
-    
-    return jsonify(results)
+    """Search reactions by name or properties, best matches first
+
+    Every match is returned unless ``limit`` (at most SEARCH_MAX_LIMIT) is
+    given; type-ahead clients should pass one.
+    """
+    query = request.args.get('q', '')
+    limit = request.args.get('limit')
+    if limit is not None:
+        try:
+            limit = max(1, min(SEARCH_MAX_LIMIT, int(limit)))
+        except ValueError:
+            return jsonify({"error": "limit must be an integer"}), 400
+    return jsonify(CATALOG.search_index.search(query, limit=limit))
+
+QUERY_DEFAULT_LIMIT = 50
+QUERY_MAX_LIMIT = 500
+
+def _list_arg(args, name):
+    """Repeated and comma-separated values of ``name`` (``?type=a,b&type=c``)."""
+    return tuple(v.strip() for value in args.getlist(name) for v in value.split(',') if v.strip())
+
+def parse_reaction_query(args):
+    """Validate GET /api/reactions/query parameters; raises ValueError on bad input."""
+    energy = {}
+    for name in ('min_energy', 'max_energy'):
+        value = args.get(name)
+        try:
+            energy[name] = float(value) if value else None
+        except ValueError:
+            raise ValueError(f"{name} must be a number") from None
+        if energy[name] is not None and not math.isfinite(energy[name]):
+            raise ValueError(f"{name} must be a finite number")
+    sort = args.get('sort') or None
+    if sort and sort.lstrip('-') not in SORT_FIELDS:
+        raise ValueError(f"sort must be one of {', '.join(sorted(SORT_FIELDS))}, optionally prefixed with '-'")
+    try:
+        limit = int(args.get('limit', QUERY_DEFAULT_LIMIT))
+        offset = int(args.get('offset', 0))
+    except ValueError:
+        raise ValueError("limit and offset must be integers") from None
+    return ReactionQuery(
+        categories=_list_arg(args, 'category'),
+        types=_list_arg(args, 'type'),
+        hazard=_list_arg(args, 'hazard'),
+        reactants=_list_arg(args, 'reactant'),
+        products=_list_arg(args, 'product'),
+        sort=sort,
+        offset=max(0, offset),
+        limit=max(1, min(QUERY_MAX_LIMIT, limit)),
+        **energy,
+    )
+
+@app.route('/api/reactions/query', methods=['GET'])
+def query_reactions():
+    """Filter, sort and page reactions
+
+    Filters (all optional, combined with AND): ``category`` and ``type``
+    (comma-separated, any of), ``hazard`` (keywords that must all appear),
+    ``min_energy``/``max_energy`` (energyRelease range), ``reactant`` and
+    ``product`` (symbols that must all appear; ``H2O`` matches ``H₂O``).
+    ``sort`` is one of name, id, category, type or energy, with ``-`` for
+    descending; ``limit``/``offset`` page the result and ``fields`` selects
+    fields.
+    """
+    try:
+        query = parse_reaction_query(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    total, reactions = CATALOG.query_index.query(query)
+    fields = parse_fields(request.args)
+    if fields:
+        reactions = [{f: r[f] for f in fields if f in r} for r in reactions]
+    return jsonify({"total": total, "offset": query.offset, "limit": query.limit, "reactions": reactions})
 
 @app.route('/api/categories', methods=['GET'])
 def get_categories():
     """Get all reaction categories"""
-    categories = set(r['category'] for r in REACTIONS.values())
-    return jsonify(sorted(list(categories)))
+    return CATALOG.response_cache.respond(('categories',), request)
 
 @app.route('/api/tool-categories', methods=['GET'])
 def get_tool_categories():
     """Get all tool categories"""
-    categories = set(t['category'] for t in TOOLS)
-    return jsonify(sorted(list(categories)))
-
-# Virtual Lab Experiments Database
-EXPERIMENTS = {
-    "chem_combustion": {
-        "id": "chem_combustion",
-        "lab": "Chemistry",
-        "name": "Combustion Reaction",
-        "description": "Combine methane with oxygen to observe combustion",
-        "chemicals": ["Methane (CH₄)", "Oxygen (O₂)"],
-        "result": "CO₂ + H₂O + Energy",
-        "color": "Blue flame",
-        "safety": "Highly flammable",
-        "duration": "Instant"
-    },
-    "chem_acid_base": {
-        "id": "chem_acid_base",
-        "lab": "Chemistry",
-        "name": "Acid-Base Reaction",
-        "description": "Mix acid with base to neutralize",
-        "chemicals": ["HCl", "NaOH"],
-        "result": "NaCl + H₂O (Heat released)",
-        "color": "Solution becomes warm",
-        "safety": "Corrosive - handle carefully",
-        "duration": "Instant"
-    },
-    "chem_precipitation": {
-        "id": "chem_precipitation",
-        "lab": "Chemistry",
-        "name": "Precipitation Reaction",
-        "description": "Combine ions to form insoluble salt",
-        "chemicals": ["Pb(NO₃)₂", "KI"],
-        "result": "Bright yellow PbI₂ precipitate",
-        "color": "Yellow solid forms",
-        "safety": "Lead compound - toxic",
-        "duration": "Instant"
-    },
-    "chem_color_change": {
-        "id": "chem_color_change",
-        "lab": "Chemistry",
-        "name": "Redox Color Change",
-        "description": "Iron reacts with copper sulfate",
-        "chemicals": ["Fe", "CuSO₄"],
-        "result": "Red copper metal + pale green FeSO₄",
-        "color": "Blue → pale green",
-        "safety": "Generally safe",
-        "duration": "1-2 minutes"
-    },
-    "chem_thermite": {
-        "id": "chem_thermite",
-        "lab": "Chemistry",
-        "name": "Thermite Reaction",
-        "description": "Aluminum reduces iron oxide with extreme heat",
-        "chemicals": ["Al", "Fe₂O₃"],
-        "result": "Molten iron + Al₂O₃",
-        "color": "Bright white flame, molten iron",
-        "safety": "EXTREMELY HOT - Do not touch",
-        "duration": "Seconds"
-    },
-    "bio_enzyme": {
-        "id": "bio_enzyme",
-        "lab": "Biology",
-        "name": "Enzyme Activity",
-        "description": "Catalase enzyme breaks down hydrogen peroxide",
-        "chemicals": ["H₂O₂", "Enzyme (from liver)"],
-        "result": "O₂ gas + H₂O (Fizzing reaction)",
-        "color": "Bubbling/foaming",
-        "safety": "H₂O₂ can irritate skin",
-        "duration": "30 seconds"
-    },
-    "bio_fermentation": {
-        "id": "bio_fermentation",
-        "lab": "Biology",
-        "name": "Fermentation",
-        "description": "Yeast ferments glucose to ethanol and CO₂",
-        "chemicals": ["Yeast", "Glucose", "Water"],
-        "result": "Ethanol + CO₂ (bubbles))",
-        "color": "Clear solution with bubbles",
-        "safety": "Non-toxic but produces flammable gas",
-        "duration": "Hours"
-    },
-    "bio_protein": {
-        "id": "bio_protein",
-        "lab": "Biology",
-        "name": "Protein Denaturation",
-        "description": "Heat causes proteins to denature and coagulate",
-        "chemicals": ["Egg white", "Heat"],
-        "result": "Solid white precipitate",
-        "color": "Clear → opaque white",
-        "safety": "Safe",
-        "duration": "Minutes"
-    },
-    "bio_dna": {
-        "id": "bio_dna",
-        "lab": "Biology",
-        "name": "DNA Extraction",
-        "description": "Extract DNA from cell nucleus using detergent",
-        "chemicals": ["Onion cells", "Detergent", "Salt water", "Ethanol"],
-        "result": "White DNA strands precipitate",
-        "color": "White threadlike material",
-        "safety": "Generally safe",
-        "duration": "10 minutes"
-    },
-    "phy_density": {
-        "id": "phy_density",
-        "lab": "Physics",
-        "name": "Density Separation",
-        "description": "Layer liquids of different densities",
-        "chemicals": ["Honey", "Water", "Oil", "Alcohol"],
-        "result": "Clear layers based on density",
-        "color": "Layered colors",
-        "safety": "Safe",
-        "duration": "Minutes"
-    },
-    "phy_crystal": {
-        "id": "phy_crystal",
-        "lab": "Physics",
-        "name": "Crystal Growth",
-        "description": "Grow salt or sugar crystals through crystallization",
-        "chemicals": ["Salt/Sugar", "Hot water"],
-        "result": "Beautiful crystal formations",
-        "color": "Clear/White crystals",
-        "safety": "Safe",
-        "duration": "Hours to days"
-    },
-    "phy_osmosis": {
-        "id": "phy_osmosis",
-        "lab": "Physics",
-        "name": "Osmosis Demonstration",
-        "description": "Water crosses semipermeable membrane",
-        "chemicals": ["Salt water", "Fresh water", "Membrane"],
-        "result": "Water level increases in salt solution",
-        "color": "Solutions change concentration",
-        "safety": "Safe",
-        "duration": "30 minutes"
-    }
-}
+    return CATALOG.response_cache.respond(('tool-categories',), request)
 
-# Chemical inventory for dragging
-CHEMICALS = {
-    "methane": {"name": "Methane (CH₄)", "symbol": "CH₄", "category": "Gas", "color": "#87CEEB"},
-    "oxygen": {"name": "Oxygen (O₂)", "symbol": "O₂", "category": "Gas", "color": "#87CEEB"},
-    "hydrogen": {"name": "Hydrogen Gas (H₂)", "symbol": "H₂", "category": "Gas", "color": "#B3E5FC"},
-    "nitrogen": {"name": "Nitrogen (N₂)", "symbol": "N₂", "category": "Gas", "color": "#A5B4FC"},
-    "co2": {"name": "Carbon Dioxide (CO₂)", "symbol": "CO₂", "category": "Gas", "color": "#CBD5E1"},
-    "hcl": {"name": "Hydrochloric Acid (HCl)", "symbol": "HCl", "category": "Acid", "color": "#FF6B6B"},
-    "naoh": {"name": "Sodium Hydroxide (NaOH)", "symbol": "NaOH", "category": "Base", "color": "#4ECDC4"},
-    "acetic": {"name": "Acetic Acid (CH₃COOH)", "symbol": "CH₃COOH", "category": "Acid", "color": "#FB7185"},
-    "pbno3": {"name": "Lead Nitrate Pb(NO₃)₂", "symbol": "Pb(NO₃)₂", "category": "Salt", "color": "#FFE66D"},
-    "ki": {"name": "Potassium Iodide (KI)", "symbol": "KI", "category": "Salt", "color": "#FFE66D"},
-    "al": {"name": "Aluminum (Al)", "symbol": "Al", "category": "Metal", "color": "#C0C0C0"},
-    "fe": {"name": "Iron (Fe)", "symbol": "Fe", "category": "Metal", "color": "#B45309"},
-    "fe2o3": {"name": "Iron Oxide (Fe₂O₃)", "symbol": "Fe₂O₃", "category": "Compound", "color": "#8B4513"},
-    "caco3": {"name": "Calcium Carbonate (CaCO₃)", "symbol": "CaCO₃", "category": "Salt", "color": "#F8FAFC"},
-    "cac2": {"name": "Calcium Carbide (CaC₂)", "symbol": "CaC₂", "category": "Compound", "color": "#E2E8F0"},
-    "h2o2": {"name": "Hydrogen Peroxide (H₂O₂)", "symbol": "H₂O₂", "category": "Chemical", "color": "#E0E0E0"},
-    "enzyme": {"name": "Catalase Enzyme", "symbol": "Enzyme", "category": "Biological", "color": "#90EE90"},
-    "yeast": {"name": "Yeast", "symbol": "Yeast", "category": "Biological", "color": "#D4A574"},
-    "glucose": {"name": "Glucose", "symbol": "C₆H₁₂O₆", "category": "Sugar", "color": "#FFB6C1"},
-    "egg": {"name": "Egg White", "symbol": "Protein", "category": "Biological", "color": "#FFFACD"},
-    "heat": {"name": "Heat", "symbol": "Heat", "category": "Energy", "color": "#FF4500"},
-    "salt": {"name": "Salt (NaCl)", "symbol": "NaCl", "category": "Salt", "color": "#FFFFFF"},
-    "sugar": {"name": "Sugar", "symbol": "C₁₂H₂₂O₁₁", "category": "Sugar", "color": "#FFD700"},
-    "water": {"name": "Water (H₂O)", "symbol": "H₂O", "category": "Solvent", "color": "#87CEEB"},
-    "ethylene": {"name": "Ethylene (C₂H₄)", "symbol": "C₂H₄", "category": "Gas", "color": "#93C5FD"},
-    "salicylic": {"name": "Salicylic Acid (C₆H₅COOH)", "symbol": "C₆H₅COOH", "category": "Acid", "color": "#FCA5A5"},
-    "diazonium": {"name": "Diazonium Salt (ArN₂⁺)", "symbol": "ArN₂⁺", "category": "Chemical", "color": "#FDE68A"},
-    "aldehyde": {"name": "Aldehyde (RCHO)", "symbol": "RCHO", "category": "Organic", "color": "#D8B4FE"},
-    "oil": {"name": "Oil", "symbol": "Oil", "category": "Liquid", "color": "#FFD700"},
-    "alcohol": {"name": "Alcohol", "symbol": "C₂H₅OH", "category": "Liquid", "color": "#E6E6FA"},
-    "honey": {"name": "Honey", "symbol": "Honey", "category": "Liquid", "color": "#DAA520"}
-}
+CatalogState = namedtuple("CatalogState", [
+    "version", "reactions", "tools", "experiments", "chemicals",
+    "reaction_index", "search_index", "query_index", "response_cache", "chemical_resolver", "equation_problems",
+])
+CatalogState.__doc__ = """One catalog version with its lookup structures, swapped in as a whole."""
+
+# Serializes reloads; requests never take it.
+CATALOG_LOCK = threading.Lock()
+# run-experiment results keyed on the normalized mixture; cleared on catalog reload.
+EXPERIMENT_CACHE = LRUCache(maxsize=4096)
+
+def build_catalog_cache(catalog):
+    """Pre-serialize every catalog listing response, including each category filter."""
+    reactions, tools = catalog.reactions, catalog.tools
+    cache = ResponseCache(app.json.dumps)
+    reaction_categories = sorted(set(reactions.vocabulary('category')))
+    tool_categories = sorted(set(t['category'] for t in tools))
+
+    cache.put(('empty',), [])
+    cache.put_rows(('reactions',), reactions.rows)
+    for category in reaction_categories:
+        cache.put_rows(('reactions', category.lower()), partial(reactions.rows, reactions.category_rows(category)))
+    cache.put(('tools',), tools)
+    for category in tool_categories:
+        cache.put(('tools', category.lower()), [t for t in tools if t['category'].lower() == category.lower()])
+    cache.put(('chemicals',), list(catalog.chemicals.values()))
+    cache.put(('categories',), reaction_categories)
+    cache.put(('tool-categories',), tool_categories)
+
+    cache.put(('stats',), {
+        "total_reactions": len(reactions),
+        "total_tools": len(tools),
+        "total_experiments": len(catalog.experiments),
+        "categories": len(reaction_categories),
+        "exothermic": reactions.count_type('Exothermic'),
+        "endothermic": reactions.count_type('Endothermic')
+    })
+    return cache
+
+def build_catalog_state(catalog):
+    """Build the lookup structures for ``catalog`` (a Catalog or CatalogState) into a new CatalogState."""
+    return CatalogState(
+        version=catalog.version,
+        reactions=catalog.reactions,
+        tools=catalog.tools,
+        experiments=catalog.experiments,
+        chemicals=catalog.chemicals,
+        reaction_index=ReactionIndex(catalog.reactions),
+        search_index=SearchIndex(catalog.reactions),
+        query_index=ReactionQueryIndex(catalog.reactions),
+        response_cache=build_catalog_cache(catalog),
+        chemical_resolver=ChemicalResolver(catalog.chemicals),
+        # Also warms the balancer's memo cache with every catalog equation.
+        equation_problems=check_equations(catalog.reactions),
+    )
+
+def install_catalog(catalog):
+    """Rebuild the lookup structures for ``catalog`` and swap them in. Call with CATALOG_LOCK held.
+
+    Requests keep using the previous CATALOG until the single assignment below.
+    """
+    global CATALOG
+    # Frozen objects are never collected, so the previous catalog must be thawed to be freed.
+    gc.unfreeze()
+    state = build_catalog_state(catalog)
+    CATALOG = state
+    EXPERIMENT_CACHE.clear()
+    for reaction_id, problem in state.equation_problems.items():
+        app.logger.warning("Catalog reaction %s: %s", reaction_id, problem)
+    # The indexes are long-lived and acyclic; keep the cyclic GC from rescanning them.
+    # Collect first, so whatever the previous catalog left behind is not frozen with them.
+    gc.collect()
+    gc.freeze()
+
+def reload_catalog():
+    """Load the catalog data files and rebuild everything derived from them."""
+    with CATALOG_LOCK:
+        install_catalog(CATALOG_LOADER.load())
+
+@app.before_request
+def reload_catalog_if_changed():
+    """Hot reload: pick up a newly published catalog without restarting workers.
+
+    Only one thread rebuilds; any others that saw the change wait for it and
+    then find the manifest already loaded.
+    """
+    if CATALOG_LOADER.changed():
+        with CATALOG_LOCK:
+            if CATALOG_LOADER.stale():
+                install_catalog(CATALOG_LOADER.load())
+
+reload_catalog()
 
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
     """Get lab statistics"""
-    return jsonify({
-        "total_reactions": len(REACTIONS),
-        "total_tools": len(TOOLS),
-        "total_experiments": len(EXPERIMENTS),
-        "categories": len(set(r['category'] for r in REACTIONS.values())),
-        "exothermic": len([r for r in REACTIONS.values() if 'Exothermic' in r['type']]),
-        "endothermic": len([r for r in REACTIONS.values() if 'Endothermic' in r['type']])
-    })
+    return CATALOG.response_cache.respond(('stats',), request)
 
 @app.route('/api/experiments', methods=['GET'])
 def get_experiments():
     """Get all experiments or filtered by lab"""
     lab = request.args.get('lab')
     if lab:
-        filtered = {k: v for k, v in EXPERIMENTS.items() if v['lab'].lower() == lab.lower()}
+        filtered = {k: v for k, v in CATALOG.experiments.items() if v['lab'].lower() == lab.lower()}
         return jsonify(list(filtered.values()))
-    return jsonify(list(EXPERIMENTS.values()))
+    return jsonify(list(CATALOG.experiments.values()))
 
 @app.route('/api/experiments/<exp_id>', methods=['GET'])
 def get_experiment(exp_id):
     """Get specific experiment"""
-    experiment = EXPERIMENTS.get(exp_id)
+    experiment = CATALOG.experiments.get(exp_id)
     if experiment:
         return jsonify(experiment)
     return jsonify({"error": "Experiment not found"}), 404
 
 @app.route('/api/chemicals', methods=['GET'])
 def get_chemicals():
-    """Get all available chemicals"""
-    return jsonify(list(CHEMICALS.values()))
+    """Get all available chemicals (``?fields=name,symbol``)"""
+    return CATALOG.response_cache.respond(('chemicals',), request, fields=parse_fields(request.args))
 
-@app.route('/api/run-experiment', methods=['POST'])
-def run_experiment():
-    """Run a virtual experiment by mixing chemicals and using tools"""
-    data = request.json
-    chemicals_used = data.get('chemicals', []) or []
-    experiment_type = (data.get('type') or '').lower()
-    tools_used = data.get('tools', []) or []
-    heat_level = data.get('heat', 0) or 0
-    volume_ml = data.get('volume_ml', 250) or 250
+RESOLVE_MAX_QUERIES = 1000
+# Longer than any inventory name; keeps fuzzy matching cheap.
+CHEMICAL_QUERY_MAX_LENGTH = 128
+RESOLVE_MAX_SUGGESTIONS = 20
 
-    def clamp_number(value, min_value, max_value, default):
-        try:
-            number = float(value)
-        except (TypeError, ValueError):
-            return default
-        return max(min_value, min(max_value, number))
+def resolution_json(query, suggestions):
+    resolver = CATALOG.chemical_resolver
+    resolution = resolver.resolve(query)
+    result = {
+        "query": query,
+        "match": resolution.chemical,
+        "match_type": resolution.match,
+        "score": resolution.score,
+        "confident": resolution.confident,
+    }
+    if suggestions:
+        result["suggestions"] = [
+            {"chemical": chemical, "score": score} for chemical, score in resolver.suggest(query, suggestions)
+        ]
+    return result
 
-    heat_level = clamp_number(heat_level, 0, 100, 0)
-    volume_ml = clamp_number(volume_ml, 50, 2000, 250)
+@app.route('/api/chemicals/resolve', methods=['POST'])
+def resolve_chemicals():
+    """Resolve typed chemical names/symbols to inventory entries
 
-    # Normalize chemicals to inventory entries where possible.
-    inventory_by_name = {v["name"].lower(): v for v in CHEMICALS.values()}
-    inventory_by_symbol = {v["symbol"].lower(): v for v in CHEMICALS.values()}
+    Body: ``{"queries": [...], "suggestions": 5}``. Each result has the
+    best ``match`` (or null), how it matched (name, symbol, prefix or
+    fuzzy) with a 0..1 ``score``, and up to ``suggestions`` completions and
+    near misses for autocomplete (0 to omit).
+    """
+    data = request.get_json(silent=True) or {}
+    queries = data.get('queries')
+    if not isinstance(queries, list) or not all(isinstance(q, str) for q in queries):
+        return jsonify({"error": "queries must be a list of strings"}), 400
+    if len(queries) > RESOLVE_MAX_QUERIES:
+        return jsonify({"error": f"At most {RESOLVE_MAX_QUERIES} queries per request"}), 400
+    if any(len(q) > CHEMICAL_QUERY_MAX_LENGTH for q in queries):
+        return jsonify({"error": f"Queries are limited to {CHEMICAL_QUERY_MAX_LENGTH} characters"}), 400
+    try:
+        suggestions = max(0, min(RESOLVE_MAX_SUGGESTIONS, int(data.get('suggestions', 5))))
+    except (TypeError, ValueError):
+        return jsonify({"error": "suggestions must be an integer"}), 400
+    return jsonify({"results": [resolution_json(q, suggestions) for q in queries]})
+
+EXPERIMENT_SUGGESTIONS = 3
 
+def normalize_chemicals(chemicals_used):
+    """Normalize chemicals to inventory entries where possible; raises ValueError for overlong names."""
+    resolver = CATALOG.chemical_resolver
     normalized = []
     for raw in chemicals_used:
         raw_str = str(raw).strip()
-        key = raw_str.lower()
-        chem = inventory_by_name.get(key) or inventory_by_symbol.get(key)
-        if not chem:
-            # Try partial match for common user inputs.
-            chem = next((v for n, v in inventory_by_name.items() if key in n), None)
+        if len(raw_str) > CHEMICAL_QUERY_MAX_LENGTH:
+            raise ValueError(f"Chemical names are limited to {CHEMICAL_QUERY_MAX_LENGTH} characters")
+        # Exact names and symbols, or a prefix/typo match that can only mean one chemical;
+        # anything else ("Na", "acid") is kept as typed. See chemical_suggestions().
+        resolution = resolver.resolve(raw_str)
+        chem = resolution.chemical if resolution.confident else None
         normalized.append(
             {
                 "name": chem["name"] if chem else raw_str,
@@ -708,264 +475,809 @@ def run_experiment():
                 "category": chem.get("category", "Unknown") if chem else "Unknown",
             }
         )
+    return normalized
+
+def chemical_suggestions(chemicals_used):
+    """Inventory names the chemicals kept as typed may have meant, keyed by the typed text."""
+    resolver = CATALOG.chemical_resolver
+    suggestions = {}
+    for raw in chemicals_used:
+        raw_str = str(raw).strip()
+        if not resolver.resolve(raw_str).confident:
+            names = [c["name"] for c, _ in resolver.suggest(raw_str, EXPERIMENT_SUGGESTIONS)]
+            if names:
+                suggestions[raw_str] = names
+    return suggestions
 
+def match_mixture(normalized, experiment_type):
+    """Return ``(categories, best, interaction)`` for a normalized mixture."""
     provided_symbols = {c["symbol"] for c in normalized if c.get("symbol")}
     provided_categories = {c["category"] for c in normalized if c.get("category")}
 
-    def required_symbols_from_equation(equation):
-        """Extract a set of reactant-like symbols from the equation LHS.
-
-        Note: the REACTIONS dataset includes simplified reactants lists (often incomplete),
-        so equation parsing is used to improve matching.
-        """
-        if not equation:
-            return set()
-        parts = re.split(r"\s*(?:→|⇌)\s*", str(equation), maxsplit=1)
-        lhs = parts[0] if parts else str(equation)
-        tokens = [t.strip() for t in lhs.split("+")]
-        symbols = set()
-        for t in tokens:
-            if not t:
-                continue
-            # Skip energy/light terms
-            if not re.search(r"[A-Z]", t) and not re.search(r"[₀-₉]", t):
-                continue
-            # Remove leading coefficients like "2H₂O"
-            t = re.sub(r"^\s*\d+\s*", "", t)
-            # Handle polymerization forms like "n(C₂H₄)"
-            t = re.sub(r"^\s*n\s*", "", t)
-            t = t.strip()
-            if t.startswith("(") and t.endswith(")"):
-                t = t[1:-1].strip()
-            # Collapse multiple spaces
-            t = re.sub(r"\s+", " ", t)
-            if " " in t:
-                # Still looks like a phrase ("electrical energy") rather than a chemical formula
-                continue
-            symbols.add(t)
-        return symbols
-
     # Pick the best matching reaction from the database based on reactant symbols.
-    best = None
-    best_required = set()
-    for reaction in REACTIONS.values():
-        required = required_symbols_from_equation(reaction.get("equation"))
-        if not required:
-            required = {r.get("symbol") for r in reaction.get("reactants", []) if r.get("symbol")}
-        if not required:
-            continue
-        # Avoid over-matching single-reactant reactions when the user mixes multiple chemicals.
-        # (Example: any mixture containing H₂O should not automatically become "Electrolysis of Water".)
-        if len(required) == 1 and len(provided_symbols) > 1:
-            continue
-        if required.issubset(provided_symbols) and len(required) > len(best_required):
-            best = reaction
-            best_required = required
-
-    def estimate_ph(categories, has_ph_meter):
-        if not has_ph_meter:
-            return None
-        if "Acid" in categories and "Base" in categories:
-            return 7.0
-        if "Acid" in categories:
-            return 2.5
-        if "Base" in categories:
-            return 11.5
-        return 7.0
-
-    def tool_notes(tools):
-        notes = []
-        if "Microscope" in tools:
-            notes.append("Microscope: detailed observation enabled")
-        if "Stirring Rod" in tools:
-            notes.append("Stirring Rod: uniform mixing achieved")
-        if "Pipette" in tools:
-            notes.append("Pipette: precise transfer achieved")
-        if "Thermometer" in tools:
-            notes.append("Thermometer: temperature monitored")
-        if "pH Meter" in tools:
-            notes.append("pH Meter: acidity/basicity measured")
-        if "Gloves" in tools:
-            notes.append("Gloves: extra safety protection")
-        if "Bunsen Burner" in tools:
-            notes.append("Bunsen Burner: heat applied")
-        return notes
+    with METRICS.timer("reaction_match_seconds"):
+        best, _ = CATALOG.reaction_index.best_match(provided_symbols)
+    interaction = describe_interaction(best, provided_categories, provided_symbols, len(normalized), experiment_type)
+    return provided_categories, best, interaction
 
-    effective_heat = heat_level if "Bunsen Burner" in tools_used else 0
-    if heat_level > 0 and effective_heat == 0:
-        tools_used = list(tools_used) + ["(Heat ignored: add Bunsen Burner)"]
-
-    ambient_c = 22.0
-    volume_factor = math.sqrt(max(1.0, volume_ml / 250.0))
-
-    reaction_summary = None
-    observation = "Mixture prepared on lab bench."
-    result_text = "Interaction observed."
-    safety = "Standard lab safety"
-    color = "No visible change"
-    energy = 0.0
-    reaction_type = "Physical"
-
-    # If we matched a known reaction, use it.
-    if best:
-        reaction_summary = {
-            "id": best.get("id"),
-            "name": best.get("name"),
-            "equation": best.get("equation"),
-            "category": best.get("category"),
-            "type": best.get("type"),
-            "energyRelease": best.get("energyRelease"),
-        }
-        reaction_type = best.get("type") or reaction_type
-        energy = float(best.get("energyRelease") or 0.0)
-        color = best.get("color") or color
-        safety = best.get("hazard") or safety
-        observation = f"{color} observed. {best.get('description') or 'Reaction underway.'}"
-        result_text = f"{best.get('name')}: {best.get('equation')}"
-    else:
-        # Always generate a meaningful interaction, even for unknown combos.
-        categories = provided_categories
-        if "Acid" in categories and "Base" in categories:
-            reaction_type = "Exothermic"
-            energy = 45.0
-            color = "Clear solution; mild warming"
-            observation = "Neutralization interaction: temperature rises slightly and pH trends toward neutral."
-            result_text = "Salt + water formed (neutralization)."
-            safety = "Corrosive reagents possible — wear gloves and goggles"
-        elif "Metal" in categories and "Acid" in categories:
-            reaction_type = "Exothermic"
-            energy = 60.0
-            color = "Bubbles and slight heating"
-            observation = "Metal + acid interaction: bubbles indicate gas formation."
-            result_text = "Salt formed; hydrogen gas may be released."
-            safety = "Flammable gas risk — keep away from flames"
-        elif "Solvent" in categories and "Liquid" in categories and any(c["symbol"] == "Oil" for c in normalized):
-            reaction_type = "Physical"
-            energy = 0.0
-            color = "Layer separation"
-            observation = "Immiscible mixture: liquids separate into layers based on density."
-            result_text = "No chemical reaction; physical separation observed."
-            safety = "Safe (avoid spills)"
-        elif "Sugar" in categories and "Acid" in categories:
-            reaction_type = "Exothermic"
-            energy = 30.0
-            color = "Darkening/char formation"
-            observation = "Dehydration interaction: solution darkens as carbon-rich material forms."
-            result_text = "Organic decomposition products formed."
-            safety = "Irritating fumes possible — use ventilation"
-        else:
-            # Generic but still plausible based on lab type.
-            if experiment_type == "biology":
-                reaction_type = "Biochemical"
-                energy = 10.0
-                color = "Subtle cloudiness"
-                observation = f"Biological interaction: {len(normalized)} samples show gradual change."
-                result_text = "Enzymatic/biochemical activity detected."
-                safety = "Safe (standard bio precautions)"
-            elif experiment_type == "physics":
-                reaction_type = "Physical"
-                energy = 0.0
-                color = "Phase/density change"
-                observation = f"Physical interaction: material properties of {len(normalized)} substances observed."
-                result_text = "No chemical transformation; physical properties recorded."
-                safety = "Safe"
-            else:
-                reaction_type = "Chemical"
-                energy = 15.0
-                color = "Mild change"
-                observation = f"General chemical interaction: {len(normalized)} reagents show observable change."
-                result_text = "Reaction pathway not in database; interaction modeled."
-                safety = "Use standard PPE"
-
-    # Temperature model: tool heat + reaction energy, reduced by volume.
-    heat_delta = (effective_heat * 0.45) / volume_factor
-    reaction_delta = 0.0
-    if "Exothermic" in reaction_type:
-        reaction_delta = min(35.0, max(0.0, energy / 25.0)) / volume_factor
-    elif "Endothermic" in reaction_type:
-        reaction_delta = -min(12.0, max(0.0, abs(energy) / 120.0)) / volume_factor
-    temperature_c = round(ambient_c + heat_delta + reaction_delta, 1)
-
-    # A simple "reaction rate" proxy for UI (0..1).
-    rate = clamp_number((effective_heat / 100.0) + (0.15 if "Exothermic" in reaction_type else 0.05), 0, 1, 0.1)
+def simulate_mixture(normalized, experiment_type, tools_used, heat_level, volume_ml):
+    """The order-independent part of a run-experiment response."""
+    provided_categories, _, interaction = match_mixture(normalized, experiment_type)
 
+    effective_heat = heat_level if "Bunsen Burner" in tools_used else 0
+    reaction_type = interaction["reaction_type"]
     measurements = {
-        "temperature_c": temperature_c,
+        "temperature_c": temperature_c(effective_heat, volume_ml, reaction_type, interaction["energy"]),
         "heat_level": round(effective_heat, 1),
         "volume_ml": round(volume_ml, 1),
         "ph": estimate_ph(provided_categories, "pH Meter" in tools_used),
-        "rate": round(rate, 2),
+        "rate": round(reaction_rate(effective_heat, reaction_type), 2),
+    }
+    reaction = interaction["reaction"]
+    thermodynamics = equilibrium.THERMODYNAMICS.get(reaction["id"]) if reaction else None
+    if thermodynamics:
+        # Reversible reactions stop short of completion; report how far at this temperature and 1 bar.
+        result = equilibrium.solve(reaction["equation"], thermodynamics, [measurements["temperature_c"]], [1.0])
+        measurements["equilibrium_conversion"] = round(float(result.conversion[0, 0]), 4)
+    return {
+        "categories": sorted(provided_categories),
+        "toolNotes": tool_notes(tools_used),
+        "reaction": interaction["reaction"],
+        "observation": interaction["observation"],
+        "result": interaction["result"],
+        "color": interaction["color"],
+        "safety": interaction["safety"],
+        "measurements": measurements,
     }
 
+def parse_experiment_request(data):
+    """Read, clamp and normalize run-experiment inputs; raises ValueError.
+
+    Returns ``(normalized, experiment_type, tools_used, heat_level, volume_ml)``.
+    """
+    chemicals_used = data.get('chemicals', []) or []
+    experiment_type = (data.get('type') or '').lower()
+    tools_used = data.get('tools', []) or []
+    heat_level = data.get('heat', 0) or 0
+    volume_ml = data.get('volume_ml', 250) or 250
+
+    heat_level = clamp_number(heat_level, 0, 100, 0)
+    volume_ml = clamp_number(volume_ml, 50, 2000, 250)
+
+    normalized = normalize_chemicals(chemicals_used)
+    if heat_level > 0 and "Bunsen Burner" not in tools_used:
+        tools_used = list(tools_used) + ["(Heat ignored: add Bunsen Burner)"]
+    return normalized, experiment_type, tools_used, heat_level, volume_ml
+
+@app.route('/api/run-experiment', methods=['POST'])
+def run_experiment():
+    """Run a virtual experiment by mixing chemicals and using tools"""
+    try:
+        normalized, experiment_type, tools_used, heat_level, volume_ml = parse_experiment_request(request.json)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # Only tools with a modeled effect are part of the key. Heat and volume are
+    # quantized to the 0.1 resolution the response reports, so equal-looking
+    # inputs share an entry; the model itself runs on the exact values.
+    key = (
+        tuple(sorted((c["symbol"], c["category"]) for c in normalized)),
+        experiment_type,
+        tuple(name for name in TOOL_NOTES if name in tools_used),
+        round(heat_level, 1),
+        round(volume_ml, 1),
+    )
+    result = EXPERIMENT_CACHE.get(key)
+    if result is None:
+        result = simulate_mixture(normalized, experiment_type, tools_used, heat_level, volume_ml)
+        EXPERIMENT_CACHE.put(key, result)
+
     payload = {
         "success": True,
         "timestamp": datetime.now().isoformat(),
         "chemicals": [c["name"] for c in normalized],
         "symbols": [c["symbol"] for c in normalized],
-        "categories": sorted(provided_categories),
         "tools": tools_used,
-        "toolNotes": tool_notes(tools_used),
-        "reaction": reaction_summary,
-        "observation": observation,
-        "result": result_text,
-        "color": color,
-        "safety": safety,
-        "measurements": measurements,
+        **result,
     }
+    suggestions = chemical_suggestions((request.json or {}).get('chemicals', []) or [])
+    if suggestions:
+        payload["suggestions"] = suggestions
 
     return jsonify(payload)
 
-@app.route('/api/findings', methods=['POST'])
-def save_findings():
-    """Save lab findings/notes"""
+SIMULATION_MAX_DURATION_S = 3600
+SIMULATION_MAX_FRAMES = 500
+# Longest realtime stream a WSGI worker thread is held for; the ASGI app paces longer runs without a thread.
+WSGI_REALTIME_MAX_S = 60
+
+def stream_request_data(method, args, json_body):
+    """Stream inputs from a JSON body (POST) or query parameters (GET); raises ValueError."""
+    if method == 'POST':
+        if json_body is None:
+            return {}
+        if not isinstance(json_body, dict):
+            raise ValueError("Expected a JSON object")
+        return json_body
+    return {
+        "chemicals": args.getlist('chemicals'),
+        "tools": args.getlist('tools'),
+        "type": args.get('type'),
+        "heat": args.get('heat'),
+        "volume_ml": args.get('volume_ml'),
+        "duration_s": args.get('duration_s'),
+        "frames": args.get('frames'),
+        "realtime": args.get('realtime'),
+    }
+
+def experiment_model(data, max_duration_s=SIMULATION_MAX_DURATION_S, max_frames=SIMULATION_MAX_FRAMES):
+    """Match and model a mixture for a time-stepped run.
+
+    Returns ``(start, model, duration_s, frame_count, realtime)``, where
+    ``start`` is the payload of the run's first event.
+    """
+    normalized, experiment_type, tools_used, heat_level, volume_ml = parse_experiment_request(data)
+    duration_s = clamp_number(data.get('duration_s') or 60, 1, max_duration_s, 60)
+    frame_count = int(clamp_number(data.get('frames') or 60, 1, max_frames, 60))
+    realtime = str(data.get('realtime') or '').lower() in ('1', 'true', 'yes')
+
+    _, best, interaction = match_mixture(normalized, experiment_type)
+    reactants, products = split_equation(best["equation"]) if best else ([], [])
+    effective_heat = heat_level if "Bunsen Burner" in tools_used else 0
+    model = build_model(interaction["reaction_type"], interaction["energy"], reactants, products, effective_heat, volume_ml)
+
+    start = {
+        "reaction": interaction["reaction"],
+        "species": model.species,
+        "duration_s": duration_s,
+        "frames": frame_count,
+        "heat_level": round(effective_heat, 1),
+        "volume_ml": round(volume_ml, 1),
+        "activation_energy_kj": model.activation_j / 1000.0,
+    }
+    return start, model, duration_s, frame_count, realtime
+
+def experiment_events(data, realtime_max_s=None):
+    """Simulate a mixture; return ``(events, realtime)``.
+
+    ``events`` lazily yields ``(t, event, payload)`` with ``t`` the simulated
+    time in seconds. With ``realtime`` the transport should send each event
+    ``t`` seconds after the start instead of as fast as possible; runs
+    longer than ``realtime_max_s`` are then rejected with ValueError.
+    """
+    start, model, duration_s, frame_count, realtime = experiment_model(data)
+    if realtime and realtime_max_s is not None and duration_s > realtime_max_s:
+        raise ValueError(f"realtime runs are limited to {realtime_max_s:g} s here;"
+                         " use the WebSocket at /ws/run-experiment (asgi.py) for longer ones")
+
+    def generate():
+        yield 0.0, "start", start
+        peak = None
+        last = None
+        for frame in frames(model, duration_s, frame_count):
+            peak = frame["temperature_c"] if peak is None else max(peak, frame["temperature_c"])
+            last = frame
+            yield frame["t"], "frame", frame
+        yield duration_s, "end", {"final_conversion": last["conversion"], "peak_temperature_c": peak}
+
+    return generate(), realtime
+
+def encode_event(event, payload, sse):
+    """One stream event as an SSE message or an NDJSON line."""
+    if sse:
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+        return f"event: {event}\ndata: {body}\n\n"
+    return json.dumps({"event": event, **payload}, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+@app.route('/api/run-experiment/stream', methods=['GET', 'POST'])
+def stream_experiment():
+    """Time-stepped simulation of a mixture, streamed frame by frame.
+
+    Takes the same inputs as /api/run-experiment (JSON body, or query
+    parameters for EventSource clients, with repeated ``chemicals``/``tools``)
+    plus ``duration_s`` (default 60), ``frames`` (default 60) and
+    ``realtime`` (send frames at the pace of the simulated clock, for runs
+    of at most WSGI_REALTIME_MAX_S, since each one holds a server thread).
+    Streams NDJSON, or Server-Sent Events when the client accepts
+    text/event-stream or passes ``format=sse``.
+    """
+    try:
+        data = stream_request_data(request.method, request.args, request.json if request.method == 'POST' else None)
+        events, realtime = experiment_events(data, realtime_max_s=WSGI_REALTIME_MAX_S)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    use_sse = request.args.get('format') == 'sse' or request.accept_mimetypes.best == 'text/event-stream'
+
+    def generate():
+        started = time.monotonic()
+        for t, event, payload in events:
+            if realtime:
+                time.sleep(max(0.0, started + t - time.monotonic()))
+            yield encode_event(event, payload, use_sse)
+
+    mimetype = "text/event-stream" if use_sse else "application/x-ndjson"
+    return Response(stream_with_context(generate()), mimetype=mimetype, headers={"Cache-Control": "no-cache"})
+
+SWEEP_MAX_POINTS = 100_000
+SWEEP_DEFAULT_STEPS = 11
+
+def sweep_axis(spec, name, low, high, default, digits=None):
+    """Values for one sweep axis, clamped like a single run (and rounded to ``digits`` if given).
+
+    ``spec`` is a number, a list of numbers, or a range object
+    ``{"start", "stop", "steps"}`` (evenly spaced, both ends included) or
+    ``{"start", "stop", "step"}``.
+    """
+    if spec is None:
+        values = [default]
+    elif isinstance(spec, dict):
+        try:
+            start = float(spec.get('start', low))
+            stop = float(spec.get('stop', high))
+            if spec.get('step') is not None:
+                step = float(spec['step'])
+                if not step > 0:
+                    raise ValueError
+                count = int(math.floor(abs(stop - start) / step + 1e-9)) + 1
+                if count > SWEEP_MAX_POINTS:
+                    raise OverflowError
+                values = start + np.arange(count) * math.copysign(step, stop - start)
+            else:
+                count = int(spec.get('steps', SWEEP_DEFAULT_STEPS))
+                if not 1 <= count <= SWEEP_MAX_POINTS:
+                    raise OverflowError
+                values = np.linspace(start, stop, count)
+        except OverflowError:
+            raise ValueError(f"{name} has too many points") from None
+        except (TypeError, ValueError):
+            raise ValueError(f"{name} must be a number, a list of numbers, or {{start, stop, steps|step}}") from None
+    elif isinstance(spec, list):
+        values = spec
+    else:
+        values = [spec]
+    try:
+        values = np.asarray(values, dtype=float)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} values must be numbers") from None
+    if values.ndim != 1 or not len(values) or not np.isfinite(values).all():
+        raise ValueError(f"{name} values must be finite numbers")
+    values = np.clip(values, low, high)
+    return values if digits is None else np.round(values, digits)
+
+def rounded(values, digits):
+    # Python's round() on each element keeps sweep output identical to
+    # /api/run-experiment; np.round differs in the last digit on some halves.
+    return [round(v, digits) for v in values.tolist()]
+
+@app.route('/api/run-experiment/sweep', methods=['POST'])
+def sweep_experiment():
+    """Run one mixture over a grid of heat levels and volumes.
+
+    Body: the /api/run-experiment fields, where ``heat`` and ``volume_ml``
+    may be lists or ``{"start", "stop", "steps"}`` ranges. The reaction is
+    matched once and the measurement models are evaluated over the whole
+    grid. Measurements come back as parallel arrays in heat-major order,
+    one entry per (heat, volume) pair; ``ph`` does not depend on the grid
+    and is a single value.
+    """
     data = request.json
-    finding = {
-        "id": data.get('id', f"finding_{datetime.now().timestamp()}"),
-        "title": data.get('title', 'Untitled Finding'),
-        "content": data.get('content', ''),
-        "experiment": data.get('experiment', ''),
-        "lab": data.get('lab', ''),
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a JSON object"}), 400
+    try:
+        heat_values = sweep_axis(data.get('heat'), 'heat', 0, 100, 0.0)
+        volume_values = sweep_axis(data.get('volume_ml'), 'volume_ml', 50, 2000, 250.0)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if len(heat_values) * len(volume_values) > SWEEP_MAX_POINTS:
+        return jsonify({"error": f"At most {SWEEP_MAX_POINTS} grid points per sweep"}), 400
+
+    # Heat only decides the burner note here; the grid carries the values.
+    single = dict(data, heat=float(heat_values.max()), volume_ml=None)
+    try:
+        normalized, experiment_type, tools_used, _, _ = parse_experiment_request(single)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    provided_categories, _, interaction = match_mixture(normalized, experiment_type)
+    reaction_type = interaction["reaction_type"]
+
+    effective_heat = heat_values if "Bunsen Burner" in tools_used else np.zeros_like(heat_values)
+    heat_grid, volume_grid = np.meshgrid(effective_heat, volume_values, indexing='ij')
+    temperatures = temperature_grid(heat_grid, volume_grid, reaction_type, interaction["energy"])
+    rates = np.broadcast_to(reaction_rate_grid(effective_heat, reaction_type)[:, None], heat_grid.shape)
+
+    return jsonify({
+        "success": True,
         "timestamp": datetime.now().isoformat(),
-        "observations": data.get('observations', ''),
-        "conclusion": data.get('conclusion', '')
-    }
-    # Persist findings to a local JSON file to make the notebook usable across devices.
-    data_dir = os.path.join(os.path.dirname(__file__), "data")
-    os.makedirs(data_dir, exist_ok=True)
-    path = os.path.join(data_dir, "findings.json")
+        "chemicals": [c["name"] for c in normalized],
+        "symbols": [c["symbol"] for c in normalized],
+        "tools": tools_used,
+        "categories": sorted(provided_categories),
+        "toolNotes": tool_notes(tools_used),
+        "reaction": interaction["reaction"],
+        "observation": interaction["observation"],
+        "result": interaction["result"],
+        "color": interaction["color"],
+        "safety": interaction["safety"],
+        "heat": rounded(heat_values, 1),
+        "volume_ml": rounded(volume_values, 1),
+        "shape": [len(heat_values), len(volume_values)],
+        "measurements": {
+            "heat_level": rounded(heat_grid.ravel(), 1),
+            "volume_ml": rounded(volume_grid.ravel(), 1),
+            "temperature_c": rounded(temperatures.ravel(), 1),
+            "rate": rounded(rates.ravel(), 2),
+            "ph": estimate_ph(provided_categories, "pH Meter" in tools_used),
+        },
+    })
+
+SPECTRUM_DEFAULT_RANGE = (200.0, 800.0)
+SPECTRUM_WAVELENGTH_LIMITS = (100.0, 3000.0)
+SPECTRUM_MAX_POINTS = 100_000
+SPECTRUM_MAX_SPECIES = 200
+SPECTRUM_MAX_BANDS = 2000
+# Grid points times returned rows (total plus components); bounds a cached spectrum to 4 MB.
+SPECTRUM_MAX_VALUES = 1_000_000
 
+def _spectrum_number(value, name, low, high):
+    if isinstance(value, bool):
+        raise ValueError(f"{name} must be a number")
     try:
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                existing = json.load(f)
-                if not isinstance(existing, list):
-                    existing = []
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a number") from None
+    if not (math.isfinite(number) and low <= number <= high):
+        raise ValueError(f"{name} must be between {low:g} and {high:g}")
+    return number
+
+def _spectrum_band(band, number):
+    if not isinstance(band, dict):
+        raise ValueError(f"band {number} must be an object")
+    shape = band.get('shape', 'gaussian')
+    if shape not in spectroscopy.SHAPES:
+        raise ValueError(f"band shape must be one of {', '.join(spectroscopy.SHAPES)}")
+    return spectroscopy.Band(
+        center_nm=_spectrum_number(band.get('center_nm'), 'center_nm', *SPECTRUM_WAVELENGTH_LIMITS),
+        epsilon=_spectrum_number(band.get('epsilon'), 'epsilon', 0, 1e7),
+        width_nm=_spectrum_number(band.get('width_nm', 20), 'width_nm', 0.01, 2000),
+        shape=shape,
+    )
+
+def parse_spectrum_request(data):
+    """Validate a POST /api/spectroscopy/spectrum body into a SpectrumSpec; raises ValueError."""
+    if not isinstance(data, dict):
+        raise ValueError("Expected a JSON object")
+    entries = data.get('species')
+    if not isinstance(entries, list) or not entries:
+        raise ValueError("species must be a non-empty list")
+    if len(entries) > SPECTRUM_MAX_SPECIES:
+        raise ValueError(f"At most {SPECTRUM_MAX_SPECIES} species per spectrum")
+    species = []
+    for number, entry in enumerate(entries, 1):
+        if not isinstance(entry, dict):
+            raise ValueError(f"species {number} must be an object")
+        name = str(entry.get('name') or f"species {number}")
+        if entry.get('bands') is not None:
+            if not isinstance(entry['bands'], list) or not entry['bands']:
+                raise ValueError(f"{name}: bands must be a non-empty list")
+            bands = tuple(_spectrum_band(band, i) for i, band in enumerate(entry['bands'], 1))
         else:
-            existing = []
-        existing.insert(0, finding)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(existing[:500], f, ensure_ascii=False, indent=2)
+            bands = spectroscopy.preset_bands(name)
+            if bands is None:
+                raise ValueError(f"{name}: no bands given and no preset of that name "
+                                 f"(presets: {', '.join(spectroscopy.PRESETS)})")
+        concentration = _spectrum_number(entry.get('concentration'), f"{name}: concentration", 0, 100)
+        species.append(spectroscopy.Species(name, concentration, bands))
+    if sum(len(s.bands) for s in species) > SPECTRUM_MAX_BANDS:
+        raise ValueError(f"At most {SPECTRUM_MAX_BANDS} bands per spectrum")
+
+    start = _spectrum_number(data.get('start_nm', SPECTRUM_DEFAULT_RANGE[0]), 'start_nm', *SPECTRUM_WAVELENGTH_LIMITS)
+    stop = _spectrum_number(data.get('stop_nm', SPECTRUM_DEFAULT_RANGE[1]), 'stop_nm', *SPECTRUM_WAVELENGTH_LIMITS)
+    if stop <= start:
+        raise ValueError("stop_nm must be greater than start_nm")
+    if data.get('points') is not None:
+        points = data['points']
+        if isinstance(points, bool) or not isinstance(points, int) or not 2 <= points <= SPECTRUM_MAX_POINTS:
+            raise ValueError(f"points must be an integer from 2 to {SPECTRUM_MAX_POINTS}")
+    else:
+        resolution = _spectrum_number(data.get('resolution_nm', 1.0), 'resolution_nm', 1e-4, stop - start)
+        points = int(round((stop - start) / resolution)) + 1
+        if points > SPECTRUM_MAX_POINTS:
+            raise ValueError(f"resolution_nm gives more than {SPECTRUM_MAX_POINTS} points")
+    components = bool(data.get('components', False))
+    if points * (1 + len(species) * components) > SPECTRUM_MAX_VALUES:
+        raise ValueError(f"points times returned spectra must be at most {SPECTRUM_MAX_VALUES}")
+    return spectroscopy.SpectrumSpec(
+        species=tuple(species),
+        path_length_cm=_spectrum_number(data.get('path_length_cm', 1.0), 'path_length_cm', 1e-4, 100),
+        start_nm=start,
+        stop_nm=stop,
+        points=points,
+        components=components,
+    )
+
+SPECTRUM_MIMETYPE = "application/octet-stream"
+
+@app.route('/api/spectroscopy/spectrum', methods=['POST'])
+def synthesize_spectrum():
+    """Synthesize a UV-Vis absorption spectrum.
+
+    Body: ``species`` (each with ``name``, ``concentration`` in mol/L and
+    ``bands`` of ``center_nm``/``epsilon``/``width_nm``/``shape``, or the
+    name of a preset chromophore), ``path_length_cm``, the grid
+    (``start_nm``, ``stop_nm`` and ``points`` or ``resolution_nm``) and
+    ``components`` to also return each species' spectrum.
+
+    With ``"format": "binary"`` (or ``Accept: application/octet-stream``)
+    the body is little-endian float32 absorbance, the total first and then
+    one row per species, described by X-Spectrum-* headers. Otherwise the
+    same values come back as JSON; the grid is given by its bounds either way.
+    """
+    data = request.json
+    try:
+        spec = parse_spectrum_request(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    result = spectroscopy.spectrum(spec)
+    wanted = data.get('format') or request.accept_mimetypes.best_match(["application/json", SPECTRUM_MIMETYPE])
+    if wanted in ("binary", SPECTRUM_MIMETYPE):
+        rows, points = result.absorbance.shape
+        return Response(result.absorbance.astype("<f4", copy=False).tobytes(), mimetype=SPECTRUM_MIMETYPE, headers={
+            "X-Spectrum-Start-Nm": repr(spec.start_nm),
+            "X-Spectrum-Stop-Nm": repr(spec.stop_nm),
+            "X-Spectrum-Points": str(points),
+            "X-Spectrum-Rows": str(rows),
+            "X-Spectrum-Species": json.dumps([s.name for s in spec.species]),
+        })
+    if wanted not in (None, "json", "application/json"):
+        return jsonify({"error": "format must be json or binary"}), 400
+
+    def row(index):
+        return {
+            "lambda_max_nm": round(result.lambda_max_nm[index], 4),
+            "max_absorbance": round(result.max_absorbance[index], 6),
+            # Widened before rounding, so float32 noise does not reach the JSON.
+            "absorbance": np.round(result.absorbance[index].astype(float), 6).tolist(),
+        }
+
+    body = {
+        "start_nm": spec.start_nm,
+        "stop_nm": spec.stop_nm,
+        "points": spec.points,
+        "step_nm": (spec.stop_nm - spec.start_nm) / (spec.points - 1),
+        "path_length_cm": spec.path_length_cm,
+        **row(0),
+    }
+    if spec.components:
+        body["species"] = [{"name": s.name, **row(i)} for i, s in enumerate(spec.species, 1)]
+    return jsonify(body)
+
+EQUILIBRIUM_TEMPERATURE_C = (-100.0, 2000.0)
+EQUILIBRIUM_PRESSURE_BAR = (0.001, 1000.0)
+
+def parse_equilibrium_request(data, max_points=SWEEP_MAX_POINTS):
+    """Validate a POST /api/equilibrium body; raises ValueError.
+
+    Returns ``(reaction, thermodynamics, temperatures, pressures, initial)``.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Expected a JSON object")
+    reaction_id = data.get('reaction_id')
+    if reaction_id is not None:
+        reaction = CATALOG.reactions.get(reaction_id)
+        if reaction is None:
+            raise ValueError(f"Unknown reaction {reaction_id!r}")
+        reaction = {"id": reaction["id"], "name": reaction.get("name"), "equation": reaction.get("equation")}
+    elif isinstance(data.get('equation'), str):
+        reaction = {"id": None, "name": None, "equation": data['equation']}
+    else:
+        raise ValueError("Give a reaction_id or an equation")
+
+    known = equilibrium.THERMODYNAMICS.get(reaction["id"])
+    log10_k = data.get('log10_k', known.log10_k if known else None)
+    if log10_k is None:
+        raise ValueError("No equilibrium data for this reaction; give log10_k (at 25 °C) and delta_h_kj")
+    phase = data.get('phase', known.phase if known else "gas")
+    if phase not in equilibrium.PHASES:
+        raise ValueError(f"phase must be one of {', '.join(equilibrium.PHASES)}")
+    solvents = data.get('solvents', list(known.solvents) if known else [])
+    if not isinstance(solvents, list) or not all(isinstance(s, str) for s in solvents):
+        raise ValueError("solvents must be a list of species")
+    values = {}
+    for name, value in (('log10_k', log10_k), ('delta_h_kj', data.get('delta_h_kj', known.delta_h_kj if known else 0.0))):
+        try:
+            values[name] = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{name} must be a number") from None
+        if not math.isfinite(values[name]):
+            raise ValueError(f"{name} must be a finite number")
+    thermodynamics = equilibrium.Thermodynamics(phase=phase, solvents=tuple(solvents), **values)
+
+    initial = data.get('initial') or {}
+    if not isinstance(initial, dict):
+        raise ValueError("initial must be an object of species -> amount")
+    for species, amount in initial.items():
+        if isinstance(amount, bool) or not isinstance(amount, (int, float)) or not 0 <= amount < math.inf:
+            raise ValueError(f"initial amount of {species} must be a non-negative number")
+
+    temperatures = sweep_axis(data.get('temperature_c'), 'temperature_c', *EQUILIBRIUM_TEMPERATURE_C, 25.0, digits=1)
+    pressures = sweep_axis(data.get('pressure_bar'), 'pressure_bar', *EQUILIBRIUM_PRESSURE_BAR, 1.0, digits=3)
+    if len(temperatures) * len(pressures) > max_points:
+        raise ValueError(f"At most {max_points} grid points")
+    return reaction, thermodynamics, temperatures, pressures, initial
+
+@app.route('/api/equilibrium', methods=['POST'])
+def solve_equilibrium():
+    """Equilibrium composition of a reversible reaction over a temperature × pressure grid.
+
+    Body: ``reaction_id`` of a catalog reaction (``synthesis_ammonia``,
+    ``esterification`` and ``iodine_clock`` carry thermodynamic data) or an
+    ``equation`` with ``log10_k`` at 25 °C, ``delta_h_kj``, ``phase`` (gas
+    or solution) and ``solvents``; ``temperature_c`` and ``pressure_bar``
+    as numbers, lists or ``{"start", "stop", "steps"}`` ranges; and
+    ``initial`` amounts per species (mol for gases, mol/L in solution).
+    Grid results are flat arrays in temperature-major order. Pressure only
+    matters for gas reactions that change the number of moles.
+    """
+    try:
+        return jsonify(tasks.equilibrium_grid(*parse_equilibrium_request(request.json)))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+def store_finding(finding):
+    with METRICS.timer("findings_write_seconds"):
+        FINDINGS_STORE.add(finding)
+
+@app.route('/api/findings', methods=['POST'])
+def save_findings():
+    """Save lab findings/notes"""
+    finding = build_finding(request.json)
+    # Persist findings so the notebook is usable across devices.
+    try:
+        store_finding(finding)
     except Exception:
         # If persistence fails, still return the finding so the UI can store it locally.
         pass
 
     return jsonify(finding), 201
 
+FINDINGS_PAGE_MAX = 500
+
+def parse_findings_query(args):
+    """Validate GET /api/findings query parameters; raises ValueError on bad input."""
+    filters = {
+        "lab": args.get('lab') or None,
+        "experiment": args.get('experiment') or None,
+    }
+    for name in ('since', 'until'):
+        value = args.get(name)
+        filters[name] = datetime.fromisoformat(value).isoformat() if value else None
+    limit = args.get('limit')
+    limit = max(1, min(FINDINGS_PAGE_MAX, int(limit))) if limit else None
+    after = args.get('after')
+    after = int(after) if after else None
+    return limit, after, filters
+
 @app.route('/api/findings', methods=['GET'])
 def get_findings():
-    """Get saved findings/notes"""
-    data_dir = os.path.join(os.path.dirname(__file__), "data")
-    path = os.path.join(data_dir, "findings.json")
-    if not os.path.exists(path):
-        return jsonify([])
+    """Get saved findings/notes
+
+    Optional query parameters: ``limit`` and ``after`` (cursor taken from the
+    ``X-Next-Cursor`` response header), ``lab``, ``experiment``, ``since`` and
+    ``until`` (ISO timestamps), and ``format=ndjson`` to stream every match.
+    """
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        if not isinstance(data, list):
-            return jsonify([])
-        return jsonify(data)
+        limit, after, filters = parse_findings_query(request.args)
+    except ValueError:
+        return jsonify({"error": "Invalid limit, after, since or until parameter"}), 400
+
+    if request.args.get('format') == 'ndjson':
+        def generate():
+            for body in FINDINGS_STORE.iter_json(after=after, **filters):
+                yield body + "\n"
+        return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+    body, headers = findings_page(limit, after, filters)
+    return Response(body, mimetype="application/json", headers=headers)
+
+@app.route('/api/findings/import', methods=['POST'])
+def import_findings():
+    """Bulk-import findings from an NDJSON body (one finding object per line)
+
+    The body is parsed and stored as it streams in, a batch per transaction,
+    so large imports use constant memory and do not hold the database lock
+    for their whole duration. Invalid lines are skipped and reported. If
+    storage fails midway, batches already committed are kept. Very large
+    imports can run as a background job instead (/api/jobs/findings-import).
+    """
+    summary = {"rejected": 0, "errors": []}
+    try:
+        with METRICS.timer("findings_import_seconds"):
+            imported = FINDINGS_STORE.add_many(parse_import(request.stream, summary))
     except Exception:
-        return jsonify([]), 200
+        app.logger.exception("Findings import failed")
+        return jsonify({"error": "Import failed; batches stored before the failure were kept"}), 500
+    METRICS.inc("findings_imported_total", amount=imported)
+    METRICS.inc("findings_import_rejected_total", amount=summary["rejected"])
+    return jsonify({"imported": imported, **summary})
+
+@app.route('/api/findings/export', methods=['GET'])
+def export_findings():
+    """Stream every finding as NDJSON, oldest first
+
+    The output can be fed back to /api/findings/import. Accepts the
+    ``lab``, ``experiment``, ``since`` and ``until`` filters of GET /api/findings.
+    """
+    try:
+        _, _, filters = parse_findings_query(request.args)
+    except ValueError:
+        return jsonify({"error": "Invalid since or until parameter"}), 400
+
+    def generate():
+        for body in FINDINGS_STORE.export_json(**filters):
+            yield body + "\n"
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson",
+                    headers={"Content-Disposition": 'attachment; filename="findings.ndjson"'})
+
+def findings_page(limit, after, filters):
+    """JSON array body and headers for one page of GET /api/findings."""
+    try:
+        rows = FINDINGS_STORE.page_json(limit=None if limit is None else limit + 1, after=after, **filters)
+    except Exception:
+        rows = []
+    headers = {}
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        headers["X-Next-Cursor"] = str(rows[-1][0])
+    # Rows are already serialized JSON objects; join them instead of re-encoding.
+    return "[" + ",".join(row[1] for row in rows) + "]", headers
+
+# Background jobs (see jobs.py) for work too large to run inside a request.
+# VLAB_JOBS_DB locates the job table, VLAB_JOB_WORKERS sets the pool processes
+# per server process, VLAB_JOB_MAX_PENDING the jobs one server process may have
+# waiting or running, and VLAB_JOB_TTL how many seconds a result is kept.
+JOB_MAX_POINTS = 1_000_000
+JOB_MAX_OPERATIONS = 200_000
+JOB_MAX_DURATION_S = 86_400
+JOB_MAX_FRAMES = 20_000
+JOB_LIST_LIMIT = 100
+JOB_BUCKETS = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+SPOOL_CHUNK = 1 << 16
+
+METRICS.describe("jobs_submitted_total", "counter", "Background jobs accepted, by kind")
+METRICS.describe("jobs_rejected_total", "counter", "Background jobs refused because too many were in progress")
+METRICS.describe("jobs_finished_total", "counter", "Background jobs ended, by kind and final state")
+METRICS.describe("job_seconds", "histogram", "Background job time from submission to its end")
+
+def record_job(kind, state, seconds):
+    METRICS.inc("jobs_finished_total", (("kind", kind), ("state", state)))
+    METRICS.observe("job_seconds", seconds, (("kind", kind),), buckets=JOB_BUCKETS)
+    if kind == "findings-import":
+        # The job only inserts; trimming to the retention limit happens here, as for any import.
+        FINDINGS_STORE.schedule_compaction()
+
+JOBS = jobs.JobQueue(
+    os.environ.get("VLAB_JOBS_DB") or os.path.join(DATA_DIR, "jobs.db"),
+    workers=int(os.environ.get("VLAB_JOB_WORKERS") or jobs.WORKERS),
+    max_pending=int(os.environ.get("VLAB_JOB_MAX_PENDING") or jobs.MAX_PENDING),
+    result_ttl=float(os.environ.get("VLAB_JOB_TTL") or jobs.RESULT_TTL),
+    on_done=record_job,
+)
+
+def _job_json(data):
+    if not isinstance(data, dict):
+        raise ValueError("Expected a JSON object")
+    return data
+
+def equilibrium_job(req):
+    return tasks.equilibrium_grid, parse_equilibrium_request(req.get_json(silent=True), max_points=JOB_MAX_POINTS), ()
+
+def simulation_job(req):
+    start, model, duration_s, frame_count, _ = experiment_model(
+        _job_json(req.get_json(silent=True)), JOB_MAX_DURATION_S, JOB_MAX_FRAMES)
+    return tasks.simulation, (start, model, duration_s, frame_count), ()
+
+def calculate_batch_job(req):
+    operations = _job_json(req.get_json(silent=True)).get('operations')
+    if not isinstance(operations, list):
+        raise ValueError("operations must be a list")
+    if len(operations) > JOB_MAX_OPERATIONS:
+        raise ValueError(f"At most {JOB_MAX_OPERATIONS} operations per job")
+    return tasks.calculate_batch, (operations,), ()
+
+def findings_import_job(req):
+    # Spooled to a file a chunk at a time, so the body is never held in memory.
+    fd, path = tempfile.mkstemp(prefix="vlab-import-", suffix=".ndjson")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            shutil.copyfileobj(req.stream, f, SPOOL_CHUNK)
+    except BaseException:
+        os.remove(path)
+        raise
+    return tasks.import_findings, (FINDINGS_STORE.path, FINDINGS_STORE.legacy_json, path), (path,)
+
+# Job kind -> prepare(request), returning ``(function, args, files)``; raises ValueError.
+JOB_KINDS = {
+    "equilibrium": equilibrium_job,
+    "simulation": simulation_job,
+    "calculate-batch": calculate_batch_job,
+    "findings-import": findings_import_job,
+}
+
+@app.route('/api/jobs/<kind>', methods=['POST'])
+def submit_job(kind):
+    """Start a background job and answer 202 with its id straight away
+
+    ``kind`` is ``equilibrium``, ``simulation`` or ``calculate-batch``, with
+    the JSON body of /api/equilibrium, /api/run-experiment/stream or
+    /api/calculate/batch (limits are larger here), or ``findings-import``
+    with the NDJSON body of /api/findings/import. Poll ``status_url`` for
+    progress and the result. Answers 503 when this server process already
+    has too many jobs in progress.
+    """
+    prepare = JOB_KINDS.get(kind)
+    if prepare is None:
+        return jsonify({"error": f"Unknown job kind; use one of {', '.join(JOB_KINDS)}"}), 404
+    try:
+        function, args, files = prepare(request)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        job_id = JOBS.submit(kind, function, *args, files=files)
+    except jobs.JobQueueFull as e:
+        METRICS.inc("jobs_rejected_total", (("kind", kind),))
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "5"}
+    METRICS.inc("jobs_submitted_total", (("kind", kind),))
+    location = f"/api/jobs/{job_id}"
+    return jsonify({"id": job_id, "kind": kind, "state": "queued", "status_url": location}), 202, {"Location": location}
+
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    """The most recent background jobs, newest first, without their results"""
+    return jsonify({"jobs": JOBS.recent(JOB_LIST_LIMIT)})
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """State, progress (0..1) and timing of a job; ``result`` once it is done, ``error`` if it failed"""
+    found = JOBS.status(job_id)
+    if found is None:
+        return jsonify({"error": "Job not found (it may have expired)"}), 404
+    status, result = found
+    body = app.json.dumps(status)
+    if result is not None:
+        # The result is stored as JSON text; splice it in instead of re-encoding it.
+        body = body[:-1] + ',"result":' + result + "}"
+    return Response(body, mimetype="application/json")
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Cancel a queued or running job, or delete a finished job and its result
+
+    A running job stops at its next progress update; poll it until its
+    state is ``cancelled``.
+    """
+    previous = JOBS.cancel(job_id)
+    if previous is None:
+        return jsonify({"error": "Job not found (it may have expired)"}), 404
+    if previous in jobs.FINISHED:
+        return jsonify({"id": job_id, "state": previous, "deleted": True})
+    found = JOBS.status(job_id)
+    return jsonify(found[0] if found else {"id": job_id, "state": "cancelled"})
+
+def _lru_stats(cache_info):
+    info = cache_info()
+    return info.hits, info.misses, info.currsize
+
+METRICS.register_cache("experiment", lambda: (EXPERIMENT_CACHE.hits, EXPERIMENT_CACHE.misses, len(EXPERIMENT_CACHE)))
+METRICS.register_cache("formula", lambda: _lru_stats(parse_formula.cache_info))
+METRICS.register_cache("balance", lambda: _lru_stats(balancer.cache_info))
+METRICS.register_cache("chemical_resolver", lambda: _lru_stats(CATALOG.chemical_resolver.cache_info))
+METRICS.register_cache("titration", lambda: _lru_stats(titration.cache_info))
+METRICS.register_cache("spectrum", lambda: _lru_stats(spectroscopy.cache_info))
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Request, timing and cache metrics in Prometheus text format"""
+    return Response(METRICS.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
 
 @app.route('/api/health', methods=['GET'])
 def health():
@@ -992,12 +1304,20 @@ def meta():
         "endpoints": {
             "stats": "/api/stats",
             "reactions": "/api/reactions",
+            "reactions_query": "/api/reactions/query",
             "tools": "/api/tools",
             "chemicals": "/api/chemicals",
+            "chemicals_resolve": "/api/chemicals/resolve",
             "run_experiment": "/api/run-experiment",
+            "equilibrium": "/api/equilibrium",
+            "spectrum": "/api/spectroscopy/spectrum",
             "findings_get": "/api/findings",
             "findings_post": "/api/findings",
-            "health": "/api/health"
+            "findings_import": "/api/findings/import",
+            "findings_export": "/api/findings/export",
+            "jobs": "/api/jobs",
+            "health": "/api/health",
+            "metrics": "/api/metrics"
         }
     })
 
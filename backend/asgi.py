@@ -0,0 +1,181 @@
+"""ASGI entry point: the same API on an asyncio server.
+
+Run from the repository root::
+
+    uvicorn --app-dir backend asgi:application --host 0.0.0.0 --port 5000 --workers 4
+
+The routes that wait on I/O or on the clock are served natively here. The
+findings store runs on worker threads (writes on one thread, so SQLite
+never has two writers in this process), and streamed simulations sleep
+with ``asyncio.sleep`` instead of holding a thread, computing their frames
+on the thread pool a batch at a time. A WebSocket channel,
+``/ws/run-experiment``, streams the same events: send a JSON object with
+the /api/run-experiment/stream fields and receive one JSON message per
+event, as many runs per connection as needed. Every other route is the
+Flask app, run on the thread pool, so behaviour is identical to
+``wsgi.py``.
+"""
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MultiDict
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route, WebSocketRoute
+from starlette.websockets import WebSocketDisconnect
+
+import app as vlab
+from compression import MIN_SIZE, compress, negotiate
+
+FINDINGS_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="findings-writer")
+WSGI_THREADS = 32
+# Simulation events computed per thread pool hop.
+EVENT_BATCH = 64
+
+
+async def _json_body(request):
+    try:
+        return await request.json()
+    except ValueError:
+        return None
+
+
+async def save_findings(request):
+    data = await _json_body(request)
+    if not isinstance(data, dict):
+        return JSONResponse({"error": "Expected a JSON object"}, status_code=400)
+    finding = vlab.build_finding(data)
+    try:
+        await asyncio.get_running_loop().run_in_executor(FINDINGS_WRITER, vlab.store_finding, finding)
+    except Exception:
+        # If persistence fails, still return the finding so the UI can store it locally.
+        pass
+    return JSONResponse(finding, status_code=201)
+
+
+async def get_findings(request):
+    try:
+        limit, after, filters = vlab.parse_findings_query(request.query_params)
+    except ValueError:
+        return JSONResponse({"error": "Invalid limit, after, since or until parameter"}, status_code=400)
+
+    if request.query_params.get('format') == 'ndjson':
+        async def generate():
+            cursor = after
+            while True:
+                rows = await run_in_threadpool(vlab.FINDINGS_STORE.page_json, limit=200, after=cursor, **filters)
+                for _, body in rows:
+                    yield body + "\n"
+                if len(rows) < 200:
+                    return
+                cursor = rows[-1][0]
+        return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+    body, headers = await run_in_threadpool(vlab.findings_page, limit, after, filters)
+    body = body.encode("utf-8")
+    encoding = negotiate(request.headers.get('accept-encoding'))
+    if encoding and len(body) >= MIN_SIZE:
+        body = await run_in_threadpool(compress, body, encoding)
+        headers["Content-Encoding"] = encoding
+    headers["Vary"] = "Accept-Encoding"
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def instrumented(route):
+    """Record native routes in the same metrics as the Flask routes."""
+    def decorate(handler):
+        async def endpoint(request):
+            started = time.perf_counter()
+            response = await handler(request)
+            length = request.headers.get('content-length')
+            body = None if isinstance(response, StreamingResponse) else len(response.body)
+            vlab.METRICS.observe_request(request.method, route, response.status_code, time.perf_counter() - started,
+                                         int(length) if length and length.isdigit() else None, body)
+            return response
+        return endpoint
+    return decorate
+
+
+@instrumented('/api/findings')
+async def findings(request):
+    if request.method == 'POST':
+        return await save_findings(request)
+    return await get_findings(request)
+
+
+async def paced(events, realtime):
+    """Async iterator over ``(event, payload)``, sleeping until each event is due.
+
+    ``events`` is advanced on the thread pool, a batch at a time, so the
+    kinetics model never runs on the event loop.
+    """
+    started = time.monotonic()
+    while True:
+        batch = await run_in_threadpool(list, islice(events, EVENT_BATCH))
+        if not batch:
+            return
+        for t, event, payload in batch:
+            if realtime:
+                await asyncio.sleep(max(0.0, started + t - time.monotonic()))
+            yield event, payload
+
+
+def _prepare_experiment(data):
+    vlab.reload_catalog_if_changed()
+    return vlab.experiment_events(data)
+
+
+async def _experiment_events(data):
+    return await run_in_threadpool(_prepare_experiment, data)
+
+
+@instrumented('/api/run-experiment/stream')
+async def stream_experiment(request):
+    json_body = await _json_body(request) if request.method == 'POST' else None
+    query = MultiDict(request.query_params.multi_items())
+    try:
+        data = vlab.stream_request_data(request.method, query, json_body)
+        events, realtime = await _experiment_events(data)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    accept = request.headers.get('accept', '')
+    use_sse = request.query_params.get('format') == 'sse' or accept.startswith('text/event-stream')
+
+    async def generate():
+        async for event, payload in paced(events, realtime):
+            yield vlab.encode_event(event, payload, use_sse)
+
+    media_type = "text/event-stream" if use_sse else "application/x-ndjson"
+    return StreamingResponse(generate(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+
+async def experiment_socket(websocket):
+    await websocket.accept()
+    try:
+        while True:
+            data = await websocket.receive_json()
+            if not isinstance(data, dict):
+                await websocket.send_json({"event": "error", "error": "Expected a JSON object"})
+                continue
+            try:
+                events, realtime = await _experiment_events(data)
+            except ValueError as e:
+                await websocket.send_json({"event": "error", "error": str(e)})
+                continue
+            async for event, payload in paced(events, realtime):
+                await websocket.send_text(json.dumps({"event": event, **payload}, ensure_ascii=False))
+    except WebSocketDisconnect:
+        pass
+
+
+application = Starlette(routes=[
+    Route('/api/findings', findings, methods=['GET', 'POST']),
+    Route('/api/run-experiment/stream', stream_experiment, methods=['GET', 'POST']),
+    WebSocketRoute('/ws/run-experiment', experiment_socket),
+    Mount('/', WSGIMiddleware(vlab.app, workers=WSGI_THREADS)),
+])
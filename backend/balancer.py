@@ -0,0 +1,180 @@
+"""Exact balancing of chemical equations.
+
+Each species is a column of the element-conservation matrix (one row per
+element, plus one for charge), with products entered negated. A balanced
+equation is a positive integer vector in the matrix's null space, which is
+found by exact integer elimination, so large organic and redox equations
+do not suffer from floating-point round-off. Results
+are memoized per normalized equation string.
+"""
+import itertools
+import math
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+from equations import ARROW_RE, ELECTRON_RE, split_equation
+from formula import parse_formula
+
+CACHE_SIZE = 4096
+# When several independent balances exist (null space dimension > 1), basis
+# combinations with weights up to this value are tried for an all-positive one.
+MAX_COMBINATION_WEIGHT = 4
+MAX_FREE_DIMENSIONS = 3
+
+_SPACES_RE = re.compile(r"\s+")
+
+BalancedEquation = namedtuple("BalancedEquation", ["equation", "reactants", "products", "unique"])
+BalancedEquation.__doc__ = """``reactants``/``products`` are tuples of ``(coefficient, species)``;
+``unique`` is False when the species admit more than one independent balance."""
+
+
+def _matrix(reactants, products):
+    species = [s for _, s in reactants] + [s for _, s in products]
+    signs = [1] * len(reactants) + [-1] * len(products)
+    rows = {}
+    charge = [0] * len(species)
+    for column, (name, sign) in enumerate(zip(species, signs)):
+        if ELECTRON_RE.match(name):
+            charge[column] = -sign
+            continue
+        parsed = parse_formula(name)
+        for element, count in parsed.elements:
+            rows.setdefault(element, [0] * len(species))[column] += sign * count
+        charge[column] = sign * parsed.charge
+    matrix = list(rows.values())
+    if any(charge):
+        matrix.append(charge)
+    return matrix
+
+
+def null_space(matrix, columns):
+    """Integer basis of the null space of ``matrix`` (a list of int rows).
+
+    Fraction-free Gauss-Jordan elimination: rows stay integer and are
+    divided by their gcd after every step, so no rational arithmetic is
+    needed and the entries stay small.
+    """
+    rows = [list(row) for row in matrix]
+    pivots = []
+    rank = 0
+    for column in range(columns):
+        pivot = next((r for r in range(rank, len(rows)) if rows[r][column]), None)
+        if pivot is None:
+            continue
+        rows[rank], rows[pivot] = rows[pivot], rows[rank]
+        lead_row = rows[rank]
+        lead = lead_row[column]
+        for r in range(len(rows)):
+            factor = rows[r][column]
+            if r == rank or not factor:
+                continue
+            row = [lead * a - factor * b for a, b in zip(rows[r], lead_row)]
+            divisor = 0
+            for v in row:
+                divisor = math.gcd(divisor, v)
+            rows[r] = [v // divisor for v in row] if divisor > 1 else row
+        pivots.append(column)
+        rank += 1
+        if rank == len(rows):
+            break
+    leads = [rows[r][column] for r, column in enumerate(pivots)]
+    scale = 1
+    for lead in leads:
+        scale = scale * abs(lead) // math.gcd(scale, lead)
+    basis = []
+    for free in (c for c in range(columns) if c not in pivots):
+        vector = [0] * columns
+        vector[free] = scale
+        for row, column, lead in zip(rows, pivots, leads):
+            vector[column] = -row[free] * scale // lead
+        basis.append(vector)
+    return basis
+
+
+def _integers(vector):
+    """Divide an integer vector by its gcd and give it a positive sum."""
+    divisor = 0
+    for v in vector:
+        divisor = math.gcd(divisor, v)
+    integers = [v // divisor for v in vector]
+    return [-v for v in integers] if sum(integers) < 0 else integers
+
+
+def _positive_solution(basis):
+    if len(basis) == 1:
+        vector = _integers(basis[0])
+        return vector if all(v > 0 for v in vector) else None
+    if len(basis) > MAX_FREE_DIMENSIONS:
+        return None
+    best = None
+    for weights in itertools.product(range(-MAX_COMBINATION_WEIGHT, MAX_COMBINATION_WEIGHT + 1), repeat=len(basis)):
+        if not any(weights):
+            continue
+        combined = [sum(w * b[i] for w, b in zip(weights, basis)) for i in range(len(basis[0]))]
+        if not any(combined):
+            continue
+        vector = _integers(combined)
+        if all(v > 0 for v in vector) and (best is None or sum(vector) < sum(best)):
+            best = vector
+    return best
+
+
+def normalize_equation(equation):
+    return _SPACES_RE.sub(" ", str(equation or "")).strip()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _balance(equation):
+    reactants, products = split_equation(equation)
+    if not reactants or not products:
+        raise ValueError(f"Equation {equation!r} needs at least one reactant and one product")
+    columns = len(reactants) + len(products)
+    basis = null_space(_matrix(reactants, products), columns)
+    if not basis:
+        raise ValueError(f"Equation {equation!r} cannot be balanced: elements are not conserved")
+    coefficients = _positive_solution(basis)
+    if coefficients is None:
+        raise ValueError(f"Equation {equation!r} cannot be balanced with positive coefficients")
+
+    reactant_terms = tuple(zip(coefficients, (s for _, s in reactants)))
+    product_terms = tuple(zip(coefficients[len(reactants):], (s for _, s in products)))
+    arrow = ARROW_RE.search(equation).group(0).strip()
+
+    def side(terms):
+        return " + ".join(f"{c}{s}" if c != 1 else s for c, s in terms)
+
+    return BalancedEquation(
+        equation=f"{side(reactant_terms)} {arrow} {side(product_terms)}",
+        reactants=reactant_terms,
+        products=product_terms,
+        unique=len(basis) == 1,
+    )
+
+
+def balance_equation(equation):
+    """Balance ``equation``; raises ValueError if it cannot be balanced.
+
+    Coefficients already in the equation are ignored, and energy/catalyst
+    phrases are dropped (see :func:`equations.split_equation`).
+    """
+    return _balance(normalize_equation(equation))
+
+
+def check_equations(reactions):
+    """Balance every reaction's ``equation``.
+
+    Returns ``{reaction_id: error message}`` for the equations that could
+    not be balanced; the rest are left in the memo cache.
+    """
+    problems = {}
+    for reaction_id, reaction in reactions.items():
+        try:
+            balance_equation(reaction.get("equation"))
+        except ValueError as e:
+            problems[reaction_id] = str(e)
+    return problems
+
+
+cache_info = _balance.cache_info
+cache_clear = _balance.cache_clear
@@ -0,0 +1,58 @@
+"""Balance a large generated set of equations, cold and memoized.
+
+Usage: python backend/benchmarks/bench_balance.py [--equations 4000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import balancer  # noqa: E402
+from formula import parse_formula  # noqa: E402
+from synthetic import synthetic_equations  # noqa: E402
+
+
+def run(equations):
+    timings = []
+    failures = 0
+    for equation in equations:
+        start = time.perf_counter()
+        try:
+            balancer.balance_equation(equation)
+        except ValueError:
+            failures += 1
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings, failures
+
+
+def report(label, timings):
+    total = sum(timings)
+    p50 = timings[len(timings) // 2] * 1e6
+    p99 = timings[int(len(timings) * 0.99)] * 1e6
+    print(f"{label:<8} total {total * 1000:8.1f} ms  p50 {p50:7.1f} us  p99 {p99:7.1f} us  max {timings[-1] * 1e6:8.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--equations", type=int, default=4000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    equations = synthetic_equations(args.equations, seed=args.seed)
+    print(f"{len(equations)} equations ({len(set(equations))} distinct)")
+    balancer.cache_clear()
+    parse_formula.cache_clear()
+    timings, failures = run(equations)
+    report("cold", timings)
+    timings, _ = run(equations)
+    report("memoized", timings)
+    print(f"unbalanceable: {failures}")
+    info = balancer.cache_info()
+    print(f"balance cache: {info.currsize}/{info.maxsize} entries, {info.hits} hits, {info.misses} misses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""1,000 single /api/calculate/* calls vs. one POST /api/calculate/batch.
+
+Usage: python backend/benchmarks/bench_calculate_batch.py [--operations 1000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as vlab  # noqa: E402
+
+FORMULAS = ["H2O", "CO2", "Ca(OH)2", "CuSO4·5H2O", "C6H12O6", "K4[Fe(CN)6]", "NaCl", "Pb(NO3)2"]
+
+
+def worksheet(count, seed=3):
+    rng = random.Random(seed)
+    operations = []
+    for _ in range(count):
+        op = rng.choice(["molecular-weight", "molarity", "ph", "stoichiometry"])
+        if op == "molecular-weight":
+            operations.append({"op": op, "formula": rng.choice(FORMULAS)})
+        elif op == "molarity":
+            operations.append({"op": op, "moles": rng.uniform(0.1, 5), "volume": rng.uniform(0.1, 2)})
+        elif op == "ph":
+            operations.append({"op": op, "h_concentration": 10 ** -rng.uniform(1, 13)})
+        else:
+            operations.append({"op": op, "reactant_moles": rng.uniform(0.1, 5),
+                               "reactant_coeff": rng.randint(1, 6), "product_coeff": rng.randint(1, 6)})
+    return operations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--operations", type=int, default=1000)
+    args = parser.parse_args()
+
+    client = vlab.app.test_client()
+    operations = worksheet(args.operations)
+
+    start = time.perf_counter()
+    singles = []
+    for operation in operations:
+        params = {k: v for k, v in operation.items() if k != "op"}
+        singles.append(client.post(f"/api/calculate/{operation['op']}", json=params).get_json())
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = client.post("/api/calculate/batch", json={"operations": operations}).get_json()["results"]
+    batch_time = time.perf_counter() - start
+
+    assert singles == batched, "batched results differ from single calls"
+    print(f"{len(operations)} operations")
+    print(f"single calls : {single_time * 1000:9.1f} ms")
+    print(f"one batch    : {batch_time * 1000:9.1f} ms  ({single_time / batch_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
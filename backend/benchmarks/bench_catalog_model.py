@@ -0,0 +1,107 @@
+"""Memory and filter speed of the reaction catalog: dict of dicts vs. ReactionTable.
+
+Each layout is built in its own process from the same synthetic records,
+with strings interned the way the catalog loader interns them. Memory is
+the growth of the process's peak RSS during the build. The timed
+operations are the ones the catalog endpoints need: every category
+filter, the exothermic/endothermic stats, and random lookups by id.
+
+Usage: python backend/benchmarks/bench_catalog_model.py [--reactions 1000000] [--lookups 100000]
+"""
+import argparse
+import os
+import random
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import _compact  # noqa: E402
+from catalog_model import ReactionTable  # noqa: E402
+from synthetic import CATEGORIES, iter_synthetic_reactions  # noqa: E402
+
+# ru_maxrss is in KiB on Linux and in bytes on macOS.
+RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+def build_dicts(records):
+    return {record["id"]: record for record in records}
+
+
+def build_table(records):
+    return ReactionTable.from_records(records)
+
+
+def dict_filters(reactions):
+    values = list(reactions.values())
+    sizes = [len([r for r in values if r["category"].lower() == c.lower()]) for c in CATEGORIES]
+    exothermic = sum("Exothermic" in r["type"] for r in values)
+    endothermic = sum("Endothermic" in r["type"] for r in values)
+    return sizes, exothermic, endothermic
+
+
+def table_filters(table):
+    sizes = [len(table.category_rows(c)) for c in CATEGORIES]
+    return sizes, table.count_type("Exothermic"), table.count_type("Endothermic")
+
+
+LAYOUTS = {"dicts": (build_dicts, dict_filters), "table": (build_table, table_filters)}
+
+
+def measure(layout, count, lookups, seed=3):
+    """Build one layout in this process and time it; returns a dict of results."""
+    build, filters = LAYOUTS[layout]
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    catalog = build(map(_compact, iter_synthetic_reactions(count)))
+    build_s = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    result = filters(catalog)
+    filter_s = time.perf_counter() - start
+
+    rng = random.Random(seed)
+    ids = [f"synthetic_{rng.randrange(count)}" for _ in range(lookups)]
+    start = time.perf_counter()
+    for reaction_id in ids:
+        catalog[reaction_id]["name"]
+    lookup_s = time.perf_counter() - start
+    return {"memory": (rss_after - rss_before) * RSS_UNIT, "build": build_s, "filters": filter_s,
+            "lookups": lookup_s, "result": result}
+
+
+def run_isolated(layout, count, lookups):
+    # A fresh process per layout, so one layout's garbage never counts against the other.
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(measure, layout, count, lookups).result()
+
+
+def report(label, before, after, unit, scale=1.0):
+    ratio = before / after if after else float("inf")
+    print(f"{label:<18} {before * scale:12.1f} {after * scale:12.1f} {unit:<4} {ratio:7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reactions", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    args = parser.parse_args()
+
+    dicts = run_isolated("dicts", args.reactions, args.lookups)
+    table = run_isolated("table", args.reactions, args.lookups)
+    assert dicts["result"] == table["result"], (dicts["result"], table["result"])
+
+    print(f"catalog: {args.reactions} reactions, {args.lookups} lookups")
+    print(f"{'':<18} {'dicts':>12} {'table':>12}")
+    report("peak memory", dicts["memory"], table["memory"], "MiB", 1 / 2**20)
+    report("build", dicts["build"], table["build"], "s")
+    report("filters + stats", dicts["filters"], table["filters"], "ms", 1000)
+    # Lookups favor dicts: the table builds each row it returns.
+    report("lookups by id", dicts["lookups"], table["lookups"], "ms", 1000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Concurrent live streams on one worker: Flask (gunicorn gthread) vs. the ASGI app (uvicorn).
+
+Opens N simultaneous realtime /api/run-experiment/stream connections (each
+lasting ``--stream-seconds``) against one single-process server of each
+kind, and counts how many streams finish on time.
+
+Usage: python backend/benchmarks/bench_concurrency.py [--connections 50,200,1000] [--stream-seconds 5]
+"""
+import argparse
+import asyncio
+import http.client
+import os
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PATH = "/api/run-experiment/stream?chemicals=HCl&chemicals=NaOH&frames={frames}&duration_s={seconds}&realtime=1"
+
+
+def start_server(kind, port):
+    if kind == "flask":
+        env = dict(os.environ, VLAB_WORKERS="1", VLAB_BIND=f"127.0.0.1:{port}", VLAB_ACCESS_LOG="")
+        command = [sys.executable, "-m", "gunicorn", "-c", os.path.join(BACKEND_DIR, "gunicorn.conf.py")]
+    else:
+        env = dict(os.environ)
+        command = [sys.executable, "-m", "uvicorn", "--app-dir", BACKEND_DIR, "asgi:application",
+                   "--host", "127.0.0.1", "--port", str(port), "--no-access-log", "--backlog", "4096"]
+    return subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_until_up(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/api/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not come up")
+
+
+async def one_stream(port, path, timeout):
+    start = time.monotonic()
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection("127.0.0.1", port), timeout)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\nAccept: text/event-stream\r\nConnection: close\r\n\r\n".encode())
+        await writer.drain()
+        body = await asyncio.wait_for(reader.read(-1), max(0.1, timeout - (time.monotonic() - start)))
+        writer.close()
+    except (OSError, asyncio.TimeoutError):
+        return None
+    return time.monotonic() - start if b"event: end" in body else None
+
+
+async def run_level(port, connections, seconds, frames):
+    path = PATH.format(frames=frames, seconds=seconds)
+    timeout = seconds * 2 + 5
+    return await asyncio.gather(*(one_stream(port, path, timeout) for _ in range(connections)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", default="50,200,1000")
+    parser.add_argument("--stream-seconds", type=float, default=5.0)
+    parser.add_argument("--frames", type=int, default=5)
+    parser.add_argument("--port", type=int, default=5066)
+    args = parser.parse_args()
+
+    on_time = args.stream_seconds + 1.0
+    for kind in ("flask", "asgi"):
+        server = start_server(kind, args.port)
+        try:
+            wait_until_up(args.port)
+            for connections in (int(c) for c in args.connections.split(",")):
+                durations = asyncio.run(run_level(args.port, connections, args.stream_seconds, args.frames))
+                finished = sorted(d for d in durations if d is not None)
+                timely = sum(1 for d in finished if d <= on_time)
+                slowest = f"{finished[-1]:6.2f} s" if finished else "     -"
+                print(f"{kind:<6} {connections:5d} streams: {timely:5d} on time, {len(finished):5d} finished, "
+                      f"{connections - len(finished):5d} failed, slowest {slowest}")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
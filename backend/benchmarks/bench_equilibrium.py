@@ -0,0 +1,58 @@
+"""Haber-process yield surface: per-point equilibrium solves vs. one vectorized grid solve.
+
+The per-point baseline calls the solver once for each (T, P) pair, as a
+client looping over single-condition requests would. Both give the same
+ammonia mole fractions.
+
+Usage: python backend/benchmarks/bench_equilibrium.py [--temperatures 100] [--pressures 100]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import equilibrium  # noqa: E402
+
+EQUATION = "N₂ + 3H₂ ⇌ 2NH₃"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--temperatures", type=int, default=100)
+    parser.add_argument("--pressures", type=int, default=100)
+    parser.add_argument("--sample", type=int, default=500, help="per-point solves timed (then extrapolated)")
+    args = parser.parse_args()
+
+    thermodynamics = equilibrium.THERMODYNAMICS["synthesis_ammonia"]
+    temperatures = np.linspace(200, 700, args.temperatures)
+    pressures = np.linspace(1, 1000, args.pressures)
+    points = len(temperatures) * len(pressures)
+
+    start = time.perf_counter()
+    grid = equilibrium.solve(EQUATION, thermodynamics, temperatures, pressures)
+    grid_s = time.perf_counter() - start
+    ammonia = grid.fractions[grid.species.index("NH₃")]
+
+    rng = np.random.default_rng(5)
+    sample = [(rng.integers(len(temperatures)), rng.integers(len(pressures))) for _ in range(min(args.sample, points))]
+    start = time.perf_counter()
+    error = 0.0
+    for i, j in sample:
+        single = equilibrium.solve(EQUATION, thermodynamics, temperatures[i:i + 1], pressures[j:j + 1])
+        error = max(error, abs(single.fractions[2, 0, 0] - ammonia[i, j]))
+    per_point_s = (time.perf_counter() - start) / len(sample) * points
+
+    print(f"{args.temperatures} temperatures x {args.pressures} pressures = {points} grid points")
+    print(f"per-point solves  {per_point_s * 1000:9.1f} ms (extrapolated from {len(sample)})")
+    print(f"grid solve        {grid_s * 1000:9.1f} ms   max |Δx(NH₃)| {error:.1e}")
+    best = np.unravel_index(ammonia.argmax(), ammonia.shape)
+    print(f"x(NH₃) at 450 °C, 200 bar: {ammonia[np.abs(temperatures - 450).argmin(), np.abs(pressures - 200).argmin()]:.3f};"
+          f" highest {ammonia[best]:.3f} at {temperatures[best[0]]:.0f} °C, {pressures[best[1]]:.0f} bar")
+
+
+if __name__ == "__main__":
+    main()
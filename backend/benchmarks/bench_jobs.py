@@ -0,0 +1,100 @@
+"""Light-request latency while long simulations run inline vs. as background jobs.
+
+One client thread keeps sending small /api/run-experiment requests while
+``--heavy`` other threads each run long simulations, either inline (a
+/api/run-experiment/stream read to the end, computed by the server thread)
+or as jobs (POST /api/jobs/simulation, then polled until done). The light
+requests' latency percentiles are compared with an idle server's.
+
+Usage: python backend/benchmarks/bench_jobs.py [--seconds 10] [--heavy 2] [--job-workers 1]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SIMULATION = {"chemicals": ["HCl", "NaOH"], "tools": ["Bunsen Burner"], "heat": 60, "duration_s": 3600, "frames": 500}
+POLL_S = 0.2
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def light_load(client, stop, latencies):
+    rng = random.Random(1)
+    while not stop.is_set():
+        body = {"chemicals": ["HCl", "NaOH"], "tools": ["Bunsen Burner"], "heat": rng.randint(0, 100),
+                "volume_ml": rng.randint(50, 2000)}
+        start = time.perf_counter()
+        client.post("/api/run-experiment", json=body)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+def heavy_inline(client, stop, completed):
+    while not stop.is_set():
+        client.post("/api/run-experiment/stream", json=SIMULATION).get_data()
+        completed.append(1)
+
+
+def heavy_jobs(client, stop, completed):
+    while not stop.is_set():
+        job = client.post("/api/jobs/simulation", json=SIMULATION).get_json()
+        if "id" not in job:
+            time.sleep(POLL_S)
+            continue
+        while client.get(f"/api/jobs/{job['id']}").get_json()["state"] not in ("done", "failed", "cancelled"):
+            time.sleep(POLL_S)
+        completed.append(1)
+
+
+def run_phase(app, heavy, threads, seconds):
+    stop = threading.Event()
+    latencies, completed = [], []
+    workers = [threading.Thread(target=light_load, args=(app.test_client(), stop, latencies))]
+    workers += [threading.Thread(target=heavy, args=(app.test_client(), stop, completed)) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    return sorted(latencies), len(completed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--heavy", type=int, default=2, help="threads running long simulations")
+    parser.add_argument("--job-workers", type=int, default=1)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="vlab-bench-jobs-")
+    os.environ["VLAB_FINDINGS_DB"] = os.path.join(workdir, "findings.db")
+    os.environ["VLAB_JOBS_DB"] = os.path.join(workdir, "jobs.db")
+    os.environ["VLAB_JOB_WORKERS"] = str(args.job_workers)
+    import app as vlab
+
+    # Start the pool before timing, so its start-up is not counted.
+    vlab.app.test_client().post("/api/jobs/simulation", json=dict(SIMULATION, duration_s=1, frames=1))
+    while vlab.JOBS.pending():
+        time.sleep(0.05)
+
+    print(f"{args.heavy} heavy threads, {args.job_workers} job workers, {args.seconds:g} s per phase,"
+          f" {os.cpu_count()} CPU cores")
+    print(f"{'phase':<18} {'light requests':>14} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'simulations':>12}")
+    for label, heavy, threads in (("idle", heavy_inline, 0), ("inline", heavy_inline, args.heavy),
+                                  ("background jobs", heavy_jobs, args.heavy)):
+        latencies, completed = run_phase(vlab.app, heavy, threads, args.seconds)
+        print(f"{label:<18} {len(latencies):>14} {percentile(latencies, 0.5):8.2f} {percentile(latencies, 0.95):8.2f}"
+              f" {percentile(latencies, 0.99):8.2f} {latencies[-1]:8.2f} {completed:>12}")
+    vlab.JOBS.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Requests/second for POST /api/run-experiment, linear scan vs. ReactionIndex.
+
+Usage: python backend/benchmarks/bench_reaction_match.py [--reactions 10000] [--requests 2000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as vlab  # noqa: E402
+from catalog_model import ReactionTable  # noqa: E402
+from lru import LRUCache  # noqa: E402
+from reaction_index import required_symbols_from_equation  # noqa: E402
+from synthetic import synthetic_reactions  # noqa: E402
+
+
+class LinearReactionMatcher:
+    """The pre-index matching loop: re-parse every equation on every request."""
+
+    def __init__(self, reactions):
+        self.reactions = reactions
+
+    def best_match(self, provided_symbols):
+        best = None
+        best_required = set()
+        for reaction in self.reactions.values():
+            required = required_symbols_from_equation(reaction.get("equation"))
+            if not required:
+                required = {r.get("symbol") for r in reaction.get("reactants", []) if r.get("symbol")}
+            if not required:
+                continue
+            if len(required) == 1 and len(provided_symbols) > 1:
+                continue
+            if required.issubset(provided_symbols) and len(required) > len(best_required):
+                best = reaction
+                best_required = required
+        return best, best_required
+
+
+def make_bodies(reactions, count, seed=7):
+    rng = random.Random(seed)
+    catalog = list(reactions.values())
+    bodies = []
+    for _ in range(count):
+        reaction = rng.choice(catalog)
+        symbols = [r["symbol"] for r in reaction["reactants"]]
+        if rng.random() < 0.3:
+            symbols.append(rng.choice(catalog)["reactants"][0]["symbol"])
+        bodies.append({"chemicals": symbols, "tools": ["Thermometer"], "heat": rng.randint(0, 100)})
+    return bodies
+
+
+def run(client, bodies):
+    start = time.perf_counter()
+    for body in bodies:
+        client.post("/api/run-experiment", json=body)
+    elapsed = time.perf_counter() - start
+    return len(bodies) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reactions", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    reactions = {**vlab.CATALOG.reactions, **synthetic_reactions(args.reactions)}
+    with vlab.CATALOG_LOCK:
+        vlab.install_catalog(vlab.CATALOG._replace(reactions=ReactionTable.from_records(reactions.values())))
+    bodies = make_bodies(vlab.CATALOG.reactions, args.requests)
+    client = vlab.app.test_client()
+    # Measure matching, not the result cache.
+    vlab.EXPERIMENT_CACHE = LRUCache(maxsize=0)
+
+    indexed = vlab.CATALOG
+    vlab.CATALOG = indexed._replace(reaction_index=LinearReactionMatcher(reactions))
+    before = run(client, bodies)
+    vlab.CATALOG = indexed
+    after = run(client, bodies)
+
+    print(f"catalog: {len(vlab.CATALOG.reactions)} reactions, {len(bodies)} requests")
+    print(f"linear scan : {before:10.1f} req/s")
+    print(f"indexed     : {after:10.1f} req/s  ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Latency of GET /api/reactions/query filters: scanning dicts vs. ReactionQueryIndex.
+
+Random queries mix category, type, hazard, energy range and reactant
+filters with sorting, and each one asks for the first page of 50. The
+scan baseline filters a dict-of-dicts catalog in Python and sorts every
+match, the way a handler without indexes would.
+
+Usage: python backend/benchmarks/bench_reaction_query.py [--reactions 200000] [--queries 200]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import _compact  # noqa: E402
+from catalog_model import ReactionTable  # noqa: E402
+from reaction_query import SORT_FIELDS, ReactionQuery, ReactionQueryIndex, hazard_words  # noqa: E402
+from synthetic import CATEGORIES, iter_synthetic_reactions  # noqa: E402
+
+PAGE = 50
+
+
+def random_queries(reactions, count, seed=5):
+    rng = random.Random(seed)
+    symbols = sorted({s["symbol"] for r in reactions[:1000] for s in r["reactants"]})
+    queries = []
+    for _ in range(count):
+        filters = {}
+        if rng.random() < 0.5:
+            filters["categories"] = (rng.choice(CATEGORIES),)
+        if rng.random() < 0.3:
+            filters["types"] = (rng.choice(["Exothermic", "Endothermic"]),)
+        if rng.random() < 0.3:
+            filters["hazard"] = (rng.choice(["flammable", "toxic", "corrosive"]),)
+        if rng.random() < 0.5:
+            low = rng.randint(-3000, 2500)
+            filters["min_energy"], filters["max_energy"] = low, low + rng.randint(10, 500)
+        if rng.random() < 0.3:
+            filters["reactants"] = (rng.choice(symbols),)
+        sort = rng.choice([None, "name", "-energy"])
+        queries.append(ReactionQuery(sort=sort, limit=PAGE, **filters))
+    return queries
+
+
+def scan(reactions, query):
+    """The unindexed handler: test every reaction, then sort all matches."""
+    wanted = set().union(*map(hazard_words, query.hazard)) if query.hazard else None
+    categories = {c.lower() for c in query.categories}
+    matches = []
+    for r in reactions:
+        if categories and r["category"].lower() not in categories:
+            continue
+        if query.types and not any(t.casefold() in r["type"].casefold() for t in query.types):
+            continue
+        if wanted and not wanted <= hazard_words(r["hazard"]):
+            continue
+        energy = r["energyRelease"]
+        if query.min_energy is not None and energy < query.min_energy:
+            continue
+        if query.max_energy is not None and energy > query.max_energy:
+            continue
+        if query.reactants and not set(query.reactants) <= {s["symbol"] for s in r["reactants"]}:
+            continue
+        matches.append(r)
+    if query.sort:
+        field = SORT_FIELDS[query.sort.lstrip("-")]
+        matches.sort(key=lambda r: r[field], reverse=query.sort.startswith("-"))
+    return len(matches), matches[query.offset:query.offset + query.limit]
+
+
+def timed(run, queries):
+    timings = []
+    results = []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(run(query))
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return results, timings
+
+
+def summary(label, timings):
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<8} p50 {statistics.median(timings):9.2f} ms   p95 {p95:9.2f} ms   max {timings[-1]:9.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reactions", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    reactions = list(map(_compact, iter_synthetic_reactions(args.reactions)))
+    table = ReactionTable.from_records(reactions)
+    start = time.perf_counter()
+    index = ReactionQueryIndex(table)
+    build = time.perf_counter() - start
+    queries = random_queries(reactions, args.queries)
+    # Sort ranks are built on first use; build them outside the timings.
+    for key in ("name", "-energy"):
+        index.query(ReactionQuery(sort=key, limit=1))
+
+    scanned, scan_timings = timed(lambda q: scan(reactions, q), queries)
+    indexed, index_timings = timed(index.query, queries)
+    for query, expected, actual in zip(queries, scanned, indexed):
+        assert expected[0] == actual[0], (query, expected[0], actual[0])
+
+    print(f"catalog: {args.reactions} reactions, {args.queries} queries, index built in {build:.2f} s")
+    summary("scan", scan_timings)
+    summary("indexed", index_timings)
+    print(f"speedup (p50): {statistics.median(scan_timings) / statistics.median(index_timings):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
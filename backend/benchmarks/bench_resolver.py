@@ -0,0 +1,107 @@
+"""Chemical name resolution on a large inventory: substring scan vs. ChemicalResolver.
+
+Queries are inventory names typed exactly, cut short (autocomplete) or
+with one typo in the first two words. The scan baseline is the
+pre-resolver lookup: exact name/symbol, then the first name containing
+the query. It is timed on the same queries and cannot resolve typos.
+
+Usage: python backend/benchmarks/bench_resolver.py [--inventory 50000] [--queries 2000]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chemical_resolver import ChemicalResolver  # noqa: E402
+from synthetic import synthetic_inventory  # noqa: E402
+
+
+class SubstringScan:
+    """The lookup the resolver replaced in normalize_chemicals()."""
+
+    def __init__(self, chemicals):
+        self.by_name = {v["name"].lower(): v for v in chemicals.values()}
+        self.by_symbol = {v["symbol"].lower(): v for v in chemicals.values()}
+
+    def resolve(self, text):
+        key = text.strip().lower()
+        chem = self.by_name.get(key) or self.by_symbol.get(key)
+        if not chem:
+            chem = next((v for n, v in self.by_name.items() if key in n), None)
+        return chem
+
+
+def typo(word, rng):
+    i = rng.randrange(len(word))
+    edit = rng.choice(["delete", "swap", "insert", "replace"])
+    if edit == "delete":
+        return word[:i] + word[i + 1:]
+    if edit == "swap" and i < len(word) - 1:
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    letter = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    return word[:i] + letter + word[i + (edit == "replace"):]
+
+
+def make_queries(inventory, count, seed=9):
+    """``(query, expected chemical, kind)`` triples."""
+    rng = random.Random(seed)
+    chemicals = list(inventory.values())
+    queries = []
+    for _ in range(count):
+        chemical = rng.choice(chemicals)
+        words = chemical["name"].split()
+        kind = rng.choice(["exact", "prefix", "typo"])
+        if kind == "exact":
+            query = chemical["name"]
+        elif kind == "prefix":
+            query = " ".join(words[:3]) + " " + words[3][:-1] if len(words[3]) > 1 else " ".join(words[:3])
+        else:
+            index = rng.randrange(2)
+            words[index] = typo(words[index], rng)
+            query = " ".join(words)
+        queries.append((query, chemical, kind))
+    return queries
+
+
+def run(resolve, queries):
+    timings = []
+    hits = {}
+    for query, expected, kind in queries:
+        start = time.perf_counter()
+        found = resolve(query)
+        timings.append((time.perf_counter() - start) * 1000)
+        hits.setdefault(kind, []).append(found is expected)
+    timings.sort()
+    return timings, {kind: sum(h) / len(h) for kind, h in sorted(hits.items())}
+
+
+def summary(label, timings, hits):
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    rates = "  ".join(f"{kind} {rate:5.1%}" for kind, rate in hits.items())
+    print(f"{label:<9} p50 {statistics.median(timings):8.3f} ms  p95 {p95:8.3f} ms   correct: {rates}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--inventory", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    inventory = synthetic_inventory(args.inventory)
+    start = time.perf_counter()
+    resolver = ChemicalResolver(inventory)
+    build = time.perf_counter() - start
+    queries = make_queries(inventory, args.queries)
+
+    print(f"inventory: {args.inventory} chemicals, {args.queries} queries, resolver built in {build:.2f} s")
+    summary("scan", *run(SubstringScan(inventory).resolve, queries))
+    # The uncached path; repeated queries are served from the resolver's LRU cache.
+    summary("resolver", *run(lambda q: resolver._resolve(q).chemical, queries))
+
+
+if __name__ == "__main__":
+    main()
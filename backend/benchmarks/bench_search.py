@@ -0,0 +1,70 @@
+"""Type-ahead latency of SearchIndex on a large synthetic catalog.
+
+Every query is typed one character at a time, the way the search box sends
+it, and each prefix is timed separately.
+
+Usage: python backend/benchmarks/bench_search.py [--reactions 100000] [--queries 200]
+"""
+import argparse
+import gc
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_index import SearchIndex  # noqa: E402
+from synthetic import synthetic_reactions  # noqa: E402
+
+
+def typed_queries(reactions, count, seed=11):
+    rng = random.Random(seed)
+    catalog = list(reactions.values())
+    queries = []
+    for _ in range(count):
+        reaction = rng.choice(catalog)
+        source = rng.choice([
+            reaction["name"],
+            reaction["category"],
+            reaction["reactants"][0]["symbol"].translate(str.maketrans("₀₁₂₃₄₅₆₇₈₉", "0123456789")),
+            f"{reaction['category']} {reaction['reactants'][0]['symbol']}",
+        ])
+        queries.extend(source[:end] for end in range(1, min(len(source), 16) + 1))
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reactions", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    reactions = synthetic_reactions(args.reactions)
+    start = time.perf_counter()
+    index = SearchIndex(reactions)
+    build = time.perf_counter() - start
+    # Same as app.py after building the catalog indexes.
+    gc.freeze()
+
+    queries = typed_queries(reactions, args.queries)
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, limit=args.limit)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+
+    def pct(p):
+        return timings[min(len(timings) - 1, int(len(timings) * p))]
+
+    print(f"catalog: {len(index)} reactions, index build {build:.2f}s")
+    print(f"{len(timings)} type-ahead queries, limit={args.limit}")
+    print(f"mean {statistics.mean(timings):.3f} ms  p50 {pct(0.5):.3f} ms  "
+          f"p95 {pct(0.95):.3f} ms  p99 {pct(0.99):.3f} ms  max {timings[-1]:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
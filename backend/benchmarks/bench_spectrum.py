@@ -0,0 +1,89 @@
+"""Spectrum synthesis: a per-band loop vs. the band-matrix product, and JSON vs. float32 bodies.
+
+The loop baseline adds one band profile at a time into each species'
+spectrum, in float64, which is how a spectrum is usually summed. The band
+matrix works in float32, the precision of the returned spectrum; the
+relative difference printed is that rounding. The encoding rows time the
+two response bodies for the total spectrum plus every component.
+
+Usage: python backend/benchmarks/bench_spectrum.py [--species 100] [--points 10000] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import spectroscopy  # noqa: E402
+from spectroscopy import Band, Species, SpectrumSpec  # noqa: E402
+
+
+def synthetic_species(count, seed=3):
+    rng = random.Random(seed)
+    return tuple(
+        Species(f"dye {i}", rng.uniform(1e-6, 1e-4), tuple(
+            Band(rng.uniform(200, 800), rng.uniform(1e3, 1e5), rng.uniform(5, 80), rng.choice(spectroscopy.SHAPES))
+            for _ in range(rng.randint(1, 4))
+        ))
+        for i in range(count)
+    )
+
+
+def loop_rows(spec, wavelengths):
+    rows = np.zeros((len(spec.species) + 1, len(wavelengths)))
+    for index, species in enumerate(spec.species, 1):
+        for band in species.bands:
+            x = (wavelengths - band.center_nm) / band.width_nm
+            profile = 1 / (1 + 4 * x * x) if band.shape == "lorentzian" else np.exp(-4 * np.log(2) * x * x)
+            rows[index] += band.epsilon * species.concentration * spec.path_length_cm * profile
+    rows[0] = rows[1:].sum(axis=0)
+    return rows
+
+
+def timed(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--species", type=int, default=100)
+    parser.add_argument("--points", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    species = synthetic_species(args.species)
+    spec = SpectrumSpec(species, 1.0, 200.0, 800.0, args.points, True)
+    wavelengths = spectroscopy.grid(spec.start_nm, spec.stop_nm, spec.points)
+    bands = sum(len(s.bands) for s in species)
+    print(f"{args.species} species, {bands} bands, {args.points} grid points, median of {args.repeat} runs")
+
+    loop_ms, expected = timed(lambda: loop_rows(spec, wavelengths), args.repeat)
+    matrix_ms, rows = timed(lambda: spectroscopy.absorbance_rows(spec, wavelengths), args.repeat)
+    error = float(np.abs(rows - expected).max() / np.abs(expected).max())
+    print(f"per-band loop  {loop_ms:8.1f} ms")
+    print(f"band matrix    {matrix_ms:8.1f} ms   max relative difference {error:.1e}")
+    spectroscopy.spectrum.cache_clear()
+    spectroscopy.spectrum(spec)
+    cached_ms, result = timed(lambda: spectroscopy.spectrum(spec), args.repeat)
+    print(f"cached         {cached_ms:8.3f} ms")
+
+    json_ms, body = timed(lambda: json.dumps([np.round(r.astype(float), 6).tolist() for r in result.absorbance]),
+                          args.repeat)
+    binary_ms, raw = timed(lambda: result.absorbance.astype("<f4", copy=False).tobytes(), args.repeat)
+    print(f"JSON body      {json_ms:8.1f} ms  {len(body) / 1e6:7.2f} MB")
+    print(f"float32 body   {binary_ms:8.3f} ms  {len(raw) / 1e6:7.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
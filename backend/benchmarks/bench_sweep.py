@@ -0,0 +1,50 @@
+"""Heat x volume grid as single /api/run-experiment calls vs. one POST /api/run-experiment/sweep.
+
+Usage: python backend/benchmarks/bench_sweep.py [--heat-steps 21] [--volume-steps 40]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as vlab  # noqa: E402
+from lru import LRUCache  # noqa: E402
+
+MIXTURE = {"chemicals": ["HCl", "NaOH"], "tools": ["Bunsen Burner", "pH Meter", "Thermometer"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--heat-steps", type=int, default=21)
+    parser.add_argument("--volume-steps", type=int, default=40)
+    args = parser.parse_args()
+
+    # Every grid point is a distinct input; keep the result cache from growing.
+    vlab.EXPERIMENT_CACHE = LRUCache(maxsize=0)
+    client = vlab.app.test_client()
+    sweep = dict(MIXTURE, heat={"start": 0, "stop": 100, "steps": args.heat_steps},
+                 volume_ml={"start": 50, "stop": 2000, "steps": args.volume_steps})
+
+    start = time.perf_counter()
+    grid = client.post("/api/run-experiment/sweep", json=sweep).get_json()
+    sweep_time = time.perf_counter() - start
+    columns = grid["measurements"]
+
+    start = time.perf_counter()
+    singles = []
+    for heat, volume in zip(columns["heat_level"], columns["volume_ml"]):
+        payload = client.post("/api/run-experiment", json=dict(MIXTURE, heat=heat, volume_ml=volume)).get_json()
+        singles.append(payload["measurements"])
+    single_time = time.perf_counter() - start
+
+    for name in ("temperature_c", "rate", "heat_level", "volume_ml"):
+        assert [m[name] for m in singles] == columns[name], f"sweep {name} differs from single calls"
+    print(f"{len(singles)} grid points")
+    print(f"single calls : {single_time * 1000:9.1f} ms")
+    print(f"one sweep    : {sweep_time * 1000:9.1f} ms  ({single_time / sweep_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
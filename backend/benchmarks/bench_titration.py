@@ -0,0 +1,99 @@
+"""Titration curves: per-volume scalar solves vs. one vectorized solve over every volume.
+
+The scalar baseline bisects the same charge balance in plain Python for
+each titrant volume, the way a point-by-point curve is usually computed.
+Both give the same pH (to 1e-12); the vectorized solver's first call and a
+repeated (cached) call are timed separately.
+
+Usage: python backend/benchmarks/bench_titration.py [--points 2001] [--repeat 5]
+"""
+import argparse
+import math
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import titration  # noqa: E402
+from titration import TitrationSpec  # noqa: E402
+
+CASES = {
+    "strong acid": dict(analyte="strong_acid", pka=()),
+    "acetic acid": dict(analyte="weak_acid", pka=(4.76,)),
+    "phosphoric acid": dict(analyte="weak_acid", pka=(2.15, 7.20, 12.35)),
+    "ammonia buffer": dict(analyte="weak_base", pka=(9.25,), conjugate_concentration=0.05),
+}
+
+
+def spec_for(case, points):
+    params = dict(concentration=0.1, volume_ml=25.0, titrant_concentration=0.1,
+                  conjugate_concentration=0.0, max_volume_ml=None, points=points, plot_points=400)
+    params.update(case)
+    params["titrant"] = "strong_base" if params["analyte"].endswith("_acid") else "strong_acid"
+    return TitrationSpec(**params)
+
+
+def scalar_ph(pka, charge, weak, cations, anions):
+    """Bisection on pH for one composition, in plain Python."""
+    low, high = titration.PH_LOW, titration.PH_HIGH
+    for _ in range(60):
+        ph = 0.5 * (low + high)
+        h = 10.0 ** -ph
+        balance = h - titration.KW / h + cations - anions
+        if pka:
+            terms = [h ** (len(pka) - j) * math.prod(10.0 ** -k for k in pka[:j]) for j in range(len(pka) + 1)]
+            total = sum(terms)
+            balance += weak * sum((charge - j) * t / total for j, t in enumerate(terms))
+        if balance > 0:
+            low = ph
+        else:
+            high = ph
+    return 0.5 * (low + high)
+
+
+def scalar_curve(spec):
+    stoichiometric = titration.stoichiometric_volumes(spec)
+    volumes = np.linspace(0.0, 1.5 * stoichiometric[-1], spec.points)
+    pka, charge, weak, cations, anions = titration._composition(spec, volumes)
+    return np.array([scalar_ph(pka, charge, w, c, a) for w, c, a in zip(weak, cations, anions)])
+
+
+def timed(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=2001)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{args.points} titrant volumes per curve, median of {args.repeat} runs")
+    print(f"{'case':<16} {'scalar':>11} {'vectorized':>11} {'cached':>9}  max |ΔpH|")
+    for label, case in CASES.items():
+        spec = spec_for(case, args.points)
+        scalar_ms, expected = timed(lambda: scalar_curve(spec), max(1, args.repeat // 2))
+
+        def uncached():
+            titration.titration_curve.cache_clear()
+            return titration.titration_curve(spec)
+
+        vector_ms, _ = timed(uncached, args.repeat)
+        cached_ms, _ = timed(lambda: titration.titration_curve(spec), args.repeat)
+        volumes = np.linspace(0.0, 1.5 * titration.stoichiometric_volumes(spec)[-1], spec.points)
+        ph = titration.solve_ph(*titration._composition(spec, volumes))
+        error = float(np.abs(ph - expected).max())
+        print(f"{label:<16} {scalar_ms:8.1f} ms {vector_ms:8.1f} ms {cached_ms:6.3f} ms  {error:.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""HTTP load test of the production server across worker counts.
+
+Starts gunicorn with ``gunicorn.conf.py`` at each worker count and drives
+/api/run-experiment and /api/reactions over keep-alive connections from
+several client processes, reporting throughput and latency percentiles.
+Use ``--url`` to load an already running server instead.
+
+Usage: python backend/benchmarks/load_test.py [--workers 1,2,4] [--duration 10] [--connections 64]
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MIXTURES = [
+    ["HCl", "NaOH"], ["CH₄", "O₂"], ["Fe", "CuSO₄"], ["H₂", "O₂"], ["CaCO₃"],
+    ["Pb(NO₃)₂", "KI"], ["CH₃COOH", "C₂H₅OH"], ["Al", "Fe₂O₃"], ["H₂O₂", "I⁻", "H⁺"], ["Water", "Salt"],
+]
+
+
+def requests_for(endpoint, index):
+    if endpoint == "reactions":
+        return "GET", "/api/reactions", None
+    body = {
+        "chemicals": MIXTURES[index % len(MIXTURES)],
+        "tools": ["Bunsen Burner", "Thermometer"],
+        "heat": index % 101,
+        "volume_ml": 250,
+    }
+    return "POST", "/api/run-experiment", json.dumps(body).encode()
+
+
+def _connection_loop(host, port, endpoint, deadline, offset, results):
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    latencies = []
+    errors = 0
+    index = offset
+    while time.perf_counter() < deadline:
+        method, path, body = requests_for(endpoint, index)
+        index += 1
+        headers = {"Content-Type": "application/json"} if body else {}
+        start = time.perf_counter()
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+    results.append((latencies, errors))
+
+
+def _client_process(args):
+    host, port, endpoint, connections, duration, seed = args
+    deadline = time.perf_counter() + duration
+    results = []
+    threads = [
+        threading.Thread(target=_connection_loop, args=(host, port, endpoint, deadline, seed * 1000 + i, results))
+        for i in range(connections)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latencies = [value for batch, _ in results for value in batch]
+    return latencies, sum(errors for _, errors in results)
+
+
+def load(host, port, endpoint, connections, duration, processes):
+    per_process = max(1, connections // processes)
+    jobs = [(host, port, endpoint, per_process, duration, seed) for seed in range(processes)]
+    with multiprocessing.Pool(processes) as pool:
+        outcomes = pool.map(_client_process, jobs)
+    latencies = sorted(value for batch, _ in outcomes for value in batch)
+    errors = sum(errors for _, errors in outcomes)
+    return latencies, errors
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def wait_until_up(host, port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=1)
+            conn.request("GET", "/api/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server on {host}:{port} did not come up")
+
+
+def start_server(workers, port, threads):
+    env = dict(os.environ, VLAB_WORKERS=str(workers), VLAB_THREADS=str(threads),
+               VLAB_BIND=f"127.0.0.1:{port}", VLAB_ACCESS_LOG="")
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", os.path.join(BACKEND_DIR, "gunicorn.conf.py")],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def report(label, endpoint, latencies, errors, duration):
+    print(f"{label:<12} {endpoint:<15} {len(latencies) / duration:9.0f} req/s  "
+          f"p50 {percentile(latencies, 0.50) * 1000:6.2f} ms  p99 {percentile(latencies, 0.99) * 1000:7.2f} ms  "
+          f"errors {errors}")
+
+
+def main():
+    cores = os.cpu_count() or 1
+    default_workers = sorted({1, max(1, cores // 2), cores})
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", default=",".join(map(str, default_workers)),
+                        help="comma-separated worker counts to compare")
+    parser.add_argument("--threads", type=int, default=4, help="threads per worker")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per endpoint and worker count")
+    parser.add_argument("--connections", type=int, default=64, help="concurrent keep-alive connections")
+    parser.add_argument("--client-processes", type=int, default=max(1, cores // 2))
+    parser.add_argument("--endpoints", default="run-experiment,reactions")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--url", help="load an already running server (e.g. http://127.0.0.1:5000) instead")
+    args = parser.parse_args()
+    endpoints = args.endpoints.split(",")
+
+    print(f"{cores} cores, {args.connections} connections, {args.client_processes} client processes")
+    if args.url:
+        parsed = urllib.parse.urlsplit(args.url)
+        for endpoint in endpoints:
+            latencies, errors = load(parsed.hostname, parsed.port or 80, endpoint,
+                                     args.connections, args.duration, args.client_processes)
+            report(parsed.netloc, endpoint, latencies, errors, args.duration)
+        return
+
+    for workers in (int(w) for w in args.workers.split(",")):
+        server = start_server(workers, args.port, args.threads)
+        try:
+            wait_until_up("127.0.0.1", args.port)
+            for endpoint in endpoints:
+                latencies, errors = load("127.0.0.1", args.port, endpoint,
+                                         args.connections, args.duration, args.client_processes)
+                report(f"{workers} worker(s)", endpoint, latencies, errors, args.duration)
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""Benchmark suite: a frontend-shaped request mix, in process or over HTTP.
+
+The mix follows what the frontends send: catalog loads (half of them
+revalidated with If-None-Match), type-ahead search (one request per
+keystroke), experiment runs and notebook saves/loads. Latency percentiles
+and throughput are reported per scenario. ``--save`` writes the results as
+a JSON baseline; ``--compare`` checks a run against a saved baseline and
+exits with status 1 if a scenario's p95 latency or throughput regressed by
+more than ``--tolerance``.
+
+Findings go to a temporary database, never the real notebook.
+
+Usage:
+  python backend/benchmarks/suite.py [--requests 5000] [--save baseline.json]
+  python backend/benchmarks/suite.py --mode http [--workers 2] [--connections 16]
+  python backend/benchmarks/suite.py --synthetic-reactions 100000 --compare baseline.json
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import urlencode, urlsplit
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from load_test import start_server, wait_until_up  # noqa: E402
+from synthetic import synthetic_chemicals, synthetic_reactions, write_catalog  # noqa: E402
+
+# Share of requests per scenario; a search "request" is one typed query (several keystrokes).
+MIX = {"catalog": 0.25, "search": 0.15, "experiment": 0.45, "findings": 0.15}
+CATALOG_PATHS = ["/api/reactions", "/api/tools", "/api/chemicals", "/api/categories", "/api/stats"]
+TOOLS = ["Bunsen Burner", "Thermometer", "pH Meter", "Stirring Rod", "Gloves", "Pipette"]
+LABS = ["Chemistry", "Biology", "Physics"]
+
+Call = namedtuple("Call", ["scenario", "method", "path", "body", "headers"])
+
+
+def build_calls(reactions, chemicals, count, etags, seed=7):
+    """A shuffled, reproducible list of ``count`` calls drawn from :data:`MIX`."""
+    rng = random.Random(seed)
+    categories = sorted({r.get("category") for r in reactions if r.get("category")})
+    names = [r["name"] for r in reactions if r.get("name")]
+    chemical_names = [c["name"] for c in chemicals]
+    scenarios = list(MIX)
+    weights = [MIX[s] for s in scenarios]
+    calls = []
+    while len(calls) < count:
+        scenario = rng.choices(scenarios, weights)[0]
+        if scenario == "catalog":
+            path = rng.choice(CATALOG_PATHS + ["/api/reactions?" + urlencode({"category": rng.choice(categories)})])
+            headers = {"If-None-Match": etags[path]} if path in etags and rng.random() < 0.5 else {}
+            calls.append(Call(scenario, "GET", path, None, headers))
+        elif scenario == "search":
+            query = rng.choice(names)[:12]
+            for end in range(1, len(query) + 1):
+                path = "/api/search?" + urlencode({"q": query[:end], "limit": 10})
+                calls.append(Call(scenario, "GET", path, None, {}))
+        elif scenario == "experiment":
+            body = {
+                "chemicals": rng.sample(chemical_names, min(len(chemical_names), rng.randint(1, 3))),
+                "tools": rng.sample(TOOLS, rng.randint(0, 3)),
+                "type": rng.choice(LABS).lower(),
+                "heat": rng.choice([0, 0, 25, 50, 75, 100]),
+                "volume_ml": rng.choice([100, 250, 500, 1000]),
+            }
+            calls.append(Call(scenario, "POST", "/api/run-experiment", body, {}))
+        elif rng.random() < 0.5:
+            body = {"title": "Benchmark finding", "lab": rng.choice(LABS), "experiment": rng.choice(names),
+                    "content": "Observed " * rng.randint(1, 40), "observations": "", "conclusion": ""}
+            calls.append(Call(scenario, "POST", "/api/findings", body, {}))
+        else:
+            calls.append(Call(scenario, "GET", "/api/findings?limit=20&lab=" + rng.choice(LABS), None, {}))
+    return calls[:count]
+
+
+class InProcessClient:
+    def __init__(self, app):
+        self._client = app.test_client()
+
+    def send(self, call):
+        response = self._client.open(call.path, method=call.method, json=call.body, headers=call.headers)
+        data = response.get_data()
+        return response.status_code, data, response.headers.get("ETag")
+
+    def close(self):
+        pass
+
+
+class HttpClient:
+    def __init__(self, host, port):
+        self._conn = http.client.HTTPConnection(host, port, timeout=60)
+
+    def send(self, call):
+        body = None
+        headers = dict(call.headers)
+        if call.body is not None:
+            body = json.dumps(call.body).encode()
+            headers["Content-Type"] = "application/json"
+        self._conn.request(call.method, call.path, body=body, headers=headers)
+        response = self._conn.getresponse()
+        data = response.read()
+        return response.status, data, response.getheader("ETag")
+
+    def close(self):
+        self._conn.close()
+
+
+def catalog_snapshot(client):
+    """Reactions, chemicals and catalog ETags, fetched through the API like a frontend would."""
+    etags = {}
+    payloads = {}
+    for path in CATALOG_PATHS:
+        status, data, etag = client.send(Call("catalog", "GET", path, None, {}))
+        if status != 200:
+            raise RuntimeError(f"GET {path} returned {status}")
+        payloads[path] = json.loads(data)
+        if etag:
+            etags[path] = etag
+    return payloads["/api/reactions"], payloads["/api/chemicals"], etags
+
+
+def run_calls(make_client, calls, connections):
+    """Send ``calls`` over ``connections`` clients; returns ``(samples, elapsed)``."""
+    samples = []
+    lock = threading.Lock()
+    shards = [calls[i::connections] for i in range(connections)]
+
+    def worker(shard):
+        client = make_client()
+        local = []
+        for call in shard:
+            start = time.perf_counter()
+            try:
+                status, _, _ = client.send(call)
+                ok = status < 400
+            except (OSError, http.client.HTTPException):
+                ok = False
+                client.close()
+                client = make_client()
+            local.append((call.scenario, time.perf_counter() - start, ok))
+        client.close()
+        with lock:
+            samples.extend(local)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(shard,)) for shard in shards]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - start
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def summarize(samples, elapsed):
+    def stats(rows):
+        latencies = sorted(seconds for _, seconds, _ in rows)
+        return {
+            "count": len(rows),
+            "errors": sum(1 for _, _, ok in rows if not ok),
+            "throughput_rps": round(len(rows) / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        }
+
+    scenarios = {}
+    for name in MIX:
+        rows = [s for s in samples if s[0] == name]
+        if rows:
+            scenarios[name] = stats(rows)
+    return {"overall": stats(samples), "scenarios": scenarios}
+
+
+def print_report(results):
+    print(f"{'scenario':<12} {'count':>7} {'errors':>6} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    rows = list(results["scenarios"].items()) + [("overall", results["overall"])]
+    for name, s in rows:
+        print(f"{name:<12} {s['count']:7d} {s['errors']:6d} {s['throughput_rps']:9.1f} "
+              f"{s['p50_ms']:8.2f} {s['p95_ms']:8.2f} {s['p99_ms']:8.2f}")
+
+
+def compare(results, baseline, tolerance):
+    """Print the change against ``baseline``; return the regressed metrics."""
+    regressions = []
+    for name, current in list(results["scenarios"].items()) + [("overall", results["overall"])]:
+        previous = baseline["scenarios"].get(name) if name != "overall" else baseline.get("overall")
+        if not previous:
+            continue
+        p95 = current["p95_ms"] / previous["p95_ms"] - 1 if previous["p95_ms"] else 0.0
+        rps = current["throughput_rps"] / previous["throughput_rps"] - 1 if previous["throughput_rps"] else 0.0
+        print(f"{name:<12} p95 {p95:+7.1%}   throughput {rps:+7.1%}")
+        if p95 > tolerance:
+            regressions.append(f"{name} p95")
+        if rps < -tolerance:
+            regressions.append(f"{name} throughput")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=["inprocess", "http"], default="inprocess")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--connections", type=int, default=1,
+                        help="concurrent clients (in process they share the GIL, so 1 measures latency best)")
+    parser.add_argument("--workers", type=int, default=1, help="server worker processes (http mode)")
+    parser.add_argument("--url", help="http mode: use this running server instead of starting one")
+    parser.add_argument("--port", type=int, default=5057)
+    parser.add_argument("--synthetic-reactions", type=int, default=0,
+                        help="serve a generated catalog with this many reactions")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="vlab-bench-")
+    os.environ["VLAB_FINDINGS_DB"] = os.path.join(workdir, "findings.db")
+    if args.synthetic_reactions:
+        reactions = synthetic_reactions(args.synthetic_reactions, seed=args.seed)
+        catalog_dir = os.path.join(workdir, "catalog")
+        write_catalog(catalog_dir, reactions, synthetic_chemicals(reactions),
+                      os.path.join(BACKEND_DIR, "data", "catalog"))
+        os.environ["VLAB_CATALOG_DIR"] = catalog_dir
+
+    server = None
+    if args.mode == "inprocess":
+        import app as vlab
+        make_client = lambda: InProcessClient(vlab.app)  # noqa: E731
+    elif args.url:
+        target = urlsplit(args.url)
+        make_client = lambda: HttpClient(target.hostname, target.port or 80)  # noqa: E731
+    else:
+        os.environ.setdefault("VLAB_PRELOAD", "1")
+        server = start_server(args.workers, args.port, threads=max(4, args.connections))
+        wait_until_up("127.0.0.1", args.port, timeout=600)
+        make_client = lambda: HttpClient("127.0.0.1", args.port)  # noqa: E731
+
+    try:
+        client = make_client()
+        reactions, chemicals, etags = catalog_snapshot(client)
+        client.close()
+        calls = build_calls(reactions, chemicals, args.requests, etags, seed=args.seed)
+        samples, elapsed = run_calls(make_client, calls, args.connections)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    results = {
+        "mode": args.mode,
+        "workers": args.workers if args.mode == "http" else None,
+        "connections": args.connections,
+        "catalog": {"reactions": len(reactions), "chemicals": len(chemicals)},
+        "requests": len(samples),
+        "elapsed_s": round(elapsed, 3),
+        **summarize(samples, elapsed),
+    }
+    print(f"{results['mode']}: {len(reactions)} reactions, {len(chemicals)} chemicals, "
+          f"{len(samples)} requests in {elapsed:.2f} s")
+    print_report(results)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("regressed: " + ", ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Synthetic catalog generators used by the benchmarks."""
+import json
+import os
+import random
+import shutil
+
+SUBSCRIPTS = str.maketrans("0123456789", "₀₁₂₃₄₅₆₇₈₉")
+ELEMENTS = ["H", "C", "N", "O", "S", "P", "Na", "K", "Ca", "Mg", "Fe", "Cu", "Zn", "Cl", "Br", "Al"]
+CATEGORIES = ["Combustion", "Synthesis", "Decomposition", "Oxidation-Reduction", "Acid-Base", "Precipitation", "Organic"]
+TYPES = ["Exothermic", "Endothermic", "Reversible"]
+
+
+def synthetic_formula(rng):
+    """Random formula with Unicode subscripts, e.g. ``CaCl₂``."""
+    parts = []
+    for element in rng.sample(ELEMENTS, rng.randint(1, 3)):
+        count = rng.randint(1, 4)
+        parts.append(element + (str(count) if count > 1 else ""))
+    return "".join(parts).translate(SUBSCRIPTS)
+
+
+def synthetic_reactions(count, seed=42, symbol_pool=2000):
+    """Return ``count`` REACTIONS-shaped entries keyed by id."""
+    return {reaction["id"]: reaction for reaction in iter_synthetic_reactions(count, seed, symbol_pool)}
+
+
+def iter_synthetic_reactions(count, seed=42, symbol_pool=2000):
+    """Yield the entries of :func:`synthetic_reactions` one at a time."""
+    rng = random.Random(seed)
+    pool = list({synthetic_formula(rng) for _ in range(symbol_pool)})
+    for i in range(count):
+        reactants = rng.sample(pool, rng.randint(1, 3))
+        products = rng.sample(pool, rng.randint(1, 2))
+        category = rng.choice(CATEGORIES)
+        reaction_type = rng.choice(TYPES)
+        arrow = "⇌" if reaction_type == "Reversible" else "→"
+        reaction_id = f"synthetic_{i}"
+        yield {
+            "id": reaction_id,
+            "name": f"{category} of {reactants[0]} #{i}",
+            "equation": f"{' + '.join(reactants)} {arrow} {' + '.join(products)}",
+            "category": category,
+            "description": f"Synthetic {category.lower()} reaction used for benchmarking",
+            "reactants": [{"name": s, "symbol": s, "amount": "1"} for s in reactants],
+            "products": [{"name": s, "symbol": s, "amount": "1"} for s in products],
+            "type": reaction_type,
+            "energyRelease": rng.randint(-3000, 3000),
+            "color": "No visible change",
+            "hazard": rng.choice(["Safe", "Flammable", "Corrosive", "Toxic fumes"]),
+        }
+
+
+# Redox templates with unbalanced species lists; {M} is an alkali metal.
+REDOX_TEMPLATES = [
+    "{M}MnO₄ + HCl → {M}Cl + MnCl₂ + H₂O + Cl₂",
+    "{M}₂Cr₂O₇ + HCl → {M}Cl + CrCl₃ + H₂O + Cl₂",
+    "{M}₄Fe(CN)₆ + {M}MnO₄ + H₂SO₄ → {M}HSO₄ + Fe₂(SO₄)₃ + MnSO₄ + HNO₃ + CO₂ + H₂O",
+    "MnO₄⁻ + Fe²⁺ + H⁺ → Mn²⁺ + Fe³⁺ + H₂O",
+    "Cr₂O₇²⁻ + H⁺ + e⁻ → Cr³⁺ + H₂O",
+]
+
+
+def synthetic_equations(count, seed=42):
+    """Unbalanced equations: combustion of random CHONS organics and redox templates."""
+    rng = random.Random(seed)
+    equations = []
+    for _ in range(count):
+        if rng.random() < 0.2:
+            equations.append(rng.choice(REDOX_TEMPLATES).format(M=rng.choice(["Na", "K", "Li", "Rb", "Cs"])))
+            continue
+        counts = {"C": rng.randint(1, 60), "H": rng.randint(2, 122), "O": rng.randint(0, 12),
+                  "N": rng.choice([0, 0, 1, 2, 4]), "S": rng.choice([0, 0, 0, 1, 2])}
+        fuel = "".join(e + (str(n) if n > 1 else "") for e, n in counts.items() if n).translate(SUBSCRIPTS)
+        products = ["CO₂", "H₂O"] + (["NO₂"] if counts["N"] else []) + (["SO₂"] if counts["S"] else [])
+        equations.append(f"{fuel} + O₂ → {' + '.join(products)}")
+    return equations
+
+
+def synthetic_chemicals(reactions):
+    """CHEMICALS-shaped entries for every reactant symbol in ``reactions``."""
+    chemicals = {}
+    seen = set()
+    for reaction in reactions.values():
+        for reactant in reaction["reactants"]:
+            symbol = reactant["symbol"]
+            if symbol in seen:
+                continue
+            seen.add(symbol)
+            chemicals[f"chem_{len(chemicals)}"] = {
+                "name": f"Compound {symbol}",
+                "symbol": symbol,
+                "category": CATEGORIES[len(chemicals) % len(CATEGORIES)],
+                "color": "#87CEEB",
+            }
+    return chemicals
+
+
+CATIONS = ["Sodium", "Potassium", "Calcium", "Magnesium", "Iron", "Copper", "Zinc", "Aluminum", "Lithium",
+           "Barium", "Silver", "Ammonium", "Nickel", "Cobalt", "Manganese", "Chromium", "Lead", "Tin"]
+ANIONS = ["Chloride", "Sulfate", "Nitrate", "Carbonate", "Hydroxide", "Oxide", "Phosphate", "Acetate",
+          "Bromide", "Iodide", "Permanganate", "Dichromate", "Thiosulfate", "Bicarbonate", "Fluoride"]
+FORMS = ["Anhydrous", "Monohydrate", "Pentahydrate", "Solution", "Powder", "Crystals", "Pellets", "Granules"]
+
+
+def synthetic_inventory(count, seed=42):
+    """``count`` CHEMICALS-shaped entries with salt-like names, e.g. ``Copper Sulfate Powder 17``."""
+    rng = random.Random(seed)
+    inventory = {}
+    for i in range(count):
+        cation, anion, form = rng.choice(CATIONS), rng.choice(ANIONS), rng.choice(FORMS)
+        inventory[f"inv_{i}"] = {
+            "name": f"{cation} {anion} {form} {i}",
+            "symbol": f"{synthetic_formula(rng)}-{i}",
+            "category": "Salt",
+            "color": "#FFFFFF",
+        }
+    return inventory
+
+
+def write_catalog(directory, reactions, chemicals, source_directory):
+    """Write a catalog directory with these reactions and chemicals.
+
+    Tools and experiments are copied from the catalog in ``source_directory``.
+    """
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(source_directory, "manifest.json"), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    collections = manifest["collections"]
+    for name in ("tools", "experiments"):
+        shutil.copyfile(os.path.join(source_directory, collections[name]["file"]),
+                        os.path.join(directory, collections[name]["file"]))
+    with open(os.path.join(directory, collections["reactions"]["file"]), "w", encoding="utf-8") as f:
+        for reaction in reactions.values():
+            f.write(json.dumps(reaction, ensure_ascii=False) + "\n")
+    with open(os.path.join(directory, collections["chemicals"]["file"]), "w", encoding="utf-8") as f:
+        for key, chemical in chemicals.items():
+            f.write(json.dumps({"_key": key, **chemical}, ensure_ascii=False) + "\n")
+    with open(os.path.join(directory, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
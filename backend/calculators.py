@@ -0,0 +1,324 @@
+"""Calculator operations behind /api/calculate/*.
+
+Each operation has a ``prepare`` step that validates one request's
+parameters and a ``compute`` step that evaluates many prepared requests at
+once with NumPy. The single-item endpoints and the batch endpoint share the
+same code path, so a batch gives the same numbers as separate calls.
+Results are rounded with Python's ``round()`` on ``.tolist()`` values:
+``np.round`` scales by a power of ten first and can land one digit off.
+"""
+import math
+
+import numpy as np
+
+from balancer import balance_equation
+from formula import (
+    empirical_formula,
+    empirical_formula_from_masses,
+    molar_mass,
+    parse_formula,
+    percent_composition,
+)
+import titration
+
+TITRATION_DEFAULT_POINTS = 2001
+TITRATION_MAX_POINTS = 20_000
+TITRATION_DEFAULT_PLOT_POINTS = 400
+MAX_PKA_VALUES = 6
+
+
+def _number(value, message):
+    if isinstance(value, bool):
+        raise ValueError(message)
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(message) from None
+    if not math.isfinite(number):
+        raise ValueError(message)
+    return number
+
+
+def _prepare_molecular_weight(params):
+    formula = params.get('formula', '')
+    if not isinstance(formula, str):
+        raise ValueError("formula must be a string")
+    parsed = parse_formula(formula)
+    return formula, parsed, molar_mass(formula)
+
+
+def _compute_molecular_weight(prepared):
+    return [
+        {
+            "formula": formula,
+            "molecular_weight": round(weight, 3),
+            "composition": dict(parsed.elements),
+            "charge": parsed.charge,
+        }
+        for formula, parsed, weight in prepared
+    ]
+
+
+def _prepare_molarity(params):
+    moles = params.get('moles')
+    volume = params.get('volume')  # in liters
+    if not (moles and volume):
+        raise ValueError("Missing parameters")
+    return moles, volume, _number(moles, "moles must be a number"), _number(volume, "volume must be a number")
+
+
+def _compute_molarity(prepared):
+    moles = np.array([p[2] for p in prepared])
+    volume = np.array([p[3] for p in prepared])
+    molarity = moles / volume
+    return [
+        {"moles": p[0], "volume": p[1], "molarity": float(m)}
+        for p, m in zip(prepared, molarity)
+    ]
+
+
+def _prepare_ph(params):
+    h_concentration = params.get('h_concentration')
+    if not h_concentration:
+        raise ValueError("Missing H+ concentration")
+    value = _number(h_concentration, "h_concentration must be a number")
+    if value <= 0:
+        raise ValueError("h_concentration must be positive")
+    return h_concentration, value
+
+
+def _compute_ph(prepared):
+    ph = -np.log10(np.array([p[1] for p in prepared]))
+    return [
+        {"h_concentration": p[0], "pH": round(a, 2), "pOH": round(b, 2)}
+        for p, a, b in zip(prepared, ph.tolist(), (14 - ph).tolist())
+    ]
+
+
+def _prepare_stoichiometry(params):
+    reactant_moles = params.get('reactant_moles')
+    reactant_coeff = params.get('reactant_coeff')
+    product_coeff = params.get('product_coeff')
+    if not all([reactant_moles, reactant_coeff, product_coeff]):
+        raise ValueError("Missing parameters")
+    return (
+        reactant_moles,
+        _number(reactant_moles, "reactant_moles must be a number"),
+        _number(reactant_coeff, "reactant_coeff must be a number"),
+        _number(product_coeff, "product_coeff must be a number"),
+    )
+
+
+def _compute_stoichiometry(prepared):
+    columns = np.array([p[1:] for p in prepared]).reshape(-1, 3)
+    product_moles = columns[:, 0] * columns[:, 2] / columns[:, 1]
+    return [
+        {"reactant_moles": p[0], "product_moles": round(m, 4)}
+        for p, m in zip(prepared, product_moles.tolist())
+    ]
+
+
+def _formula_param(params):
+    formula = params.get('formula', '')
+    if not isinstance(formula, str):
+        raise ValueError("formula must be a string")
+    parse_formula(formula)
+    return formula
+
+
+def _prepare_percent_composition(params):
+    formula = _formula_param(params)
+    return formula, molar_mass(formula), percent_composition(formula)
+
+
+def _compute_percent_composition(prepared):
+    return [
+        {
+            "formula": formula,
+            "molecular_weight": round(weight, 3),
+            "percent_composition": {element: round(percent, 3) for element, percent in percents.items()},
+        }
+        for formula, weight, percents in prepared
+    ]
+
+
+def _prepare_empirical_formula(params):
+    masses = params.get('composition')
+    if masses is None:
+        formula = _formula_param(params)
+        return {"formula": formula}, empirical_formula(formula)
+    if not isinstance(masses, dict) or not masses:
+        raise ValueError("composition must be an object of element -> mass or mass percent")
+    values = {}
+    for element, mass in masses.items():
+        values[element] = _number(mass, "composition values must be numbers")
+        if values[element] < 0:
+            raise ValueError("composition values must not be negative")
+    return {"composition": masses}, empirical_formula_from_masses(values)
+
+
+def _compute_empirical_formula(prepared):
+    return [{**source, "empirical_formula": formula} for source, formula in prepared]
+
+
+def _prepare_balance_equation(params):
+    equation = params.get('equation')
+    if not equation:
+        raise ValueError("Missing equation")
+    if not isinstance(equation, str):
+        raise ValueError("equation must be a string")
+    return equation, balance_equation(equation)
+
+
+def _compute_balance_equation(prepared):
+    return [
+        {
+            "equation": equation,
+            "balanced": balanced.equation,
+            "reactants": [{"species": s, "coefficient": c} for c, s in balanced.reactants],
+            "products": [{"species": s, "coefficient": c} for c, s in balanced.products],
+            "unique": balanced.unique,
+        }
+        for equation, balanced in prepared
+    ]
+
+
+def _positive(params, name, default=None):
+    value = params.get(name, default)
+    if value is None:
+        raise ValueError(f"Missing {name}")
+    number = _number(value, f"{name} must be a number")
+    if number <= 0:
+        raise ValueError(f"{name} must be positive")
+    return number
+
+
+def _count(params, name, default, low, high):
+    value = params.get(name, default)
+    if isinstance(value, bool) or not isinstance(value, int) or not low <= value <= high:
+        raise ValueError(f"{name} must be an integer from {low} to {high}")
+    return value
+
+
+def _analyte(params, weak_only=False):
+    """``(analyte, pka)`` from ``analyte`` plus ``pka`` (or ``pkb`` for bases), sorted."""
+    analyte = params.get('analyte')
+    choices = ("weak_acid", "weak_base") if weak_only else titration.ANALYTES
+    if analyte not in choices:
+        raise ValueError(f"analyte must be one of {', '.join(choices)}")
+    if not analyte.startswith("weak_"):
+        return analyte, ()
+    name = 'pkb' if analyte == "weak_base" and params.get('pka') is None else 'pka'
+    values = params.get(name)
+    values = values if isinstance(values, list) else [values]
+    if values == [None]:
+        raise ValueError(f"Missing {'pka or pkb' if analyte == 'weak_base' else 'pka'}")
+    if not 1 <= len(values) <= MAX_PKA_VALUES:
+        raise ValueError(f"{name} must have 1 to {MAX_PKA_VALUES} values")
+    values = sorted(_number(v, f"{name} values must be numbers") for v in values)
+    pka = titration.conjugate_pka(values) if name == 'pkb' else tuple(values)
+    return analyte, tuple(sorted(pka))
+
+
+def _prepare_titration_curve(params):
+    analyte, pka = _analyte(params)
+    default_titrant = "strong_base" if analyte.endswith("_acid") else "strong_acid"
+    titrant = params.get('titrant', default_titrant)
+    if titrant not in titration.TITRANTS:
+        raise ValueError(f"titrant must be one of {', '.join(titration.TITRANTS)}")
+    conjugate = _number(params.get('conjugate_concentration', 0), "conjugate_concentration must be a number")
+    if conjugate < 0 or (conjugate and not pka):
+        raise ValueError("conjugate_concentration must be non-negative and needs a weak analyte")
+    max_volume = params.get('max_volume_ml')
+    points = _count(params, 'points', TITRATION_DEFAULT_POINTS, 3, TITRATION_MAX_POINTS)
+    return titration.TitrationSpec(
+        analyte=analyte,
+        pka=pka,
+        concentration=_positive(params, 'concentration'),
+        volume_ml=_positive(params, 'volume_ml', 25.0),
+        titrant=titrant,
+        titrant_concentration=_positive(params, 'titrant_concentration', 0.1),
+        conjugate_concentration=conjugate,
+        max_volume_ml=None if max_volume is None else _positive(params, 'max_volume_ml'),
+        points=points,
+        plot_points=_count(params, 'plot_points', min(TITRATION_DEFAULT_PLOT_POINTS, points), 0, points),
+    )
+
+
+def _compute_titration_curve(prepared):
+    # Each curve is one vectorized solve over all of its volumes; repeats come from the cache.
+    return [titration.titration_curve(spec) for spec in prepared]
+
+
+def _prepare_buffer(params):
+    analyte, pka = _analyte(params, weak_only=True)
+    conjugate = _number(params.get('conjugate_concentration', 0), "conjugate_concentration must be a number")
+    if conjugate < 0:
+        raise ValueError("conjugate_concentration must be non-negative")
+    return analyte, pka, _positive(params, 'concentration'), conjugate
+
+
+def _compute_buffer(prepared):
+    results = []
+    for analyte, pka, concentration, conjugate in prepared:
+        ph, capacity = titration.buffer_solution(analyte, pka, concentration, conjugate)
+        results.append({
+            "analyte": analyte,
+            "pka": list(pka),
+            "concentration": concentration,
+            "conjugate_concentration": conjugate,
+            "pH": round(ph, 4),
+            "buffer_capacity": round(capacity, 6),
+        })
+    return results
+
+
+# Operation name (the /api/calculate/<name> suffix) -> (prepare, compute).
+OPERATIONS = {
+    "molecular-weight": (_prepare_molecular_weight, _compute_molecular_weight),
+    "molarity": (_prepare_molarity, _compute_molarity),
+    "ph": (_prepare_ph, _compute_ph),
+    "stoichiometry": (_prepare_stoichiometry, _compute_stoichiometry),
+    "percent-composition": (_prepare_percent_composition, _compute_percent_composition),
+    "empirical-formula": (_prepare_empirical_formula, _compute_empirical_formula),
+    "balance-equation": (_prepare_balance_equation, _compute_balance_equation),
+    "titration-curve": (_prepare_titration_curve, _compute_titration_curve),
+    "buffer": (_prepare_buffer, _compute_buffer),
+}
+
+
+def calculate(operation, params):
+    """Run one operation; raises ValueError for invalid parameters."""
+    prepare, compute = OPERATIONS[operation]
+    return compute([prepare(params)])[0]
+
+
+def calculate_many(items):
+    """Run a list of ``{"op": name, ...params}`` items.
+
+    Items sharing an operation are evaluated together in one vectorized call.
+    Returns one result per item, in order; invalid items get ``{"error": ...}``.
+    """
+    results = [None] * len(items)
+    groups = {}
+    for position, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[position] = {"error": "Each operation must be an object"}
+            continue
+        name = item.get('op')
+        if not isinstance(name, str) or name not in OPERATIONS:
+            results[position] = {"error": f"Unknown operation {name!r}"}
+            continue
+        try:
+            prepared = OPERATIONS[name][0](item)
+        except ValueError as e:
+            results[position] = {"error": str(e)}
+            continue
+        positions, batch = groups.setdefault(name, ([], []))
+        positions.append(position)
+        batch.append(prepared)
+
+    for name, (positions, batch) in groups.items():
+        for position, result in zip(positions, OPERATIONS[name][1](batch)):
+            results[position] = result
+    return results
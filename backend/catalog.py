@@ -0,0 +1,130 @@
+"""Catalog loader for reactions, tools, experiments and chemicals.
+
+The catalog lives in ``data/catalog/`` as one JSON-lines file per collection
+plus a ``manifest.json`` that names the files and carries a ``version``.
+Files are parsed one line at a time. Repeated strings (field names,
+categories, types, hazards) are interned, so a large catalog keeps one copy
+of each. Reactions are loaded into a column-oriented
+:class:`catalog_model.ReactionTable` rather than a dict of dicts.
+
+To publish a new catalog, write the new ``.jsonl`` files first and then
+replace ``manifest.json`` (write a temporary file and rename it) with a
+bumped ``version``. Running workers notice the new version and reload on
+their next request without restarting.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from collections import namedtuple
+
+from catalog_model import ReactionTable
+
+MANIFEST = "manifest.json"
+CHECK_INTERVAL = 2.0
+# Strings up to this length are interned; longer ones (descriptions) are rarely shared.
+INTERN_MAX_LENGTH = 64
+
+Catalog = namedtuple("Catalog", ["version", "reactions", "tools", "experiments", "chemicals"])
+
+
+def _compact(value):
+    if isinstance(value, str):
+        return sys.intern(value) if len(value) <= INTERN_MAX_LENGTH else value
+    if isinstance(value, dict):
+        return {sys.intern(k): _compact(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_compact(v) for v in value]
+    return value
+
+
+def iter_records(path):
+    """Yield the records of a JSON-lines file one at a time."""
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield _compact(json.loads(line))
+            except ValueError as e:
+                raise ValueError(f"{path}:{number}: {e}") from None
+
+
+def read_collection(path, key=None):
+    """Read a JSON-lines collection into a list, or a dict keyed by ``key``.
+
+    Key fields starting with ``_`` only exist in the file and are removed
+    from the loaded records.
+    """
+    if key is None:
+        return list(iter_records(path))
+    records = {}
+    for record in iter_records(path):
+        name = record.pop(key) if key.startswith("_") else record[key]
+        records[name] = record
+    return records
+
+
+def read_reactions(path, key="id"):
+    """Read the reactions collection into a :class:`ReactionTable` keyed by ``id``."""
+    if key != "id":
+        raise ValueError(f"{path}: reactions must be keyed by 'id', not {key!r}")
+    return ReactionTable.from_records(iter_records(path))
+
+
+class CatalogLoader:
+    """Loads the catalog directory and detects newer manifest versions."""
+
+    def __init__(self, directory, check_interval=CHECK_INTERVAL):
+        self.directory = directory
+        self.check_interval = check_interval
+        self.version = None
+        self._manifest_stamp = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def _manifest_path(self):
+        return os.path.join(self.directory, MANIFEST)
+
+    def _stamp(self):
+        stat = os.stat(self._manifest_path())
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def load(self):
+        """Read every collection named in the manifest and return a :class:`Catalog`."""
+        with self._lock:
+            stamp = self._stamp()
+            with open(self._manifest_path(), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            collections = {}
+            for name in Catalog._fields[1:]:
+                spec = manifest["collections"][name]
+                path = os.path.join(self.directory, spec["file"])
+                if name == "reactions":
+                    collections[name] = read_reactions(path, spec.get("key", "id"))
+                else:
+                    collections[name] = read_collection(path, spec.get("key"))
+            self.version = manifest.get("version")
+            self._manifest_stamp = stamp
+            self._next_check = time.monotonic() + self.check_interval
+            return Catalog(version=self.version, **collections)
+
+    def changed(self):
+        """True if the manifest was replaced since the last load.
+
+        The manifest is stat'ed at most once per ``check_interval`` seconds.
+        """
+        now = time.monotonic()
+        if now < self._next_check:
+            return False
+        self._next_check = now + self.check_interval
+        return self.stale()
+
+    def stale(self):
+        """True if the manifest differs from the one last loaded, checked now."""
+        try:
+            return self._stamp() != self._manifest_stamp
+        except OSError:
+            return False
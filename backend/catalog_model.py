@@ -0,0 +1,321 @@
+"""Column-oriented storage for the reaction catalog.
+
+A catalog of plain dicts pays for a hash table per reaction and per
+reactant/product entry, and every filter walks all of them. ``ReactionTable``
+keeps one column per field instead:
+
+- free text (``id``, ``name``, ``equation``, ``description``) as lists of strings;
+- small vocabularies (``category``, ``type``, ``color``, ``hazard``) as
+  ``uint32`` codes into an interned vocabulary;
+- ``energyRelease`` as a ``float64`` array (NaN when absent);
+- reactant/product lists as shared tuples, so a species that appears in
+  many reactions is stored once.
+
+Category filters and type counts are array operations on the code columns.
+The table is a read-only ``Mapping`` of id -> reaction dict. Rows are built
+on access and recently used rows are cached. Code that needs plain dicts
+keeps working unchanged.
+"""
+import sys
+from array import array
+from collections.abc import Mapping
+
+import numpy as np
+
+from lru import LRUCache
+
+FIELDS = ("id", "name", "equation", "category", "description", "reactants", "products",
+          "type", "energyRelease", "color", "hazard")
+TEXT_FIELDS = ("name", "equation", "description")
+CODED_FIELDS = ("category", "type", "color", "hazard")
+SPECIES_FIELDS = ("reactants", "products")
+# Coded fields with a precomputed value -> row positions index.
+GROUPED_FIELDS = ("category", "type")
+_BIT = {name: 1 << i for i, name in enumerate(FIELDS)}
+_ALL = (1 << len(FIELDS)) - 1
+ROW_CACHE_SIZE = 4096
+
+
+class ReactionTable(Mapping):
+    """Read-only reaction catalog stored as columns; see the module docstring."""
+
+    def __init__(self):
+        self._ids = []
+        self._positions = {}
+        self._text = {name: [] for name in TEXT_FIELDS}
+        self._codes = {name: array("I") for name in CODED_FIELDS}
+        self._vocab = {name: [] for name in CODED_FIELDS}
+        self._vocab_index = {name: {} for name in CODED_FIELDS}
+        self._species = {name: [] for name in SPECIES_FIELDS}
+        self._species_pool = {}
+        self._energy = array("d")
+        self._energy_int = array("b")
+        self._present = array("H")
+        # Row -> fields that do not fit the columns (extra keys, unexpected value types).
+        self._extra = {}
+        # A plain cache object: an lru_cache around the bound method would make
+        # the table refer to itself, so a replaced catalog waited for the cyclic GC.
+        self._row_cache = LRUCache(maxsize=ROW_CACHE_SIZE)
+
+    @classmethod
+    def from_records(cls, records):
+        """Build a table from an iterable of reaction dicts; ids must be unique."""
+        table = cls()
+        for record in records:
+            table._append(record)
+        table._freeze()
+        return table
+
+    def _append(self, record):
+        position = len(self._ids)
+        present = 0
+        extra = {}
+        for key, value in record.items():
+            if key not in _BIT:
+                extra[key] = value
+        reaction_id = record.get("id")
+        if not isinstance(reaction_id, str):
+            raise ValueError(f"Reaction #{position} has no string id")
+        if reaction_id in self._positions:
+            raise ValueError(f"Duplicate reaction id {reaction_id!r}")
+        self._ids.append(sys.intern(reaction_id))
+        self._positions[reaction_id] = position
+        present |= _BIT["id"]
+
+        for name in TEXT_FIELDS:
+            value = record.get(name)
+            if isinstance(value, str):
+                present |= _BIT[name]
+            elif name in record:
+                extra[name] = value
+            self._text[name].append(value if isinstance(value, str) else None)
+
+        for name in CODED_FIELDS:
+            value = record.get(name)
+            code = 0
+            if isinstance(value, str):
+                present |= _BIT[name]
+                index = self._vocab_index[name]
+                code = index.get(value)
+                if code is None:
+                    code = index[value] = len(self._vocab[name])
+                    self._vocab[name].append(sys.intern(value))
+            elif name in record:
+                extra[name] = value
+            self._codes[name].append(code)
+
+        for name in SPECIES_FIELDS:
+            value = record.get(name)
+            species = self._pack_species(value) if name in record else None
+            if species is not None:
+                present |= _BIT[name]
+            elif name in record:
+                extra[name] = value
+            self._species[name].append(species)
+
+        energy = record.get("energyRelease")
+        # Integers too large for a float64 keep their exact value in the extras.
+        if isinstance(energy, (int, float)) and not isinstance(energy, bool) and float(energy) == energy:
+            present |= _BIT["energyRelease"]
+            self._energy.append(float(energy))
+            self._energy_int.append(isinstance(energy, int))
+        else:
+            if "energyRelease" in record:
+                extra["energyRelease"] = energy
+            self._energy.append(float("nan"))
+            self._energy_int.append(False)
+
+        self._present.append(present)
+        if extra:
+            self._extra[position] = extra
+
+    def _pack_species(self, entries):
+        """A list of ``{str: str}`` dicts as a shared tuple of tuples, or None if it does not fit."""
+        if not isinstance(entries, list):
+            return None
+        pool = self._species_pool
+        packed = []
+        for entry in entries:
+            if not isinstance(entry, dict):
+                return None
+            item = tuple(entry.items())
+            try:
+                shared = pool.get(item)
+            except TypeError:  # unhashable value
+                return None
+            if shared is None:
+                if not all(isinstance(k, str) and isinstance(v, str) for k, v in item):
+                    return None
+                shared = pool[item] = tuple((sys.intern(k), v) for k, v in item)
+            packed.append(shared)
+        packed = tuple(packed)
+        return pool.setdefault(packed, packed)
+
+    def _freeze(self):
+        # Rows are read from the arrays; vector operations use zero-copy NumPy views of them.
+        self._code_arrays = {name: np.frombuffer(codes, dtype=np.uint32) for name, codes in self._codes.items()}
+        self.energy = np.frombuffer(self._energy, dtype=np.float64)
+        self._present_array = np.frombuffer(self._present, dtype=np.uint16)
+        self._species_pool = None
+        self._vocab_index = None
+
+        # Category and type value -> row positions, grouped once with a stable sort.
+        self._groups = {name: self._group_rows(name) for name in GROUPED_FIELDS}
+        self._category_rows = {}
+        for category, rows in self._groups["category"].items():
+            key = category.lower()
+            existing = self._category_rows.get(key)
+            # Categories differing only in case share one filter, in catalog order.
+            self._category_rows[key] = rows if existing is None else np.sort(np.concatenate([existing, rows]))
+
+    def _group_rows(self, name):
+        codes = self._code_arrays[name]
+        present = (self._present_array & _BIT[name]) != 0
+        order = np.argsort(np.where(present, codes, np.iinfo(np.uint32).max), kind="stable")
+        counts = np.bincount(codes[present], minlength=len(self._vocab[name]))
+        groups = {}
+        start = 0
+        for value, count in zip(self._vocab[name], counts):
+            groups[value] = order[start:start + count]
+            start += count
+        return groups
+
+    def row(self, position):
+        """The reaction dict at ``position``, from the row cache when possible."""
+        reaction = self._row_cache.get(position)
+        if reaction is None:
+            reaction = self._materialize(position)
+            self._row_cache.put(position, reaction)
+        return reaction
+
+    def _materialize(self, position):
+        present = self._present[position]
+        if present == _ALL and position not in self._extra:
+            text, codes, vocab, species = self._text, self._codes, self._vocab, self._species
+            energy = self._energy[position]
+            return {
+                "id": self._ids[position],
+                "name": text["name"][position],
+                "equation": text["equation"][position],
+                "category": vocab["category"][codes["category"][position]],
+                "description": text["description"][position],
+                "reactants": [dict(entry) for entry in species["reactants"][position]],
+                "products": [dict(entry) for entry in species["products"][position]],
+                "type": vocab["type"][codes["type"][position]],
+                "energyRelease": int(energy) if self._energy_int[position] else energy,
+                "color": vocab["color"][codes["color"][position]],
+                "hazard": vocab["hazard"][codes["hazard"][position]],
+            }
+        reaction = {}
+        for name in FIELDS:
+            if not present & _BIT[name]:
+                continue
+            if name == "id":
+                reaction[name] = self._ids[position]
+            elif name in TEXT_FIELDS:
+                reaction[name] = self._text[name][position]
+            elif name in CODED_FIELDS:
+                reaction[name] = self._vocab[name][self._codes[name][position]]
+            elif name in SPECIES_FIELDS:
+                reaction[name] = [dict(entry) for entry in self._species[name][position]]
+            else:
+                energy = self._energy[position]
+                reaction[name] = int(energy) if self._energy_int[position] else energy
+        extra = self._extra.get(position)
+        if extra:
+            reaction.update(extra)
+        return reaction
+
+    # Mapping interface: id -> reaction dict.
+    def __getitem__(self, reaction_id):
+        return self.row(self._positions[reaction_id])
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, reaction_id):
+        return reaction_id in self._positions
+
+    def values(self):
+        return self.rows()
+
+    def items(self):
+        return zip(self._ids, self.rows())
+
+    def rows(self, positions=None):
+        """Iterate reaction dicts in catalog order, or at ``positions``.
+
+        Bulk iteration bypasses the row cache so it does not evict hot rows.
+        """
+        if positions is None:
+            positions = range(len(self._ids))
+        return (self._materialize(int(p)) for p in positions)
+
+    def column(self, name):
+        """Values of one field in catalog order (None where absent)."""
+        if name == "id":
+            return list(self._ids)
+        if name in TEXT_FIELDS:
+            return list(self._text[name])
+        if name in CODED_FIELDS:
+            vocab = self._vocab[name]
+            return [vocab[c] if p & _BIT[name] else None for c, p in zip(self._codes[name], self._present)]
+        raise KeyError(name)
+
+    def vocabulary(self, name):
+        """Distinct values of a coded field, in first-seen order."""
+        return list(self._vocab[name])
+
+    def category_rows(self, category):
+        """Row positions whose category equals ``category`` (case-insensitive), in catalog order."""
+        return self._category_rows.get(category.lower(), np.zeros(0, dtype=np.intp))
+
+    def rows_with(self, name, value):
+        """Row positions whose ``category`` or ``type`` equals ``value`` exactly, in catalog order."""
+        return self._groups[name].get(value, np.zeros(0, dtype=np.intp))
+
+    def mask(self, name, predicate):
+        """Boolean mask of rows whose coded field ``name`` has a value satisfying ``predicate``.
+
+        ``predicate`` is called once per distinct value, not once per row.
+        """
+        vocab_hits = np.array([bool(predicate(value)) for value in self._vocab[name]] + [False])
+        present = (self._present_array & _BIT[name]) != 0
+        return vocab_hits[np.where(present, self._code_arrays[name], len(self._vocab[name]))]
+
+    def type_mask(self, substring):
+        """Boolean mask of rows whose ``type`` contains ``substring``."""
+        return self.mask("type", lambda value: substring in value)
+
+    def species_symbols(self, name):
+        """Per row, the tuple of ``symbol`` values in ``reactants`` or ``products``."""
+        symbol_of = {}  # shared species entry -> its symbol
+        for position, species in enumerate(self._species[name]):
+            if species is None:
+                extra = self._extra.get(position, {}).get(name)
+                yield tuple(s.get("symbol") for s in extra if isinstance(s, dict)) if isinstance(extra, list) else ()
+                continue
+            row = []
+            for entry in species:
+                symbol = symbol_of.get(entry)
+                if symbol is None:
+                    symbol = symbol_of[entry] = dict(entry).get("symbol")
+                row.append(symbol)
+            yield tuple(row)
+
+    def count_type(self, substring):
+        return int(np.count_nonzero(self.type_mask(substring)))
+
+
+def positional(reactions):
+    """``(count, row)`` for a catalog: ``row(i)`` is the i-th reaction in catalog order.
+
+    Works for a :class:`ReactionTable` and for a plain id -> dict mapping.
+    """
+    if isinstance(reactions, ReactionTable):
+        return len(reactions), reactions.row
+    docs = list(reactions.values())
+    return len(docs), docs.__getitem__
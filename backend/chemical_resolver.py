@@ -0,0 +1,278 @@
+"""Resolving typed chemical names and symbols to inventory entries.
+
+A lookup tries, in order:
+
+1. an exact name, alias or inventory key. ``Iron (Fe)`` is also known as
+   ``iron``, and text is NFKC-folded, so ``h2o`` equals ``H₂O``;
+2. an exact symbol, case-sensitive first (``Co`` vs ``CO``), then
+   case-insensitive;
+3. the shortest name completing the query as a prefix of the name or of
+   one of its words, for autocomplete;
+4. the closest name by edit distance, for typos, either to the whole name
+   or to its beginning (``catalse`` finds ``Catalase Enzyme``). Candidates
+   come from a trigram index, so only names sharing several trigrams with
+   the query are compared.
+
+Only exact matches, and prefix or typo matches that are long, close and
+unambiguous enough, are ``confident``: those are safe to substitute for
+the typed text, while the rest are only suggestions.
+
+The prefix index is a sorted list searched with :mod:`bisect` rather than a
+node-per-character trie. It answers the same prefix queries and uses far
+less memory on a large inventory.
+"""
+import bisect
+import re
+import unicodedata
+from collections import namedtuple
+
+import numpy as np
+
+from lru import LRUCache
+
+MIN_FUZZY_LENGTH = 3
+MIN_SIMILARITY = 0.7
+# Trigram candidates compared by edit distance per query.
+FUZZY_CANDIDATES = 64
+# Added to the distance ratio of a typo in a prefix, so whole-name matches rank first.
+PREFIX_PENALTY = 0.05
+# Prefix index entries read per query; short prefixes match huge ranges.
+MAX_PREFIX_SCAN = 256
+CACHE_SIZE = 4096
+# A prefix or typo match is confident only from this many characters, with
+# at least this much of the name typed (prefix) or this similarity (typo),
+# and no other chemical scoring within CONFIDENT_MARGIN of it.
+MIN_CONFIDENT_LENGTH = 3
+MIN_CONFIDENT_PREFIX = 0.5
+MIN_CONFIDENT_SIMILARITY = 0.8
+CONFIDENT_MARGIN = 0.05
+
+_PARENTHETICAL_RE = re.compile(r"\s*\([^()]*\)\s*$")
+_SPACES_RE = re.compile(r"\s+")
+_WORD_START_RE = re.compile(r"(?<![^\W_])[^\W_]")
+
+Resolution = namedtuple("Resolution", ["chemical", "match", "score", "confident"])
+NO_MATCH = Resolution(None, None, 0.0, False)
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+def fold(text):
+    """NFKC-normalize (subscripts to digits), case-fold and collapse whitespace."""
+    return _SPACES_RE.sub(" ", unicodedata.normalize("NFKC", str(text)).casefold()).strip()
+
+
+def aliases(name):
+    """Folded names a chemical answers to: ``Iron Oxide (Fe₂O₃)`` also as ``iron oxide``."""
+    names = [fold(name)]
+    short = fold(_PARENTHETICAL_RE.sub("", str(name)))
+    if short and short != names[0]:
+        names.append(short)
+    return names
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distances(query, names):
+    """Levenshtein distances from ``query`` to each of ``names``, computed together.
+
+    Returns ``(distance, prefix_distance)`` arrays; the prefix distance is
+    to the closest prefix of each name. Each row of the dynamic program is
+    a few array operations over all names at once. Insertions are folded in
+    with a running minimum: ``d[j] = j + min(base[k] - k for k <= j)``.
+    """
+    lengths = np.array([len(name) for name in names])
+    width = int(lengths.max()) if len(names) else 0
+    codes = np.full((len(names), width), -1, dtype=np.int64)
+    for row, name in enumerate(names):
+        codes[row, :len(name)] = [ord(c) for c in name]
+    columns = np.arange(width + 1)
+    previous = np.tile(columns, (len(names), 1))
+    for i, char in enumerate(query, 1):
+        base = np.empty_like(previous)
+        base[:, 0] = i
+        np.minimum(previous[:, 1:] + 1, previous[:, :-1] + (codes != ord(char)), out=base[:, 1:])
+        previous = np.minimum.accumulate(base - columns, axis=1) + columns
+    rows = np.arange(len(names))
+    distance = previous[rows, lengths]
+    # Columns past a name's end belong to the padding, not to a prefix of the name.
+    prefix_distance = np.where(columns <= lengths[:, None], previous, np.iinfo(np.int64).max).min(axis=1)
+    return distance, prefix_distance
+
+
+class ChemicalResolver:
+    """Exact, prefix and typo-tolerant lookup over an inventory of chemical dicts."""
+
+    def __init__(self, chemicals):
+        """``chemicals`` maps inventory keys to dicts with ``name`` and ``symbol``."""
+        self._chemicals = []
+        self._names = {}
+        self._symbols = {}
+        self._symbols_folded = {}
+        self._aliases = []  # alias -> chemical position, parallel lists
+        self._alias_owner = []
+        for key, chemical in chemicals.items():
+            position = len(self._chemicals)
+            self._chemicals.append(chemical)
+            for alias in aliases(chemical.get("name", "")) + [fold(key)]:
+                if alias and alias not in self._names:
+                    self._names[alias] = position
+                    self._aliases.append(alias)
+                    self._alias_owner.append(position)
+            symbol = unicodedata.normalize("NFKC", str(chemical.get("symbol", ""))).strip()
+            if symbol:
+                self._symbols.setdefault(symbol, position)
+                self._symbols_folded.setdefault(fold(symbol), position)
+
+        # Prefix index: every alias, plus the alias from each later word on.
+        prefixes = []
+        for alias_id, alias in enumerate(self._aliases):
+            for match in _WORD_START_RE.finditer(alias):
+                prefixes.append((alias[match.start():], match.start() == 0, alias_id))
+        prefixes.sort()
+        self._prefix_terms = [term for term, _, _ in prefixes]
+        self._prefix_entries = [(whole, alias_id) for _, whole, alias_id in prefixes]
+
+        postings = {}
+        for alias_id, alias in enumerate(self._aliases):
+            for gram in trigrams(alias):
+                postings.setdefault(gram, []).append(alias_id)
+        self._trigrams = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self._trigram_counts = np.array([len(trigrams(alias)) for alias in self._aliases], dtype=np.int32)
+        # Not functools.lru_cache on a bound method: that would be a reference
+        # cycle, keeping a replaced resolver alive until a full collection.
+        self._cache = LRUCache(maxsize=CACHE_SIZE)
+
+    def __len__(self):
+        return len(self._chemicals)
+
+    def exact(self, text):
+        """The chemical named or symbolized exactly ``text`` (after folding), or None."""
+        key = fold(text)
+        position = self._names.get(key)
+        if position is None:
+            position = self._symbols.get(unicodedata.normalize("NFKC", str(text)).strip())
+        if position is None:
+            position = self._symbols_folded.get(key)
+        return None if position is None else self._chemicals[position]
+
+    def complete(self, prefix, limit=10):
+        """``(chemical, alias)`` pairs whose name (or a word of it) starts with ``prefix``.
+
+        Names that start with the prefix come first, then shorter names.
+        """
+        prefix = fold(prefix)
+        if not prefix:
+            return []
+        start = bisect.bisect_left(self._prefix_terms, prefix)
+        hits = []
+        for index in range(start, min(start + MAX_PREFIX_SCAN, len(self._prefix_terms))):
+            if not self._prefix_terms[index].startswith(prefix):
+                break
+            whole, alias_id = self._prefix_entries[index]
+            hits.append((not whole, len(self._aliases[alias_id]), alias_id))
+        hits.sort()
+        return self._distinct(((alias_id, None) for _, _, alias_id in hits), limit)
+
+    def fuzzy(self, text, limit=10, min_similarity=MIN_SIMILARITY):
+        """``(chemical, alias, similarity)`` for names within edit distance of ``text``, best first.
+
+        Similarity is ``1 - distance / max(len)`` for the whole name, and
+        ``1 - distance / len(text) - PREFIX_PENALTY`` for the closest prefix of it.
+        """
+        query = fold(text)
+        if len(query) < MIN_FUZZY_LENGTH:
+            return []
+        grams = [self._trigrams[g] for g in trigrams(query) if g in self._trigrams]
+        if not grams:
+            return []
+        query_grams = len(trigrams(query))
+        shared = np.bincount(np.concatenate(grams), minlength=len(self._aliases))
+        # Names holding most of the query's trigrams are worth an edit-distance
+        # check; among those, names of similar length (higher Dice) come first.
+        ids = np.flatnonzero(shared)
+        shared = shared[ids]
+        dice = 2.0 * shared / (self._trigram_counts[ids] + query_grams)
+        rank = shared / query_grams + dice * 1e-3
+        count = min(FUZZY_CANDIDATES, len(ids))
+        candidates = ids[np.argpartition(-rank, count - 1)[:count]]
+        names = [self._aliases[alias_id] for alias_id in candidates.tolist()]
+        distance, prefix_distance = edit_distances(query, names)
+        lengths = np.array([len(name) for name in names])
+        ratios = np.minimum(distance / np.maximum(lengths, len(query)),
+                            prefix_distance / len(query) + PREFIX_PENALTY)
+        scored = sorted(
+            (ratio, len(name), alias_id)
+            for ratio, name, alias_id in zip(ratios.tolist(), names, candidates.tolist())
+            if ratio <= 1 - min_similarity
+        )
+        return self._distinct(((alias_id, 1 - ratio) for ratio, _, alias_id in scored), limit)
+
+    def _distinct(self, ranked, limit):
+        """The first ``limit`` results with one entry per chemical."""
+        results = []
+        seen = set()
+        for alias_id, score in ranked:
+            position = self._alias_owner[alias_id]
+            if position in seen:
+                continue
+            seen.add(position)
+            alias = self._aliases[alias_id]
+            results.append((self._chemicals[position], alias) if score is None else
+                           (self._chemicals[position], alias, score))
+            if len(results) == limit:
+                break
+        return results
+
+    def resolve(self, text):
+        """The :class:`Resolution` for ``text``; ``match`` is name, symbol, prefix, fuzzy or None."""
+        resolution = self._cache.get(text)
+        if resolution is None:
+            resolution = self._resolve(text)
+            self._cache.put(text, resolution)
+        return resolution
+
+    def _resolve(self, text):
+        key = fold(text)
+        if not key:
+            return NO_MATCH
+        position = self._names.get(key)
+        if position is not None:
+            return Resolution(self._chemicals[position], "name", 1.0, True)
+        chemical = self.exact(text)
+        if chemical is not None:
+            return Resolution(chemical, "symbol", 1.0, True)
+        completions = self.complete(key, limit=2)
+        if completions:
+            chemical, alias = completions[0]
+            score = round(len(key) / len(alias), 3)
+            confident = len(key) >= MIN_CONFIDENT_LENGTH and score >= MIN_CONFIDENT_PREFIX and len(completions) == 1
+            return Resolution(chemical, "prefix", score, confident)
+        matches = self.fuzzy(key, limit=2)
+        if matches:
+            chemical, _, similarity = matches[0]
+            confident = similarity >= MIN_CONFIDENT_SIMILARITY and (
+                len(matches) == 1 or matches[1][2] < similarity - CONFIDENT_MARGIN)
+            return Resolution(chemical, "fuzzy", round(similarity, 3), confident)
+        return NO_MATCH
+
+    def suggest(self, text, limit=5):
+        """Up to ``limit`` ``(chemical, score)`` suggestions: completions first, then near misses."""
+        results = []
+        seen = set()
+        resolution = self.resolve(text)
+        if resolution.match in ("name", "symbol"):
+            results.append((resolution.chemical, resolution.score))
+            seen.add(id(resolution.chemical))
+        completions = [(c, round(len(fold(text)) / len(alias), 3)) for c, alias in self.complete(text, limit)]
+        near = [(c, round(s, 3)) for c, _, s in self.fuzzy(text, limit)]
+        for chemical, score in completions + near:
+            if id(chemical) not in seen:
+                seen.add(id(chemical))
+                results.append((chemical, score))
+        return results[:limit]
+
+    def cache_info(self):
+        return CacheInfo(self._cache.hits, self._cache.misses, self._cache.maxsize, len(self._cache))
@@ -0,0 +1,54 @@
+"""Negotiated gzip/brotli response compression.
+
+Bodies smaller than ``MIN_SIZE`` and streamed responses are sent as-is.
+Brotli is used when the optional ``brotli`` package is installed and the
+client accepts it; otherwise gzip.
+"""
+import gzip
+
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+MIN_SIZE = 1024
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+COMPRESSIBLE = ("application/json", "application/x-ndjson", "text/")
+# Per-request compression favours speed; bodies compressed once and cached use the maximum.
+DYNAMIC_LEVEL = {"br": 4, "gzip": 6}
+STATIC_LEVEL = {"br": 11, "gzip": 9}
+
+
+def negotiate(accept_encodings):
+    """Best encoding from an ``Accept`` object or header string, or None."""
+    if isinstance(accept_encodings, str) or accept_encodings is None:
+        accept_encodings = parse_accept_header(accept_encodings or "", Accept)
+    return accept_encodings.best_match(ENCODINGS)
+
+
+def compress(body, encoding, static=False):
+    level = (STATIC_LEVEL if static else DYNAMIC_LEVEL)[encoding]
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def compress_response(response, request):
+    """after_request hook: compress a buffered response in place if worthwhile."""
+    response.vary.add("Accept-Encoding")
+    if (response.direct_passthrough or response.is_streamed or "Content-Encoding" in response.headers
+            or response.status_code < 200 or response.status_code in (204, 206, 304)
+            or not response.mimetype.startswith(COMPRESSIBLE)):
+        return response
+    body = response.get_data()
+    if len(body) < MIN_SIZE:
+        return response
+    encoding = negotiate(request.accept_encodings)
+    if encoding is None:
+        return response
+    response.set_data(compress(body, encoding))
+    response.headers["Content-Encoding"] = encoding
+    return response
@@ -0,0 +1,44 @@
+"""Splitting catalog equations into coefficient/species terms."""
+import re
+
+ARROW_RE = re.compile(r"\s*(?:→|⇌|<=>|->|=)\s*")
+_COEFFICIENT_RE = re.compile(r"^\s*(\d+)\s*")
+_POLYMER_RE = re.compile(r"^\s*n\s*(?=\()")
+_SPACES_RE = re.compile(r"\s+")
+ELECTRON_RE = re.compile(r"^e(?:⁻|\^?-)$")
+# A "+" between terms, spaced or not ("H2+O2"). A "+" written right after a
+# formula is its charge instead when the side ends there or the next "+"
+# follows ("Na+ + Cl-", "Na++Cl-"), and "^+" is always a charge.
+_PLUS_RE = re.compile(r"\s+\+\s*|(?<![\s^])\+(?!\s*(?:\+|$))\s*")
+
+
+def _terms(side):
+    terms = []
+    for token in _PLUS_RE.split(side.strip()):
+        token = token.strip()
+        coefficient = 1
+        match = _COEFFICIENT_RE.match(token)
+        if match:
+            coefficient = int(match.group(1))
+            token = token[match.end():]
+        if not re.search(r"[A-Z]", token) and not ELECTRON_RE.match(token):
+            continue
+        token = _POLYMER_RE.sub("", token).strip()
+        token = _SPACES_RE.sub(" ", token)
+        if " " in token:
+            # A phrase ("electrical energy", "light") rather than a chemical formula.
+            continue
+        terms.append((coefficient, token))
+    return terms
+
+
+def split_equation(equation):
+    """Return ``(reactants, products)`` as lists of ``(coefficient, species)``.
+
+    Energy, light and catalyst phrases are dropped; electrons (``e⁻``) are
+    kept. A missing coefficient is 1.
+    """
+    parts = ARROW_RE.split(str(equation or ""), maxsplit=1)
+    if len(parts) != 2:
+        raise ValueError(f"Equation {equation!r} has no reaction arrow")
+    return _terms(parts[0]), _terms(parts[1])
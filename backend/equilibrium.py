@@ -0,0 +1,175 @@
+"""Equilibrium composition of one reversible reaction over temperature and pressure grids.
+
+K(T) follows the van 't Hoff equation with a constant reaction enthalpy,
+
+    ln K(T) = ln K(T_ref) - ΔH°/R · (1/T - 1/T_ref)
+
+The composition is a function of the reaction extent ξ, with
+``nᵢ = nᵢ⁰ + νᵢ·ξ``. For an ideal gas mixture, ξ solves
+
+    Σ νᵢ ln nᵢ - Δn·ln n_total = ln K(T) - Δn·ln(P/P°)
+
+and in solution it solves ``Σ νᵢ ln cᵢ = ln K(T)``, with the solvent at unit
+activity. The left side rises monotonically with ξ, with derivative
+``Σ νᵢ²/nᵢ - Δn²/n_total``. Only the right side depends on T and P, so
+every grid point is solved at once: bisection narrows the bracket between
+the extents where a species runs out, then safeguarded Newton iterations
+converge.
+"""
+import math
+import unicodedata
+from collections import namedtuple
+
+import numpy as np
+
+from equations import split_equation
+from kinetics import KELVIN, LIMITING_CONCENTRATION
+
+GAS_CONSTANT = 8.314  # J/(mol·K)
+T_REF = 298.15
+PHASES = ("gas", "solution")
+GAS_FEED = 1.0  # mol per unit stoichiometric coefficient
+BISECTION_STEPS = 8
+MAX_ITERATIONS = 60
+TOLERANCE = 1e-13
+
+Thermodynamics = namedtuple("Thermodynamics", ["log10_k", "delta_h_kj", "phase", "solvents"])
+Thermodynamics.__new__.__defaults__ = ((),)
+
+# Catalog reaction id -> standard data at 298.15 K (K in bar or mol/L units).
+THERMODYNAMICS = {
+    # ΔG° = 2·ΔfG°(NH₃, g) = -32.9 kJ/mol.
+    "synthesis_ammonia": Thermodynamics(log10_k=5.76, delta_h_kj=-92.2, phase="gas"),
+    "esterification": Thermodynamics(log10_k=0.60, delta_h_kj=-3.0, phase="solution"),
+    # ΔG° = -2F·(1.776 V - 0.536 V); water is the solvent.
+    "iodine_clock": Thermodynamics(log10_k=41.9, delta_h_kj=-100.0, phase="solution", solvents=("H₂O",)),
+}
+
+Equilibrium = namedtuple(
+    "Equilibrium",
+    [
+        "species",  # species in the mixture, reactants first
+        "log10_k",  # per temperature
+        "extent",  # mol (or mol/L), shape (temperatures, pressures)
+        "conversion",  # -1..1, the extent relative to the largest possible one in its direction
+        "amounts",  # per species, shape (species, temperatures, pressures)
+        "fractions",  # mole fractions (gas) or concentrations in mol/L (solution), like amounts
+    ],
+)
+
+
+def species_key(symbol):
+    """NFKC-fold a formula, so ``N2`` and ``N₂`` name the same species."""
+    return unicodedata.normalize("NFKC", str(symbol)).strip()
+
+
+def log_k(thermodynamics, temperature_k):
+    """Natural log of K at each temperature (K), by van 't Hoff."""
+    ln_k_ref = thermodynamics.log10_k * math.log(10)
+    delta_h = thermodynamics.delta_h_kj * 1000.0
+    return ln_k_ref - delta_h / GAS_CONSTANT * (1.0 / np.asarray(temperature_k, dtype=float) - 1.0 / T_REF)
+
+
+def stoichiometry(equation, thermodynamics, initial=None):
+    """``(species, ν, n⁰)`` for the species in the equilibrium quotient.
+
+    Species keep their spelling in the equation. Solvents are left out.
+    Reactants start at their coefficient times the feed amount and products
+    at zero, unless ``initial`` (species -> amount) says otherwise.
+    """
+    reactants, products = split_equation(equation)
+    solvents = {species_key(s) for s in thermodynamics.solvents}
+    feed = GAS_FEED if thermodynamics.phase == "gas" else LIMITING_CONCENTRATION
+    coefficients = {}
+    names = {}
+    for sign, terms in ((-1, reactants), (1, products)):
+        for coefficient, species in terms:
+            key = species_key(species)
+            if key not in solvents:
+                coefficients[key] = coefficients.get(key, 0) + sign * coefficient
+                names.setdefault(key, species)
+    keys = [key for key, nu in coefficients.items() if nu]
+    if not keys:
+        raise ValueError(f"Equation {equation!r} has no species that change")
+    nu = np.array([coefficients[key] for key in keys], dtype=float)
+    amounts = np.where(nu < 0, -nu * feed, 0.0)
+    for name, amount in (initial or {}).items():
+        key = species_key(name)
+        if key not in coefficients:
+            raise ValueError(f"{name} is not a species of {equation}")
+        if key in keys:
+            amounts[keys.index(key)] = amount
+    return [names[key] for key in keys], nu, amounts
+
+
+def solve(equation, thermodynamics, temperature_c, pressure_bar, initial=None):
+    """The :class:`Equilibrium` on the grid of ``temperature_c`` × ``pressure_bar``."""
+    species, nu, start = stoichiometry(equation, thermodynamics, initial)
+    temperature_c = np.asarray(temperature_c, dtype=float)
+    pressure_bar = np.asarray(pressure_bar, dtype=float)
+    ln_k = log_k(thermodynamics, temperature_c + KELVIN)
+    gas = thermodynamics.phase == "gas"
+    delta_n = nu.sum() if gas else 0.0
+    target = ln_k[:, None] - delta_n * np.log(pressure_bar)[None, :]
+
+    # ξ between the extents at which a product (backward) or reactant (forward) runs out.
+    lowest = max((-n / v for n, v in zip(start, nu) if v > 0), default=-np.inf)
+    highest = min((-n / v for n, v in zip(start, nu) if v < 0), default=np.inf)
+    if not (np.isfinite(lowest) and np.isfinite(highest)):
+        raise ValueError("Equation needs species on both sides")
+    low = np.full(target.shape, lowest)
+    high = np.full(target.shape, highest)
+
+    def quotient(extent, slope=False):
+        """Σ νᵢ ln nᵢ (- Δn ln n_total) minus its equilibrium value, and optionally its derivative."""
+        amounts = start[:, None, None] + nu[:, None, None] * extent[None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            value = np.tensordot(nu, np.log(amounts), axes=1) - target
+            if gas:
+                total = amounts.sum(axis=0)
+                value -= delta_n * np.log(total)
+            if not slope:
+                return value
+            derivative = np.tensordot(nu * nu, 1.0 / amounts, axes=1)
+            if gas:
+                derivative -= delta_n * delta_n / total
+        return value, derivative
+
+    if highest > lowest:
+        for _ in range(BISECTION_STEPS):
+            extent = 0.5 * (low + high)
+            # Positive: the quotient exceeds K, so the mixture shifts back.
+            above = quotient(extent) > 0
+            high = np.where(above, extent, high)
+            low = np.where(above, low, extent)
+        extent = 0.5 * (low + high)
+        scale = highest - lowest
+        for _ in range(MAX_ITERATIONS):
+            value, slope = quotient(extent, slope=True)
+            above = value > 0
+            high = np.where(above, extent, high)
+            low = np.where(above, low, extent)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                newton = value / slope
+            step = extent - newton
+            # Steps leaving the bracket (or from an exhausted species) bisect instead.
+            extent = np.where((step >= low) & (step <= high), step, 0.5 * (low + high))
+            # Converged once the Newton step (or, near an exhausted species, the bracket) is negligible.
+            if ((np.abs(newton) <= TOLERANCE * scale) | (high - low <= TOLERANCE * scale)).all():
+                break
+    else:
+        extent = low
+
+    amounts = np.maximum(start[:, None, None] + nu[:, None, None] * extent[None], 0.0)
+    fractions = amounts / amounts.sum(axis=0) if gas else amounts
+    # Forward: the share of the limiting reactant used up; backward (negative): of the limiting product.
+    conversion = np.where(extent >= 0, extent / highest if highest > 0 else 0.0,
+                          -extent / lowest if lowest < 0 else 0.0)
+    return Equilibrium(
+        species=species,
+        log10_k=ln_k / math.log(10),
+        extent=extent,
+        conversion=conversion,
+        amounts=amounts,
+        fractions=fractions,
+    )
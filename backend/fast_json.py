@@ -0,0 +1,41 @@
+"""Flask JSON provider that serializes with orjson when it is installed.
+
+orjson is optional. Without it, or with ``VLAB_JSON=std``, Flask's own
+provider is used. Output is compact and keeps non-ASCII characters (such
+as the subscripts in chemical formulas) unescaped, in both cases. Values
+orjson cannot encode natively (dates, very large integers) go through
+Flask's ``default`` hook or fall back to the standard encoder, so
+responses carry the same data either way.
+"""
+import os
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+COMPACT = (",", ":")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    ensure_ascii = False
+    compact = True
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.use_orjson = orjson is not None and os.environ.get("VLAB_JSON", "orjson") != "std"
+        if self.use_orjson:
+            self._options = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                             | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS)
+
+    def dumps(self, obj, **kwargs):
+        # orjson only produces compact output; other formatting requests use the standard encoder.
+        if self.use_orjson and kwargs.get("separators", COMPACT) == COMPACT and set(kwargs) <= {"separators"}:
+            try:
+                return orjson.dumps(obj, default=self.default, option=self._options).decode("utf-8")
+            except TypeError:
+                pass
+        kwargs.setdefault("separators", COMPACT)
+        return super().dumps(obj, **kwargs)
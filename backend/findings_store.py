@@ -0,0 +1,361 @@
+"""SQLite-backed storage for notebook findings.
+
+The previous storage rewrote the whole ``findings.json`` file on every POST,
+so concurrent writers could lose each other's findings. This store uses
+SQLite in WAL mode: each save is a single atomic transaction, readers never
+block writers, and several worker processes can share the same database file.
+
+Saves only insert. Trimming the table to the ``retention`` most recent rows
+is done by a background compactor thread, in short batches, so a large
+import never waits on (or is cut short by) retention.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+RETENTION = 500
+IMPORT_BATCH = 500
+# Invalid lines listed in an import summary (all are counted).
+IMPORT_MAX_ERRORS = 20
+# Rows deleted per compaction transaction; keeps the write lock short.
+COMPACT_BATCH = 5000
+COMPACT_INTERVAL = 60.0
+# Delay after a save before compacting, so a burst of saves compacts once.
+COMPACT_DELAY = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS findings (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL,
+    lab TEXT NOT NULL DEFAULT '',
+    experiment TEXT NOT NULL DEFAULT '',
+    timestamp TEXT NOT NULL DEFAULT '',
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS findings_lab ON findings (lab COLLATE NOCASE, seq);
+CREATE INDEX IF NOT EXISTS findings_timestamp ON findings (timestamp);
+"""
+
+
+def build_finding(data):
+    """The stored finding for a POST /api/findings body."""
+    return {
+        "id": data.get('id', f"finding_{datetime.now().timestamp()}"),
+        "title": data.get('title', 'Untitled Finding'),
+        "content": data.get('content', ''),
+        "experiment": data.get('experiment', ''),
+        "lab": data.get('lab', ''),
+        "timestamp": datetime.now().isoformat(),
+        "observations": data.get('observations', ''),
+        "conclusion": data.get('conclusion', '')
+    }
+
+
+def imported_finding(data, number):
+    """The stored finding for line ``number`` of a bulk import; keeps the line's timestamp."""
+    if not isinstance(data, dict):
+        raise ValueError("expected a JSON object")
+    finding = build_finding(data)
+    if 'id' not in data:
+        finding['id'] = f"{finding['id']}_{number}"
+    timestamp = data.get('timestamp')
+    if timestamp is not None:
+        if not isinstance(timestamp, str):
+            raise ValueError("timestamp must be an ISO 8601 string")
+        finding['timestamp'] = datetime.fromisoformat(timestamp).isoformat()
+    return finding
+
+
+def parse_import(lines, summary, max_errors=IMPORT_MAX_ERRORS):
+    """Yield the findings of NDJSON ``lines`` (str or bytes), for :meth:`FindingsStore.add_many`.
+
+    Invalid lines are skipped: ``summary["rejected"]`` counts them and the
+    first ``max_errors`` are appended to ``summary["errors"]``.
+    """
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield imported_finding(json.loads(line), number)
+        except ValueError as e:
+            summary["rejected"] += 1
+            if len(summary["errors"]) < max_errors:
+                summary["errors"].append({"line": number, "error": str(e)})
+
+
+class FindingsStore:
+    """Append-only findings table, compacted in the background to the ``retention`` most recent rows.
+
+    ``retention=None`` keeps every row.
+    """
+
+    def __init__(self, path, retention=RETENTION, legacy_json=None, compact_interval=COMPACT_INTERVAL):
+        self.path = path
+        self.retention = retention
+        self.legacy_json = legacy_json
+        self.compact_interval = compact_interval
+        self.compacted = 0
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        self._compactor = None
+        self._compact_lock = threading.Lock()
+        self._wakeup = threading.Event()
+
+    def _connect(self):
+        if self._pid != os.getpid():
+            # Forked (e.g. a preloaded server worker): SQLite connections
+            # must not cross a fork, so drop the parent's without using it.
+            # Threads do not survive a fork either.
+            self._local = threading.local()
+            self._pid = os.getpid()
+            self._compactor = None
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            # Autocommit mode; transactions are opened explicitly below.
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA busy_timeout = 10000")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._local.conn = conn
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    self._initialize(conn)
+                    self._initialized = True
+        return conn
+
+    def _initialize(self, conn):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for statement in _SCHEMA.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+            empty = conn.execute("SELECT 1 FROM findings LIMIT 1").fetchone() is None
+            if empty and self.legacy_json and os.path.exists(self.legacy_json):
+                self._import_legacy(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _import_legacy(self, conn):
+        """Copy findings from the old JSON notebook file (stored newest first)."""
+        try:
+            with open(self.legacy_json, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(legacy, list):
+            return
+        for finding in reversed(legacy[: self.retention] if self.retention else legacy):
+            if isinstance(finding, dict):
+                self._insert(conn, finding)
+
+    @staticmethod
+    def _insert(conn, finding):
+        conn.execute(
+            "INSERT INTO findings (id, lab, experiment, timestamp, body) VALUES (?, ?, ?, ?, ?)",
+            (
+                str(finding.get("id", "")),
+                str(finding.get("lab", "")),
+                str(finding.get("experiment", "")),
+                str(finding.get("timestamp", "")),
+                json.dumps(finding, ensure_ascii=False, separators=(",", ":")),
+            ),
+        )
+
+    def add(self, finding):
+        """Atomically append ``finding``."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._insert(conn, finding)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self.schedule_compaction()
+        return finding
+
+    def add_many(self, findings, batch_size=IMPORT_BATCH):
+        """Append findings from an iterable, ``batch_size`` per transaction; returns the count.
+
+        Each batch commits on its own, so other writers get the lock between
+        batches and an error keeps the batches already committed.
+        """
+        conn = self._connect()
+        count = 0
+        batch = []
+        try:
+            for finding in findings:
+                batch.append(finding)
+                if len(batch) == batch_size:
+                    count += self._insert_batch(conn, batch)
+                    batch = []
+            if batch:
+                count += self._insert_batch(conn, batch)
+        finally:
+            if count:
+                self.schedule_compaction()
+        return count
+
+    def _insert_batch(self, conn, findings):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for finding in findings:
+                self._insert(conn, finding)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return len(findings)
+
+    def compact(self):
+        """Delete rows beyond the retention limit, oldest first; returns the number deleted."""
+        if not self.retention:
+            return 0
+        conn = self._connect()
+        deleted = 0
+        with self._compact_lock:
+            while True:
+                cutoff = conn.execute(
+                    "SELECT seq FROM findings ORDER BY seq DESC LIMIT 1 OFFSET ?", (self.retention,)
+                ).fetchone()
+                if cutoff is None:
+                    break
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    cursor = conn.execute(
+                        "DELETE FROM findings WHERE seq IN "
+                        "(SELECT seq FROM findings WHERE seq <= ? ORDER BY seq LIMIT ?)",
+                        (cutoff[0], COMPACT_BATCH),
+                    )
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+                deleted += cursor.rowcount
+                if cursor.rowcount < COMPACT_BATCH:
+                    break
+            if deleted:
+                # Fold the WAL back into the database so it does not grow with every import.
+                conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+                self.compacted += deleted
+        return deleted
+
+    def schedule_compaction(self):
+        """Wake the background compactor, starting it in this process if needed."""
+        if not self.retention:
+            return
+        compactor = self._compactor
+        if compactor is None or not compactor.is_alive():
+            with self._init_lock:
+                if self._compactor is None or not self._compactor.is_alive():
+                    self._compactor = threading.Thread(
+                        target=self._compact_forever, name="findings-compactor", daemon=True
+                    )
+                    self._compactor.start()
+        self._wakeup.set()
+
+    def _compact_forever(self):
+        while True:
+            self._wakeup.wait(self.compact_interval)
+            self._wakeup.clear()
+            time.sleep(COMPACT_DELAY)
+            try:
+                self.compact()
+            except sqlite3.Error:
+                # Busy or locked: the next wakeup retries.
+                pass
+
+    def _retained(self, where, params):
+        """Add a condition to ``where`` that skips rows past the retention limit not yet compacted."""
+        if not self.retention:
+            return where, params
+        clause = "seq > COALESCE((SELECT seq FROM findings ORDER BY seq DESC LIMIT 1 OFFSET ?), 0)"
+        return (f"{where} AND {clause}" if where else f" WHERE {clause}"), params + [self.retention]
+
+    @staticmethod
+    def _where(after=None, lab=None, experiment=None, since=None, until=None, ascending=False):
+        clauses = []
+        params = []
+        if after is not None:
+            clauses.append("seq > ?" if ascending else "seq < ?")
+            params.append(int(after))
+        if lab:
+            clauses.append("lab = ? COLLATE NOCASE")
+            params.append(lab)
+        if experiment:
+            escaped = experiment.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            clauses.append("experiment LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until:
+            clauses.append("timestamp <= ?")
+            params.append(until)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def page_json(self, limit=None, after=None, **filters):
+        """Return ``(seq, json)`` rows newest first, starting below cursor ``after``.
+
+        Filters: ``lab`` (case-insensitive), ``experiment`` (substring),
+        ``since``/``until`` (inclusive ISO timestamps). Rows past the
+        retention limit are skipped even before they are compacted.
+        """
+        conn = self._connect()
+        where, params = self._retained(*self._where(after=after, **filters))
+        params.append((self.retention or -1) if limit is None else limit)
+        return conn.execute(
+            f"SELECT seq, body FROM findings{where} ORDER BY seq DESC LIMIT ?", params
+        ).fetchall()
+
+    def iter_json(self, after=None, batch_size=200, **filters):
+        """Yield matching findings as JSON strings, newest first, one batch at a time."""
+        while True:
+            rows = self.page_json(limit=batch_size, after=after, **filters)
+            for _, body in rows:
+                yield body
+            if len(rows) < batch_size:
+                return
+            after = rows[-1][0]
+
+    def export_json(self, batch_size=1000, **filters):
+        """Yield every retained matching finding as a JSON string, oldest first.
+
+        Importing the output in order recreates the notebook in the same order.
+        """
+        conn = self._connect()
+        after = 0
+        while True:
+            where, params = self._retained(*self._where(after=after, ascending=True, **filters))
+            rows = conn.execute(
+                f"SELECT seq, body FROM findings{where} ORDER BY seq LIMIT ?", params + [batch_size]
+            ).fetchall()
+            for _, body in rows:
+                yield body
+            if len(rows) < batch_size:
+                return
+            after = rows[-1][0]
+
+    def recent_json(self, limit=None):
+        """Return up to ``limit`` findings, newest first, as stored JSON strings."""
+        return [body for _, body in self.page_json(limit=limit)]
+
+    def recent(self, limit=None):
+        """Return up to ``limit`` findings, newest first."""
+        return [json.loads(body) for body in self.recent_json(limit)]
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -0,0 +1,221 @@
+"""Chemical formula parsing shared by the calculators.
+
+``parse_formula`` understands nested groups (``Ca(OH)₂``, ``K₄[Fe(CN)₆]``),
+hydrates (``CuSO₄·5H₂O``), Unicode subscripts, charges (``SO₄²⁻``,
+``NH4^+``) and state suffixes (``(aq)``, ``↓``). Results are memoized in a
+bounded LRU cache, so a formula typed by a whole class is parsed once.
+
+In plain ASCII, digits before a trailing sign are the charge of a single
+element (``Fe3+`` is Fe³⁺, ``O2-`` is O²⁻) and a count otherwise (``NO3-``).
+Several digits there are ambiguous (``SO42-``) and are rejected; ``^``
+(``SO4^2-``, ``N3^-``) always marks the charge.
+"""
+import math
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# IUPAC standard atomic weights (abridged). Elements without stable isotopes
+# use the mass number of their longest-lived isotope.
+ATOMIC_WEIGHTS = {
+    "H": 1.008, "He": 4.0026, "Li": 6.94, "Be": 9.0122, "B": 10.81, "C": 12.011,
+    "N": 14.007, "O": 15.999, "F": 18.998, "Ne": 20.180, "Na": 22.990, "Mg": 24.305,
+    "Al": 26.982, "Si": 28.085, "P": 30.974, "S": 32.06, "Cl": 35.45, "Ar": 39.95,
+    "K": 39.098, "Ca": 40.078, "Sc": 44.956, "Ti": 47.867, "V": 50.942, "Cr": 51.996,
+    "Mn": 54.938, "Fe": 55.845, "Co": 58.933, "Ni": 58.693, "Cu": 63.546, "Zn": 65.38,
+    "Ga": 69.723, "Ge": 72.630, "As": 74.922, "Se": 78.971, "Br": 79.904, "Kr": 83.798,
+    "Rb": 85.468, "Sr": 87.62, "Y": 88.906, "Zr": 91.224, "Nb": 92.906, "Mo": 95.95,
+    "Tc": 98.0, "Ru": 101.07, "Rh": 102.91, "Pd": 106.42, "Ag": 107.87, "Cd": 112.41,
+    "In": 114.82, "Sn": 118.71, "Sb": 121.76, "Te": 127.60, "I": 126.90, "Xe": 131.29,
+    "Cs": 132.91, "Ba": 137.33, "La": 138.91, "Ce": 140.12, "Pr": 140.91, "Nd": 144.24,
+    "Pm": 145.0, "Sm": 150.36, "Eu": 151.96, "Gd": 157.25, "Tb": 158.93, "Dy": 162.50,
+    "Ho": 164.93, "Er": 167.26, "Tm": 168.93, "Yb": 173.05, "Lu": 174.97, "Hf": 178.49,
+    "Ta": 180.95, "W": 183.84, "Re": 186.21, "Os": 190.23, "Ir": 192.22, "Pt": 195.08,
+    "Au": 196.97, "Hg": 200.59, "Tl": 204.38, "Pb": 207.2, "Bi": 208.98, "Po": 209.0,
+    "At": 210.0, "Rn": 222.0, "Fr": 223.0, "Ra": 226.0, "Ac": 227.0, "Th": 232.04,
+    "Pa": 231.04, "U": 238.03, "Np": 237.0, "Pu": 244.0, "Am": 243.0, "Cm": 247.0,
+    "Bk": 247.0, "Cf": 251.0, "Es": 252.0, "Fm": 257.0, "Md": 258.0, "No": 259.0,
+    "Lr": 266.0, "Rf": 267.0, "Db": 268.0, "Sg": 269.0, "Bh": 270.0, "Hs": 269.0,
+    "Mt": 278.0, "Ds": 281.0, "Rg": 282.0, "Cn": 285.0, "Nh": 286.0, "Fl": 289.0,
+    "Mc": 290.0, "Lv": 293.0, "Ts": 294.0, "Og": 294.0,
+}
+
+CACHE_SIZE = 4096
+
+# Subscript digits become plain digits; superscripts are kept apart as the charge.
+_SUBSCRIPTS = str.maketrans("₀₁₂₃₄₅₆₇₈₉", "0123456789")
+_SUPERSCRIPTS = str.maketrans("⁰¹²³⁴⁵⁶⁷⁸⁹⁺⁻", "0123456789+-")
+_SUPERSCRIPT_CHARGE_RE = re.compile(r"[⁰¹²³⁴⁵⁶⁷⁸⁹]*[⁺⁻]+$")
+_ASCII_CHARGE_RE = re.compile(r"(?:\^|\s+)(\d*)([+-])$|([+-]+)$")
+_STATE_RE = re.compile(r"\s*(?:\((?:s|l|g|aq)\)|[↓↑])\s*$")
+_HYDRATE_RE = re.compile(r"\s*[·•∙*.]\s*")
+_MULTIPLIER_RE = re.compile(r"^(\d+)")
+_ION_RE = re.compile(r"^([A-Z][a-z]?)(\d)$")
+_TRAILING_DIGITS_RE = re.compile(r"\d{2,}$")
+_TOKEN_RE = re.compile(r"([A-Z][a-z]?)|([(\[{])|([)\]}])|(\d+)|(\s+)")
+_CLOSING = {"(": ")", "[": "]", "{": "}"}
+
+Composition = namedtuple("Composition", ["elements", "charge"])
+Composition.__doc__ = """Parsed formula: ``elements`` is a tuple of ``(symbol, count)`` pairs
+in order of first appearance; ``charge`` is an int."""
+
+
+def _split_charge(formula):
+    match = _SUPERSCRIPT_CHARGE_RE.search(formula)
+    if match:
+        text = match.group(0).translate(_SUPERSCRIPTS)
+        digits = text.rstrip("+-")
+        signs = text[len(digits):]
+        magnitude = int(digits) if digits else len(signs)
+        charge = magnitude if signs[0] == "+" else -magnitude
+        return formula[: match.start()], charge
+    match = _ASCII_CHARGE_RE.search(formula)
+    if match:
+        if match.group(3):
+            signs = match.group(3)
+            text = formula[: match.start()]
+            ion = _ION_RE.match(text)
+            if ion and len(signs) == 1:
+                magnitude = int(ion.group(2))
+                return ion.group(1), magnitude if signs == "+" else -magnitude
+            if _TRAILING_DIGITS_RE.search(text):
+                raise ValueError(f"Ambiguous charge in formula {formula!r}; mark it with '^', e.g. 'SO4^2-'")
+            charge = len(signs) if signs[0] == "+" else -len(signs)
+        else:
+            magnitude = int(match.group(1)) if match.group(1) else 1
+            charge = magnitude if match.group(2) == "+" else -magnitude
+        return formula[: match.start()], charge
+    return formula, 0
+
+
+def _parse_part(text, original):
+    """Parse one hydrate-free formula segment into an element -> count dict."""
+    stack = [({}, None)]
+    position = 0
+    last = None
+    while position < len(text):
+        match = _TOKEN_RE.match(text, position)
+        if not match:
+            raise ValueError(f"Unexpected character {text[position]!r} in formula {original!r}")
+        element, opening, closing, digits, _ = match.groups()
+        position = match.end()
+        if element:
+            if element not in ATOMIC_WEIGHTS:
+                raise ValueError(f"Unknown element {element!r} in formula {original!r}")
+            counts = stack[-1][0]
+            counts[element] = counts.get(element, 0) + 1
+            last = ("element", element)
+        elif opening:
+            stack.append(({}, _CLOSING[opening]))
+            last = None
+        elif closing:
+            group, expected = stack.pop() if len(stack) > 1 else ({}, None)
+            if expected != closing:
+                raise ValueError(f"Unbalanced {closing!r} in formula {original!r}")
+            counts = stack[-1][0]
+            for key, value in group.items():
+                counts[key] = counts.get(key, 0) + value
+            last = ("group", group)
+        elif digits:
+            if last is None:
+                raise ValueError(f"Misplaced count {digits!r} in formula {original!r}")
+            factor = int(digits)
+            if not factor:
+                raise ValueError(f"Zero count in formula {original!r}")
+            counts = stack[-1][0]
+            kind, value = last
+            if kind == "element":
+                counts[value] += factor - 1
+            else:
+                for key, count in value.items():
+                    counts[key] += count * (factor - 1)
+            last = None
+    if len(stack) != 1:
+        raise ValueError(f"Missing {stack[-1][1]!r} in formula {original!r}")
+    return stack[0][0]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_formula(formula):
+    """Parse ``formula`` into a :class:`Composition`; raises ValueError if invalid."""
+    original = formula
+    text = str(formula).strip()
+    text = _STATE_RE.sub("", text)
+    text, charge = _split_charge(text)
+    text = text.translate(_SUBSCRIPTS).strip()
+    if not text:
+        raise ValueError("Empty formula")
+
+    totals = {}
+    for part in _HYDRATE_RE.split(text):
+        if not part:
+            raise ValueError(f"Empty hydrate segment in formula {original!r}")
+        multiplier = 1
+        match = _MULTIPLIER_RE.match(part)
+        if match:
+            multiplier = int(match.group(1))
+            if not multiplier:
+                raise ValueError(f"Zero count in formula {original!r}")
+            part = part[match.end():]
+        for element, count in _parse_part(part, original).items():
+            totals[element] = totals.get(element, 0) + count * multiplier
+    if not totals:
+        raise ValueError(f"No elements in formula {original!r}")
+    return Composition(tuple(totals.items()), charge)
+
+
+def composition(formula):
+    """Element -> atom count for ``formula``."""
+    return dict(parse_formula(formula).elements)
+
+
+def molar_mass(formula):
+    """Molar mass of ``formula`` in g/mol."""
+    return sum(ATOMIC_WEIGHTS[element] * count for element, count in parse_formula(formula).elements)
+
+
+def percent_composition(formula):
+    """Element -> mass percent for ``formula``."""
+    elements = parse_formula(formula).elements
+    total = sum(ATOMIC_WEIGHTS[element] * count for element, count in elements)
+    return {element: 100.0 * ATOMIC_WEIGHTS[element] * count / total for element, count in elements}
+
+
+def format_formula(elements):
+    """``(symbol, count)`` pairs -> plain formula text, e.g. ``CH2O``."""
+    return "".join(element + (str(count) if count != 1 else "") for element, count in elements)
+
+
+def empirical_formula(formula):
+    """Simplest whole-number ratio formula for ``formula`` (``C6H12O6`` -> ``CH2O``)."""
+    elements = parse_formula(formula).elements
+    divisor = 0
+    for _, count in elements:
+        divisor = math.gcd(divisor, count)
+    return format_formula((element, count // divisor) for element, count in elements)
+
+
+# Mole ratios within this distance of a whole number are accepted.
+EMPIRICAL_TOLERANCE = 0.1
+EMPIRICAL_MAX_MULTIPLIER = 12
+
+
+def empirical_formula_from_masses(masses):
+    """Empirical formula from element -> mass (grams or mass percent); zero masses are skipped."""
+    moles = {}
+    for element, mass in masses.items():
+        if element not in ATOMIC_WEIGHTS:
+            raise ValueError(f"Unknown element {element!r}")
+        if not math.isfinite(mass) or mass < 0:
+            raise ValueError(f"Invalid mass {mass!r} for {element}")
+        if mass > 0:
+            moles[element] = mass / ATOMIC_WEIGHTS[element]
+    if not moles:
+        raise ValueError("No positive element masses")
+    smallest = min(moles.values())
+    ratios = {element: amount / smallest for element, amount in moles.items()}
+    for multiplier in range(1, EMPIRICAL_MAX_MULTIPLIER + 1):
+        scaled = {element: ratio * multiplier for element, ratio in ratios.items()}
+        if all(abs(value - round(value)) <= EMPIRICAL_TOLERANCE for value in scaled.values()):
+            return format_formula((element, round(value)) for element, value in scaled.items())
+    raise ValueError("No small whole-number ratio fits the composition")
@@ -0,0 +1,38 @@
+"""Gunicorn settings for production.
+
+Every setting can be overridden with an environment variable:
+
+- ``VLAB_BIND`` (default ``0.0.0.0:5000``)
+- ``VLAB_WORKERS``: worker processes (default: one per CPU core)
+- ``VLAB_THREADS``: threads per worker (default 4); streamed simulations
+  and findings exports hold a thread while they run
+- ``VLAB_KEEPALIVE``: seconds an idle keep-alive connection stays open (default 5)
+- ``VLAB_ACCESS_LOG``: access log path, ``-`` for stdout (default), empty to disable
+- ``VLAB_PRELOAD``: ``1`` (default) imports the app once in the master.
+  The catalog and its indexes are then built once and shared copy-on-write
+  by the forked workers (they are ``gc.freeze()``-d, so the collector does
+  not touch those pages).
+
+Graceful reload: ``kill -HUP <master pid>`` starts fresh workers and lets
+the old ones finish their requests (up to ``graceful_timeout``). With
+preload on, the new workers are forked from the already-loaded app; catalog
+changes are picked up without any signal (see ``catalog.py``), but deploying
+new code needs a restart, or ``kill -USR2`` followed by ``kill -QUIT`` of
+the old master.
+"""
+import multiprocessing
+import os
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+wsgi_app = "wsgi:application"
+pythonpath = BACKEND_DIR
+bind = os.environ.get("VLAB_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("VLAB_WORKERS", multiprocessing.cpu_count()))
+worker_class = "gthread"
+threads = int(os.environ.get("VLAB_THREADS", 4))
+keepalive = int(os.environ.get("VLAB_KEEPALIVE", 5))
+preload_app = os.environ.get("VLAB_PRELOAD", "1") != "0"
+timeout = 60
+graceful_timeout = 30
+accesslog = os.environ.get("VLAB_ACCESS_LOG", "-") or None
@@ -0,0 +1,393 @@
+"""Background jobs: CPU-heavy work run in a bounded process pool.
+
+A request handler validates its input, submits a job and answers with the
+job's id straight away. The work runs in a ``ProcessPoolExecutor``, so a
+large sweep or a long simulation neither holds a server thread nor competes
+with request handlers for the GIL.
+
+Job state, progress and results are kept in a small SQLite table (WAL mode,
+like the findings store) that the pool processes update themselves. Any
+server worker process can therefore report on or cancel a job, whichever
+one accepted it, and no broker or extra service is needed.
+
+Job functions report progress with :func:`report`, which also raises
+:class:`JobCancelled` once their job has been cancelled, so cancellation of
+a running job is cooperative; a queued job that is cancelled never starts.
+Finished jobs keep their result for ``result_ttl`` seconds, then they are
+deleted.
+"""
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from functools import partial
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+WORKERS = 1
+# Pool processes run at lower CPU priority, so request handlers win on a busy machine.
+NICENESS = 5
+MAX_PENDING = 16
+RESULT_TTL = 3600.0
+# Unfinished jobs left behind by a crashed or killed server are dropped after this.
+MAX_AGE = 86400.0
+# Progress is written (and cancellation checked) at most this often.
+REPORT_INTERVAL = 0.25
+EVICT_INTERVAL = 10.0
+FINISHED = ("done", "failed", "cancelled")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    state TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    cancel INTEGER NOT NULL DEFAULT 0,
+    submitted REAL NOT NULL,
+    started REAL,
+    finished REAL,
+    expires REAL NOT NULL,
+    error TEXT,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_submitted ON jobs (submitted);
+CREATE INDEX IF NOT EXISTS jobs_expires ON jobs (expires);
+"""
+
+_COLUMNS = "id, kind, state, progress, cancel, submitted, started, finished, expires, error"
+
+
+class JobCancelled(Exception):
+    """Raised by :func:`report` inside a job that has been cancelled."""
+
+
+class JobQueueFull(Exception):
+    """This process already has ``max_pending`` unfinished jobs."""
+
+
+def connect(path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # Autocommit mode; the one multi-statement update opens its own transaction.
+    conn = sqlite3.connect(path, timeout=10, isolation_level=None)
+    conn.execute("PRAGMA busy_timeout = 10000")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    for statement in _SCHEMA.split(";"):
+        if statement.strip():
+            conn.execute(statement)
+    return conn
+
+
+def _dumps(value):
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+                            | orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+
+
+def _timestamp(seconds):
+    return None if seconds is None else datetime.fromtimestamp(seconds).isoformat()
+
+
+# --- Pool process side -------------------------------------------------------
+
+_connections = {}
+_running = None
+
+
+class _Running:
+    __slots__ = ("conn", "job_id", "reported")
+
+    def __init__(self, conn, job_id):
+        self.conn = conn
+        self.job_id = job_id
+        self.reported = time.monotonic()
+
+
+def _initialize(niceness):
+    if niceness and hasattr(os, "nice"):
+        os.nice(niceness)
+
+
+def report(done, total=1):
+    """Record that ``done`` of ``total`` units of the current job are finished.
+
+    Raises :class:`JobCancelled` if the job has been cancelled (or its
+    record deleted) since the last write. Outside a job this does nothing,
+    so job functions can also be called inline by a request handler.
+    """
+    job = _running
+    if job is None:
+        return
+    now = time.monotonic()
+    if now - job.reported < REPORT_INTERVAL:
+        return
+    job.reported = now
+    cursor = job.conn.execute(
+        "UPDATE jobs SET progress = ? WHERE id = ? AND cancel = 0",
+        (min(1.0, done / total) if total else 0.0, job.job_id),
+    )
+    if not cursor.rowcount:
+        raise JobCancelled()
+
+
+def _run(path, job_id, result_ttl, function, args):
+    """Run one job in a pool process and store its outcome; returns the final state."""
+    global _running
+    conn = _connections.get(path)
+    if conn is None:
+        conn = _connections[path] = connect(path)
+    cursor = conn.execute(
+        "UPDATE jobs SET state = 'running', started = ? WHERE id = ? AND state = 'queued' AND cancel = 0",
+        (time.time(), job_id),
+    )
+    if not cursor.rowcount:
+        return "cancelled"
+    _running = _Running(conn, job_id)
+    result = error = None
+    try:
+        result = _dumps(function(*args))
+        state = "done"
+    except JobCancelled:
+        state = "cancelled"
+    except ValueError as e:
+        state, error = "failed", str(e)
+    except Exception as e:
+        state, error = "failed", f"{type(e).__name__}: {e}"
+    finally:
+        _running = None
+    finished = time.time()
+    conn.execute(
+        "UPDATE jobs SET state = ?, progress = CASE WHEN ? = 'done' THEN 1 ELSE progress END,"
+        " finished = ?, expires = ?, error = ?, result = ? WHERE id = ?",
+        (state, state, finished, finished + result_ttl, error, result, job_id),
+    )
+    return state
+
+
+# --- Server side -------------------------------------------------------------
+
+class JobQueue:
+    """Runs submitted functions in a process pool and tracks them in the SQLite file at ``path``.
+
+    The pool is started on the first submit, in the process that submits,
+    so a preloading server forks its workers before any pool exists. At
+    most ``max_pending`` jobs submitted by one process wait or run at a
+    time. ``on_done(kind, state, seconds)`` is called in this process when
+    one of its jobs ends. Pool processes are ``niceness`` steps below the
+    server's CPU priority.
+    """
+
+    def __init__(self, path, workers=WORKERS, max_pending=MAX_PENDING, result_ttl=RESULT_TTL, on_done=None,
+                 niceness=NICENESS):
+        self.path = path
+        self.workers = workers
+        self.niceness = niceness
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self.on_done = on_done
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._pool = None
+        self._futures = {}
+        self._evicted = 0.0
+
+    def _connect(self):
+        if self._pid != os.getpid():
+            # Forked: neither the connections nor the pool belong to this process.
+            self._local = threading.local()
+            self._pid = os.getpid()
+            self._lock = threading.Lock()
+            self._pool = None
+            self._futures = {}
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path)
+        return conn
+
+    def _executor(self):
+        if self._pool is None:
+            # Spawned, not forked: the server's threads and locks stay out of the pool.
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context("spawn"),
+                                             initializer=_initialize, initargs=(self.niceness,))
+        return self._pool
+
+    def pending(self):
+        """Jobs submitted by this process that are waiting or running."""
+        return len(self._futures)
+
+    def submit(self, kind, function, *args, files=()):
+        """Queue ``function(*args)`` and return the new job's id.
+
+        ``function`` and ``args`` must be picklable. ``files`` are deleted
+        once the job has ended (or at once, if it is rejected). Raises
+        :class:`JobQueueFull` when this process has ``max_pending`` jobs.
+        """
+        conn = self._connect()
+        self._evict(conn)
+        job_id = uuid.uuid4().hex
+        submitted = time.time()
+        with self._lock:
+            if len(self._futures) >= self.max_pending:
+                _remove(files)
+                raise JobQueueFull(f"Too many jobs in progress (at most {self.max_pending}); retry later")
+            conn.execute(
+                "INSERT INTO jobs (id, kind, state, submitted, expires) VALUES (?, ?, 'queued', ?, ?)",
+                (job_id, kind, submitted, submitted + MAX_AGE),
+            )
+            try:
+                pool = self._executor()
+                try:
+                    future = pool.submit(_run, self.path, job_id, self.result_ttl, function, args)
+                except BrokenProcessPool:
+                    # A pool process died earlier; start a fresh pool.
+                    self._pool = None
+                    pool.shutdown(wait=False)
+                    pool = self._executor()
+                    future = pool.submit(_run, self.path, job_id, self.result_ttl, function, args)
+            except BaseException:
+                conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+                _remove(files)
+                raise
+            self._futures[job_id] = future
+        future.add_done_callback(partial(self._finished, job_id, kind, submitted, files, pool))
+        return job_id
+
+    def _finished(self, job_id, kind, submitted, files, pool, future):
+        with self._lock:
+            self._futures.pop(job_id, None)
+        _remove(files)
+        if future.cancelled():
+            state, error = "cancelled", None
+        elif future.exception() is None:
+            state, error = future.result(), None
+        else:
+            # The job never stored an outcome: its process died, or it could not be pickled.
+            state = "failed"
+            error = future.exception()
+            if isinstance(error, BrokenProcessPool):
+                with self._lock:
+                    if self._pool is pool:
+                        self._pool = None
+            error = f"{type(error).__name__}: {error}"
+        if future.cancelled() or error is not None:
+            finished = time.time()
+            try:
+                self._connect().execute(
+                    "UPDATE jobs SET state = ?, finished = ?, expires = ?, error = ?"
+                    " WHERE id = ? AND state IN ('queued', 'running')",
+                    (state, finished, finished + self.result_ttl, error, job_id),
+                )
+            except sqlite3.Error:
+                pass
+        if self.on_done is not None:
+            self.on_done(kind, state, time.time() - submitted)
+
+    def status(self, job_id):
+        """``(status, result)`` for a job, or None if it is unknown or expired.
+
+        ``status`` is a JSON-ready dict; ``result`` is the finished job's
+        result as JSON text, or None.
+        """
+        conn = self._connect()
+        self._evict(conn)
+        row = conn.execute(f"SELECT {_COLUMNS}, result FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return _status(row[:-1]), row[-1]
+
+    def recent(self, limit=100):
+        """Status of the most recent jobs, newest first, without results."""
+        conn = self._connect()
+        self._evict(conn)
+        rows = conn.execute(f"SELECT {_COLUMNS} FROM jobs ORDER BY submitted DESC LIMIT ?", (limit,)).fetchall()
+        return [_status(row) for row in rows]
+
+    def cancel(self, job_id):
+        """Cancel a queued or running job, or delete a finished one; returns its state before, or None.
+
+        A queued job is cancelled at once. A running job is flagged and
+        stops at its next :func:`report`.
+        """
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT state FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                state = None
+            elif row[0] == "queued":
+                conn.execute(
+                    "UPDATE jobs SET state = 'cancelled', cancel = 1, finished = ?, expires = ? WHERE id = ?",
+                    (now, now + self.result_ttl, job_id),
+                )
+            elif row[0] == "running":
+                conn.execute("UPDATE jobs SET cancel = 1 WHERE id = ?", (job_id,))
+            else:
+                conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        future = self._futures.get(job_id)
+        if future is not None:
+            # Frees the pool slot if the job had not been picked up yet.
+            future.cancel()
+        return row[0] if row else None
+
+    def _evict(self, conn):
+        now = time.time()
+        if now - self._evicted < EVICT_INTERVAL:
+            return
+        self._evicted = now
+        try:
+            conn.execute("DELETE FROM jobs WHERE expires < ?", (now,))
+        except sqlite3.OperationalError:
+            # Busy: the next call retries.
+            pass
+
+    def shutdown(self, wait=True):
+        """Stop the pool; queued jobs of this process are cancelled, running ones finish."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def _status(row):
+    job_id, kind, state, progress, cancel, submitted, started, finished, _, error = row
+    end = finished if finished is not None else time.time()
+    status = {
+        "id": job_id,
+        "kind": kind,
+        "state": state,
+        "progress": round(progress, 4),
+        "submitted": _timestamp(submitted),
+        "started": _timestamp(started),
+        "finished": _timestamp(finished),
+        "elapsed_s": round(end - started, 3) if started is not None else None,
+    }
+    if state == "running" and cancel:
+        status["cancel_requested"] = True
+    if error is not None:
+        status["error"] = error
+    return status
+
+
+def _remove(files):
+    for path in files:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
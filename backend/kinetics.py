@@ -0,0 +1,103 @@
+"""Time-stepped reaction simulation for the streamed run-experiment mode.
+
+The state is the reaction conversion ``X`` (0..1) and the temperature. The
+rate follows Arrhenius kinetics, ``k(T) = k_ref · exp(-Ea/R · (1/T - 1/T_ref))``,
+with ``dX/dt = k(T) · (1 - X)^order``. Reaction heat raises the temperature
+by up to the same adiabatic rise the snapshot model uses. The mixture
+relaxes toward the burner's steady-state temperature at a rate that falls
+with volume, since larger volumes exchange heat with the room more slowly.
+The two-value state is integrated with RK4 on plain floats: every step
+depends on the previous one, so there is nothing to vectorize across
+steps, and NumPy calls on a 2-element array cost more than the arithmetic.
+All species concentrations are evaluated as one array operation per frame.
+"""
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from simulation import AMBIENT_C, reaction_heat_rise
+
+GAS_CONSTANT = 8.314  # J/(mol·K)
+KELVIN = 273.15
+T_REF = AMBIENT_C + KELVIN
+K_REF = 0.05  # 1/s at ambient temperature
+EXCHANGE_RATE = 0.01  # 1/s for the reference 250 ml beaker
+LIMITING_CONCENTRATION = 0.1  # mol/L per unit stoichiometric coefficient
+ACTIVATION_KJ = {"Exothermic": 50.0, "Endothermic": 75.0}
+DEFAULT_ACTIVATION_KJ = 60.0
+MAX_STEP_S = 0.25
+MAX_STEPS = 200_000
+
+KineticsModel = namedtuple(
+    "KineticsModel",
+    ["activation_j", "order", "adiabatic_rise", "target_k", "exchange_rate", "species", "initial", "stoichiometry"],
+)
+
+
+def build_model(reaction_type, energy, reactants, products, effective_heat, volume_ml):
+    """Model parameters for one mixture.
+
+    ``reactants``/``products`` are ``(coefficient, species)`` lists; when
+    empty, generic ``Reactants``/``Products`` pseudo-species are used.
+    """
+    reactants = reactants or [(1, "Reactants")]
+    products = products or [(1, "Products")]
+    volume_factor = math.sqrt(max(1.0, volume_ml / 250.0))
+    rise = reaction_heat_rise(reaction_type, energy) / volume_factor
+    activation = next((kj for name, kj in ACTIVATION_KJ.items() if name in reaction_type), DEFAULT_ACTIVATION_KJ)
+    species = [s for _, s in reactants] + [s for _, s in products]
+    coefficients = np.array([c for c, _ in reactants] + [c for c, _ in products], dtype=float)
+    signs = np.array([-1.0] * len(reactants) + [1.0] * len(products))
+    initial = np.where(signs < 0, coefficients * LIMITING_CONCENTRATION, 0.0)
+    return KineticsModel(
+        activation_j=activation * 1000.0,
+        order=min(2, len(reactants)),
+        adiabatic_rise=rise,
+        target_k=AMBIENT_C + (effective_heat * 0.45) / volume_factor + KELVIN,
+        exchange_rate=EXCHANGE_RATE * (250.0 / volume_ml) ** (1.0 / 3.0),
+        species=species,
+        initial=initial,
+        stoichiometry=signs * coefficients * LIMITING_CONCENTRATION,
+    )
+
+
+def rate_constant(model, temperature_k):
+    return K_REF * math.exp(-model.activation_j / GAS_CONSTANT * (1.0 / temperature_k - 1.0 / T_REF))
+
+
+def _derivatives(model, conversion, temperature):
+    rate = rate_constant(model, temperature) * max(0.0, 1.0 - conversion) ** model.order
+    heating = model.adiabatic_rise * rate + model.exchange_rate * (model.target_k - temperature)
+    return rate, heating
+
+
+def _rk4(model, conversion, temperature, dt):
+    a1, b1 = _derivatives(model, conversion, temperature)
+    a2, b2 = _derivatives(model, conversion + 0.5 * dt * a1, temperature + 0.5 * dt * b1)
+    a3, b3 = _derivatives(model, conversion + 0.5 * dt * a2, temperature + 0.5 * dt * b2)
+    a4, b4 = _derivatives(model, conversion + dt * a3, temperature + dt * b3)
+    conversion = conversion + dt / 6.0 * (a1 + 2 * a2 + 2 * a3 + a4)
+    temperature = temperature + dt / 6.0 * (b1 + 2 * b2 + 2 * b3 + b4)
+    return min(1.0, conversion), temperature
+
+
+def frames(model, duration_s, frame_count):
+    """Yield ``frame_count + 1`` frames from t=0 to ``duration_s``, computed lazily."""
+    frame_dt = duration_s / frame_count
+    substeps = max(1, math.ceil(frame_dt / MAX_STEP_S))
+    substeps = min(substeps, max(1, MAX_STEPS // frame_count))
+    dt = frame_dt / substeps
+    conversion, temperature = 0.0, T_REF
+    for index in range(frame_count + 1):
+        if index:
+            for _ in range(substeps):
+                conversion, temperature = _rk4(model, conversion, temperature, dt)
+        concentrations = model.initial + model.stoichiometry * conversion
+        yield {
+            "t": round(index * frame_dt, 3),
+            "conversion": round(conversion, 4),
+            "temperature_c": round(temperature - KELVIN, 2),
+            "rate": round(_derivatives(model, conversion, temperature)[0], 5),
+            "concentrations": {s: round(float(c), 5) for s, c in zip(model.species, concentrations)},
+        }
@@ -0,0 +1,150 @@
+"""In-process request and cache metrics in Prometheus text format.
+
+Recording a sample is a bisect and a few additions under one lock, so the
+instrumentation can stay on in production. Values are per process: under a
+multi-worker server each scrape of ``/api/metrics`` reports the worker that
+answered it, so scrape each worker directly or aggregate the series by
+``instance``.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+
+class Histogram:
+    """Cumulative-bucket histogram; not locked, the :class:`Metrics` lock guards it."""
+
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class Metrics:
+    """Counters and histograms keyed by metric name and label values."""
+
+    def __init__(self, prefix="vlab"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._help = {}
+        self._caches = {}
+        self.describe("cache_hits_total", "counter", "Cache lookups that found an entry")
+        self.describe("cache_misses_total", "counter", "Cache lookups that missed")
+        self.describe("cache_entries", "gauge", "Entries currently held by the cache")
+        self.describe("cache_hit_ratio", "gauge", "Hits / lookups since the process started")
+
+    def describe(self, name, kind, text):
+        self._help[name] = (kind, text)
+
+    def inc(self, name, labels=(), amount=1):
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, value, labels=(), buckets=LATENCY_BUCKETS):
+        key = (name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name, labels=()):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, labels)
+
+    def observe_request(self, method, route, status, seconds, request_bytes=None, response_bytes=None):
+        """Record one HTTP request; sizes are skipped when unknown (streamed bodies)."""
+        route_labels = (("method", method), ("route", route))
+        with self._lock:
+            key = ("http_requests_total", route_labels + (("status", status),))
+            self._counters[key] = self._counters.get(key, 0) + 1
+            for name, value, buckets in (
+                ("http_request_duration_seconds", seconds, LATENCY_BUCKETS),
+                ("http_request_size_bytes", request_bytes, SIZE_BUCKETS),
+                ("http_response_size_bytes", response_bytes, SIZE_BUCKETS),
+            ):
+                if value is None:
+                    continue
+                histogram = self._histograms.get((name, route_labels))
+                if histogram is None:
+                    histogram = self._histograms[(name, route_labels)] = Histogram(buckets)
+                histogram.observe(value)
+
+    def register_cache(self, name, stats):
+        """``stats()`` returns ``(hits, misses, entries)``; it is read at scrape time."""
+        self._caches[name] = stats
+
+    def render(self):
+        """All series in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(
+                ((key, list(h.counts), h.total, h.count, h.buckets) for key, h in self._histograms.items()),
+                key=lambda item: item[0],
+            )
+        lines = []
+        described = set()
+
+        def header(name, kind):
+            if name in described:
+                return
+            described.add(name)
+            text = self._help.get(name, (kind, name.replace("_", " ")))[1]
+            lines.append(f"# HELP {self.prefix}_{name} {text}")
+            lines.append(f"# TYPE {self.prefix}_{name} {kind}")
+
+        for (name, labels), value in counters:
+            header(name, "counter")
+            lines.append(f"{self.prefix}_{name}{_labels(labels)} {value}")
+        for (name, labels), counts, total, count, buckets in histograms:
+            header(name, "histogram")
+            cumulative = 0
+            for bound, bucket_count in zip(buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.prefix}_{name}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{self.prefix}_{name}_sum{_labels(labels)} {total!r}")
+            lines.append(f"{self.prefix}_{name}_count{_labels(labels)} {count}")
+
+        caches = [(name, stats()) for name, stats in sorted(self._caches.items())]
+        for suffix, kind, index in (("cache_hits_total", "counter", 0), ("cache_misses_total", "counter", 1),
+                                    ("cache_entries", "gauge", 2)):
+            if caches:
+                header(suffix, kind)
+            for name, values in caches:
+                lines.append(f"{self.prefix}_{suffix}{_labels((('cache', name),))} {values[index]}")
+        if caches:
+            header("cache_hit_ratio", "gauge")
+        for name, (hits, misses, _) in caches:
+            ratio = hits / (hits + misses) if hits + misses else 0.0
+            lines.append(f"{self.prefix}_cache_hit_ratio{_labels((('cache', name),))} {ratio!r}")
+        return "\n".join(lines) + "\n"
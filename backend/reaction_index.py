@@ -0,0 +1,118 @@
+"""Reaction matching index for the virtual lab.
+
+Equations are parsed once when the index is built, and an inverted index maps
+each reactant symbol to the reactions that need it. Finding the best match
+then only touches the reactions that share a symbol with the mixture, instead
+of re-parsing every equation in the catalog on each request.
+"""
+import re
+
+from catalog_model import positional
+
+_ARROW_RE = re.compile(r"\s*(?:→|⇌)\s*")
+_UPPER_RE = re.compile(r"[A-Z]")
+_SUBSCRIPT_RE = re.compile(r"[₀-₉]")
+_COEFFICIENT_RE = re.compile(r"^\s*\d+\s*")
+_POLYMER_RE = re.compile(r"^\s*n\s*")
+_SPACES_RE = re.compile(r"\s+")
+
+
+def required_symbols_from_equation(equation):
+    """Extract a set of reactant-like symbols from the equation LHS.
+
+    Note: the REACTIONS dataset includes simplified reactants lists (often incomplete),
+    so equation parsing is used to improve matching.
+    """
+    if not equation:
+        return set()
+    parts = _ARROW_RE.split(str(equation), maxsplit=1)
+    lhs = parts[0] if parts else str(equation)
+    tokens = [t.strip() for t in lhs.split("+")]
+    symbols = set()
+    for t in tokens:
+        if not t:
+            continue
+        # Skip energy/light terms
+        if not _UPPER_RE.search(t) and not _SUBSCRIPT_RE.search(t):
+            continue
+        # Remove leading coefficients like "2H₂O"
+        t = _COEFFICIENT_RE.sub("", t)
+        # Handle polymerization forms like "n(C₂H₄)"
+        t = _POLYMER_RE.sub("", t)
+        t = t.strip()
+        if t.startswith("(") and t.endswith(")"):
+            t = t[1:-1].strip()
+        # Collapse multiple spaces
+        t = _SPACES_RE.sub(" ", t)
+        if " " in t:
+            # Still looks like a phrase ("electrical energy") rather than a chemical formula
+            continue
+        symbols.add(t)
+    return symbols
+
+
+def required_symbols(reaction):
+    """Reactant symbols a mixture must contain for ``reaction`` to match."""
+    required = required_symbols_from_equation(reaction.get("equation"))
+    if not required:
+        required = {r.get("symbol") for r in reaction.get("reactants", []) if r.get("symbol")}
+    return required
+
+
+class ReactionIndex:
+    """Pre-parsed reactant sets plus a symbol -> reactions inverted index."""
+
+    def __init__(self, reactions):
+        # Reactions are kept in catalog order so ties resolve to the first
+        # matching entry, exactly like the original linear scan. Only their
+        # catalog positions are stored; the matched row is fetched on demand.
+        count, self._row = positional(reactions)
+        self._rows = []
+        self._required = []
+        self._by_symbol = {}
+        for row in range(count):
+            required = required_symbols(self._row(row))
+            if not required:
+                continue
+            position = len(self._rows)
+            self._rows.append(row)
+            self._required.append(frozenset(required))
+            for symbol in required:
+                self._by_symbol.setdefault(symbol, []).append(position)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def candidates(self, symbol):
+        """Catalog positions of reactions that list ``symbol`` as a reactant."""
+        return self._by_symbol.get(symbol, ())
+
+    def best_match(self, provided_symbols):
+        """Return ``(reaction, required_symbols)`` for the best match, or ``(None, set())``.
+
+        The best match is the reaction with the largest reactant set that is
+        fully covered by ``provided_symbols``.
+        """
+        provided = set(provided_symbols)
+        hits = {}
+        for symbol in provided:
+            for position in self._by_symbol.get(symbol, ()):
+                hits[position] = hits.get(position, 0) + 1
+
+        best = None
+        best_size = 0
+        for position, count in hits.items():
+            size = len(self._required[position])
+            if count != size:
+                continue
+            # Avoid over-matching single-reactant reactions when the user mixes multiple chemicals.
+            # (Example: any mixture containing H₂O should not automatically become "Electrolysis of Water".)
+            if size == 1 and len(provided) > 1:
+                continue
+            if size > best_size or (size == best_size and position < best):
+                best = position
+                best_size = size
+
+        if best is None:
+            return None, set()
+        return self._row(self._rows[best]), set(self._required[best])
@@ -0,0 +1,181 @@
+"""Multi-criteria reaction queries over a :class:`catalog_model.ReactionTable`.
+
+Every filter is answered from an index built with the catalog:
+
+- category and type use the table's value -> row positions groups;
+- hazard keywords are matched against the distinct hazard texts once and
+  expanded to rows with one vectorized pass over the hazard codes;
+- the energy range is a binary search in the rows sorted by energyRelease;
+- reactant/product symbols use a symbol -> row positions inverted index,
+  built from each side of the equation as well as the (often incomplete)
+  ``reactants``/``products`` lists.
+
+Each filter yields a sorted array of row positions. The arrays are
+intersected smallest first, so a selective filter keeps the whole query
+cheap. Sort orders are precomputed rank arrays (built on first use), so a
+page of a sorted result only partitions the matching rows instead of
+sorting them.
+"""
+import re
+import unicodedata
+from collections import namedtuple
+
+import numpy as np
+
+from equations import split_equation
+
+# Sort key -> reaction field. A leading "-" sorts descending.
+SORT_FIELDS = {"name": "name", "id": "id", "category": "category", "type": "type", "energy": "energyRelease"}
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+ReactionQuery = namedtuple(
+    "ReactionQuery",
+    ["categories", "types", "hazard", "min_energy", "max_energy", "reactants", "products", "sort", "offset", "limit"],
+)
+ReactionQuery.__new__.__defaults__ = ((), (), (), None, None, (), (), None, 0, None)
+
+
+def normalize_symbol(symbol):
+    """Fold Unicode subscripts to digits, so ``H2O`` finds ``H₂O``. Case is kept (``Co`` is not ``CO``)."""
+    return unicodedata.normalize("NFKC", str(symbol)).strip()
+
+
+def hazard_words(text):
+    return set(_WORD_RE.findall(str(text).casefold()))
+
+
+def _union(arrays):
+    """Sorted union of sorted position arrays."""
+    if not arrays:
+        return np.zeros(0, dtype=np.intp)
+    if len(arrays) == 1:
+        return arrays[0]
+    return np.unique(np.concatenate(arrays))
+
+
+def _intersect(small, large):
+    """Sorted positions present in both sorted arrays."""
+    if not len(small) or not len(large):
+        return small[:0]
+    index = np.minimum(np.searchsorted(large, small), len(large) - 1)
+    return small[large[index] == small]
+
+
+class ReactionQueryIndex:
+    """Filter, sort and paginate a ReactionTable without scanning its rows."""
+
+    def __init__(self, table):
+        self._table = table
+        self._count = len(table)
+        energy = table.energy
+        # NaN (no energyRelease) sorts last and is never inside a range.
+        self._energy_order = np.argsort(energy, kind="stable")
+        self._energy_sorted = energy[self._energy_order]
+        sides = [self._equation_sides(equation) for equation in table.column("equation")]
+        self._symbols = {name: self._symbol_index(name, [s[side] for s in sides])
+                         for side, name in enumerate(("reactants", "products"))}
+        self._ranks = {}
+
+    @staticmethod
+    def _equation_sides(equation):
+        """``(reactant symbols, product symbols)`` written in ``equation``; empty if it cannot be split."""
+        try:
+            reactants, products = split_equation(equation)
+        except ValueError:
+            return (), ()
+        return [species for _, species in reactants], [species for _, species in products]
+
+    def _symbol_index(self, name, equation_symbols):
+        positions = {}
+        listed = self._table.species_symbols(name)
+        for position, (symbols, written) in enumerate(zip(listed, equation_symbols)):
+            for symbol in {normalize_symbol(s) for s in (*symbols, *written) if s}:
+                positions.setdefault(symbol, []).append(position)
+        return {symbol: np.array(rows, dtype=np.intp) for symbol, rows in positions.items()}
+
+    def __len__(self):
+        return self._count
+
+    def _category_rows(self, categories):
+        return _union([self._table.category_rows(c) for c in set(c.lower() for c in categories)])
+
+    def _type_rows(self, types):
+        # Keywords match case-insensitively anywhere in the type ("reversible" finds "Exothermic (Reversible)").
+        keywords = [t.casefold() for t in types]
+        matched = [self._table.rows_with("type", value) for value in self._table.vocabulary("type")
+                   if any(k in value.casefold() for k in keywords)]
+        return _union(matched)
+
+    def _hazard_rows(self, keywords):
+        # Every keyword must appear as a word of the hazard text.
+        wanted = set()
+        for keyword in keywords:
+            wanted |= hazard_words(keyword)
+        return np.flatnonzero(self._table.mask("hazard", lambda text: wanted <= hazard_words(text)))
+
+    def _energy_rows(self, low, high):
+        start = 0 if low is None else np.searchsorted(self._energy_sorted, low, side="left")
+        # searchsorted places NaN after every number, so an open upper bound stops at the first NaN.
+        end = np.searchsorted(self._energy_sorted, np.inf if high is None else high, side="right")
+        return np.sort(self._energy_order[start:end])
+
+    def _symbol_rows(self, name, symbols):
+        index = self._symbols[name]
+        return [index.get(normalize_symbol(s), np.zeros(0, dtype=np.intp)) for s in symbols]
+
+    def _rank(self, key):
+        """Rank of every row in the ``key`` sort order; rows missing the field rank last."""
+        rank = self._ranks.get(key)
+        if rank is None:
+            descending = key.startswith("-")
+            field = SORT_FIELDS[key.lstrip("-")]
+            if field == "energyRelease":
+                values = self._table.energy.tolist()
+                present = [p for p, v in enumerate(values) if v == v]
+            else:
+                values = self._table.column(field)
+                present = [p for p, v in enumerate(values) if v is not None]
+            # Python's sort is stable in both directions, so ties keep catalog order.
+            order = sorted(present, key=values.__getitem__, reverse=descending)
+            missing = np.setdiff1d(np.arange(self._count), np.array(order, dtype=np.intp), assume_unique=True)
+            rank = np.empty(self._count, dtype=np.intp)
+            rank[np.concatenate([np.array(order, dtype=np.intp), missing])] = np.arange(self._count)
+            self._ranks[key] = rank
+        return rank
+
+    def matching(self, query):
+        """Sorted row positions matching every filter of ``query``."""
+        candidates = []
+        if query.categories:
+            candidates.append(self._category_rows(query.categories))
+        if query.types:
+            candidates.append(self._type_rows(query.types))
+        if query.hazard:
+            candidates.append(self._hazard_rows(query.hazard))
+        if query.min_energy is not None or query.max_energy is not None:
+            candidates.append(self._energy_rows(query.min_energy, query.max_energy))
+        candidates.extend(self._symbol_rows("reactants", query.reactants))
+        candidates.extend(self._symbol_rows("products", query.products))
+        if not candidates:
+            return np.arange(self._count)
+        candidates.sort(key=len)
+        rows = candidates[0]
+        for other in candidates[1:]:
+            rows = _intersect(rows, other)
+        return rows
+
+    def query(self, query):
+        """``(total, reactions)``: the match count and one page of reaction dicts."""
+        rows = self.matching(query)
+        total = len(rows)
+        start = min(query.offset, total)
+        end = total if query.limit is None else min(total, start + query.limit)
+        if query.sort and start < end:
+            keys = self._rank(query.sort)[rows]
+            if end < total:
+                # Only the first ``end`` rows in sort order are needed.
+                head = np.argpartition(keys, end - 1)[:end]
+                rows, keys = rows[head], keys[head]
+            rows = rows[np.argsort(keys)]
+        return total, list(self._table.rows(rows[start:end]))
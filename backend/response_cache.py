@@ -0,0 +1,119 @@
+"""Pre-serialized responses for the static catalog endpoints.
+
+Catalog data only changes when the catalog is reloaded, so each response
+body (including every category filter) is serialized once, hashed into a
+strong ETag and served as-is. Clients that send a matching
+``If-None-Match`` get a bodiless 304. Compressed variants are made once per
+encoding, on first request, and carry their own ETag. Field selections
+(``?fields=``) are projected from the stored payload and kept in a small
+LRU cache. Large lists can be stored with :meth:`ResponseCache.put_rows`,
+which serializes them in chunks from a row factory instead of keeping a
+list of every item alive.
+"""
+import hashlib
+
+from flask import Response
+
+from compression import MIN_SIZE, compress, negotiate
+from lru import LRUCache
+
+MAX_AGE = 60
+PROJECTION_CACHE_SIZE = 256
+CHUNK_ROWS = 10_000
+
+
+class CachedBody:
+    __slots__ = ("body", "etag", "_encoded")
+
+    def __init__(self, body, etag):
+        self.body = body
+        self.etag = etag
+        self._encoded = {}
+
+    def encoded(self, encoding):
+        """``(body, etag)`` for ``encoding`` (None for identity), compressing once."""
+        if encoding is None or len(self.body) < MIN_SIZE:
+            return self.body, self.etag
+        body = self._encoded.get(encoding)
+        if body is None:
+            # Racing threads may both compress; the results are identical.
+            body = self._encoded[encoding] = compress(self.body, encoding, static=True)
+        return body, f"{self.etag}-{encoding}"
+
+
+class ResponseCache:
+    """Immutable key -> pre-serialized JSON body store."""
+
+    def __init__(self, dumps, max_age=MAX_AGE):
+        self._dumps = dumps
+        self._entries = {}
+        self._payloads = {}
+        self._projections = LRUCache(maxsize=PROJECTION_CACHE_SIZE)
+        self.max_age = max_age
+
+    def _encode(self, payload):
+        body = (self._dumps(payload) + "\n").encode("utf-8")
+        return CachedBody(body, hashlib.sha256(body).hexdigest()[:32])
+
+    def _encode_rows(self, rows):
+        # dumps is compact, so joining the inside of chunked list dumps gives
+        # the same bytes as dumping the whole list at once.
+        parts = []
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == CHUNK_ROWS:
+                parts.append(self._dumps(chunk)[1:-1])
+                chunk = []
+        if chunk:
+            parts.append(self._dumps(chunk)[1:-1])
+        body = ("[" + ",".join(parts) + "]\n").encode("utf-8")
+        return CachedBody(body, hashlib.sha256(body).hexdigest()[:32])
+
+    def put(self, key, payload):
+        self._entries[key] = self._encode(payload)
+        self._payloads[key] = lambda: payload
+
+    def put_rows(self, key, rows):
+        """Store a list payload given as ``rows``, a callable returning an iterable of items.
+
+        ``rows`` is called again whenever a new ``?fields=`` projection is built.
+        """
+        self._entries[key] = self._encode_rows(rows())
+        self._payloads[key] = rows
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def _projected(self, key, fields):
+        entry = self._projections.get((key, fields))
+        if entry is None:
+            items = self._payloads[key]()
+            entry = self._encode_rows({f: item[f] for f in fields if f in item} for item in items)
+            self._projections.put((key, fields), entry)
+        return entry
+
+    def respond(self, key, request, default=None, fields=None):
+        """Serve ``key`` (or ``default``) with ETag/Cache-Control, honoring If-None-Match.
+
+        ``fields`` (a tuple of names) keeps only those fields of each item of a list payload.
+        """
+        if key not in self._entries:
+            key = default
+        entry = self._projected(key, fields) if fields else self._entries[key]
+        encoding = negotiate(request.accept_encodings)
+        body, etag = entry.encoded(encoding)
+        response = Response(body, mimetype="application/json")
+        if body is not entry.body:
+            response.headers["Content-Encoding"] = encoding
+        response.vary.add("Accept-Encoding")
+        response.set_etag(etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = self.max_age
+        return response.make_conditional(request)
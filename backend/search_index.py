@@ -0,0 +1,264 @@
+"""Full-text search index over the reaction catalog.
+
+Reaction fields are tokenized once into an inverted index with BM25 weights.
+Text is NFKC-normalized before tokenizing, so Unicode subscripts fold to
+digits and ``H2O`` matches ``H₂O``. The last query token is matched as a
+prefix for type-ahead. Each term's postings are also kept sorted by weight,
+so a ranked search reads each list only as deep as its top ``limit``
+results need instead of scoring every document.
+"""
+import bisect
+import heapq
+import math
+import re
+import unicodedata
+
+from catalog_model import positional
+
+# Field -> boost. Matches in the name count for more than matches in the description.
+FIELD_BOOSTS = {
+    "name": 3.0,
+    "symbols": 2.5,
+    "equation": 2.0,
+    "category": 2.0,
+    "type": 1.0,
+    "hazard": 1.0,
+    "description": 1.0,
+}
+
+_TOKEN_RE = re.compile(r"[\w()\[\]]+")
+_WORD_RE = re.compile(r"[^\W_]+")
+_COEFFICIENT_RE = re.compile(r"^\d+(?=[a-z(\[])")
+
+K1 = 1.2
+B = 0.75
+MAX_EXPANSIONS = 32
+SHORT_PREFIX = 2
+# One- and two-character prefixes expand to their most frequent completions only.
+SHORT_PREFIX_EXPANSIONS = 8
+
+
+def normalize(text):
+    """Fold Unicode subscripts/superscripts to ASCII digits and case-fold."""
+    return unicodedata.normalize("NFKC", str(text)).casefold()
+
+
+def tokenize(text):
+    """Split ``text`` into index terms.
+
+    Formula-like tokens are kept whole (``fe(oh)3``) and also split into
+    their word parts (``fe``, ``oh``); leading coefficients are stripped
+    (``2h2o`` also yields ``h2o``).
+    """
+    terms = []
+    for token in _TOKEN_RE.findall(normalize(text)):
+        terms.append(token)
+        stripped = _COEFFICIENT_RE.sub("", token)
+        if stripped != token:
+            terms.append(stripped)
+        words = _WORD_RE.findall(stripped)
+        if len(words) > 1 or (words and words[0] != stripped):
+            terms.extend(words)
+    return terms
+
+
+def reaction_fields(reaction):
+    """Searchable text of a reaction, keyed by FIELD_BOOSTS field name."""
+    species = list(reaction.get("reactants") or []) + list(reaction.get("products") or [])
+    names = " ".join(str(s.get("name", "")) for s in species)
+    symbols = " ".join(str(s.get("symbol", "")) for s in species)
+    return {
+        "name": f"{reaction.get('name', '')} {names}",
+        "symbols": symbols,
+        "equation": reaction.get("equation", ""),
+        "category": reaction.get("category", ""),
+        "type": reaction.get("type", ""),
+        "hazard": reaction.get("hazard", ""),
+        "description": reaction.get("description", ""),
+    }
+
+
+class SearchIndex:
+    """BM25-ranked inverted index with prefix matching on the last query token."""
+
+    def __init__(self, reactions):
+        # Documents are catalog positions; rows are fetched only for results.
+        self._count, self._row = positional(reactions)
+        frequencies = []
+        lengths = []
+        document_frequency = {}
+        for doc in range(self._count):
+            reaction = self._row(doc)
+            tf = {}
+            length = 0.0
+            for field, text in reaction_fields(reaction).items():
+                boost = FIELD_BOOSTS[field]
+                for term in tokenize(text):
+                    tf[term] = tf.get(term, 0.0) + boost
+                    length += boost
+            frequencies.append(tf)
+            lengths.append(length)
+            for term in tf:
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+
+        count = self._count
+        average = (sum(lengths) / count) if count else 1.0
+        self._postings = {}
+        for doc, tf in enumerate(frequencies):
+            norm = K1 * (1 - B + B * lengths[doc] / average)
+            for term, freq in tf.items():
+                df = document_frequency[term]
+                idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+                weight = idf * freq * (K1 + 1) / (freq + norm)
+                self._postings.setdefault(term, {})[doc] = weight
+        self._ranked = {
+            term: sorted(postings, key=postings.__getitem__, reverse=True)
+            for term, postings in self._postings.items()
+        }
+        self._vocabulary = sorted(self._postings)
+        # Short prefixes match huge vocabulary ranges; precompute their most
+        # frequent completions so "o" expands to "of" rather than "o2al2n3".
+        short = {}
+        for term in self._vocabulary:
+            for size in range(1, min(len(term), SHORT_PREFIX) + 1):
+                short.setdefault(term[:size], []).append(term)
+        self._short_prefixes = {
+            prefix: sorted(terms, key=lambda t: (t != prefix, -len(self._postings[t]), t))[:SHORT_PREFIX_EXPANSIONS]
+            for prefix, terms in short.items()
+        }
+
+    def __len__(self):
+        return self._count
+
+    def _expand(self, prefix):
+        """Vocabulary terms starting with ``prefix`` (at most MAX_EXPANSIONS, or SHORT_PREFIX_EXPANSIONS if short)."""
+        if len(prefix) <= SHORT_PREFIX:
+            return self._short_prefixes.get(prefix, [])
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        terms = []
+        for term in self._vocabulary[start:start + MAX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        return terms
+
+    def search(self, query, limit=None, prefix=True):
+        """Return up to ``limit`` reactions matching every query token, best first."""
+        tokens = _TOKEN_RE.findall(normalize(query))
+        if not tokens:
+            end = self._count if limit is None else min(limit, self._count)
+            return [self._row(doc) for doc in range(end)]
+
+        groups = self._groups(tokens, prefix)
+        if groups is None:
+            return []
+        scores = self._top(groups, limit)
+
+        if limit is None:
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        else:
+            ranked = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [self._row(doc) for doc, _ in ranked]
+
+    def _groups(self, tokens, prefix):
+        """Index terms matching each query token, or None if one matches nothing."""
+        groups = []
+        for position, token in enumerate(tokens):
+            last = position == len(tokens) - 1
+            if prefix and last:
+                terms = self._expand(token)
+            elif token in self._postings:
+                terms = [token]
+            else:
+                terms = self._expand(token)
+            if not terms:
+                return None
+            groups.append(terms)
+        return groups
+
+    def _stream(self, terms):
+        """Yield ``(doc, weight)`` for a token group, heaviest first, each document once.
+
+        A document's group weight is its best weight among ``terms`` (a
+        prefix counts once, through its best completion). The terms' ranked
+        lists are merged lazily, so a search only pays for the depth it reads.
+        """
+        if len(terms) == 1:
+            postings = self._postings[terms[0]]
+            for doc in self._ranked[terms[0]]:
+                yield doc, postings[doc]
+            return
+        def entries(term):
+            postings = self._postings[term]
+            return ((-postings[doc], doc) for doc in self._ranked[term])
+
+        seen = set()
+        for weight, doc in heapq.merge(*map(entries, terms)):
+            if doc not in seen:
+                seen.add(doc)
+                yield doc, -weight
+
+    def _top(self, groups, limit):
+        """Exact scores of enough documents to rank the top ``limit`` matches of every token group.
+
+        A document's score is the sum of its group weights; it must match
+        each group. Groups are read heaviest first and every document seen is
+        scored in full (Fagin's threshold algorithm). The sum of the weights
+        last read from each group bounds the score of any document not seen
+        yet, so the scan stops once the ``limit``-th best score reaches it, or
+        once some group is used up, since unseen documents miss that group.
+        Each step reads the group with the heaviest weight left, which lowers
+        the bound fastest.
+        """
+        # Single-term groups first, so documents missing one are rejected cheaply.
+        groups = sorted(groups, key=len)
+        postings = [[self._postings[term] for term in terms] for terms in groups]
+        if limit is None:
+            return self._score_all(postings)
+        streams = [self._stream(terms) for terms in groups]
+        heads = [math.inf] * len(streams)
+        scores = {}
+        best = []  # min-heap of the ``limit`` best scores so far
+        while not (len(best) == limit and best[0] >= sum(heads)):
+            # Unseen documents could still beat the current top ``limit``.
+            g = max(range(len(heads)), key=heads.__getitem__)
+            entry = next(streams[g], None)
+            if entry is None:
+                break
+            doc, heads[g] = entry
+            if doc in scores:
+                continue
+            score = scores[doc] = self._score(postings, doc)
+            if score is None:
+                continue
+            if len(best) < limit:
+                heapq.heappush(best, score)
+            elif score > best[0]:
+                heapq.heapreplace(best, score)
+        return {doc: score for doc, score in scores.items() if score is not None}
+
+    @staticmethod
+    def _score(postings, doc):
+        """Score of ``doc`` over all groups, or None if it misses one."""
+        total = 0.0
+        for group in postings:
+            best = None
+            for term_postings in group:
+                weight = term_postings.get(doc)
+                if weight is not None and (best is None or weight > best):
+                    best = weight
+            if best is None:
+                return None
+            total += best
+        return total
+
+    def _score_all(self, postings):
+        """Scores of every matching document, enumerating the cheapest group."""
+        sizes = [sum(len(p) for p in group) for group in postings]
+        driver = min(range(len(postings)), key=sizes.__getitem__)
+        scores = {}
+        for term_postings in postings[driver]:
+            for doc in term_postings:
+                if doc not in scores:
+                    scores[doc] = self._score(postings, doc)
+        return {doc: score for doc, score in scores.items() if score is not None}
@@ -0,0 +1,99 @@
+"""Long-running work, written to run either inline or as a background job.
+
+Each function takes validated, picklable arguments, reports its progress
+with :func:`jobs.report` (a no-op when called inline) and returns a
+JSON-ready result. They are module-level so the job pool can pickle them.
+"""
+import math
+import os
+
+import numpy as np
+
+import equilibrium
+from calculators import calculate_many
+from findings_store import FindingsStore, parse_import
+from jobs import report
+from kinetics import frames
+
+# Grid points solved per equilibrium block, and calculator operations per batch chunk.
+EQUILIBRIUM_BLOCK = 1 << 16
+BATCH_CHUNK = 1000
+
+
+def equilibrium_grid(reaction, thermodynamics, temperatures, pressures, initial):
+    """The POST /api/equilibrium body, solved in blocks of temperatures."""
+    rows = max(1, EQUILIBRIUM_BLOCK // len(pressures))
+    blocks = []
+    for start in range(0, len(temperatures), rows):
+        blocks.append(equilibrium.solve(reaction["equation"], thermodynamics, temperatures[start:start + rows],
+                                        pressures, initial))
+        report(start + rows, len(temperatures))
+    first = blocks[0]
+
+    def joined(field, axis):
+        return np.concatenate([getattr(b, field) for b in blocks], axis=axis)
+
+    return {
+        "reaction": reaction,
+        "phase": thermodynamics.phase,
+        "log10_k_25c": thermodynamics.log10_k,
+        "delta_h_kj": thermodynamics.delta_h_kj,
+        "temperature_c": temperatures.tolist(),
+        "pressure_bar": pressures.tolist(),
+        "shape": [len(temperatures), len(pressures)],
+        "log10_k": np.round(joined("log10_k", 0), 4).tolist(),
+        "extent": np.round(joined("extent", 0).ravel(), 6).tolist(),
+        "conversion": np.round(joined("conversion", 0).ravel(), 6).tolist(),
+        "composition_unit": "mole_fraction" if thermodynamics.phase == "gas" else "mol/L",
+        "composition": {
+            species: np.round(values.ravel(), 6).tolist()
+            for species, values in zip(first.species, joined("fractions", 1))
+        },
+    }
+
+
+def simulation(start, model, duration_s, frame_count):
+    """Every frame of a time-stepped simulation under ``results``, with the stream's start and end fields."""
+    results = []
+    peak = -math.inf
+    for frame in frames(model, duration_s, frame_count):
+        peak = max(peak, frame["temperature_c"])
+        results.append(frame)
+        report(len(results), frame_count + 1)
+    return {
+        **start,
+        "results": results,
+        "final_conversion": results[-1]["conversion"],
+        "peak_temperature_c": peak,
+    }
+
+
+def calculate_batch(operations):
+    """The POST /api/calculate/batch body, evaluated in chunks."""
+    results = []
+    for start in range(0, len(operations), BATCH_CHUNK):
+        results.extend(calculate_many(operations[start:start + BATCH_CHUNK]))
+        report(len(results), len(operations))
+    return {"results": results}
+
+
+def import_findings(database, legacy_json, source):
+    """Import the NDJSON file ``source`` into the findings database; the /api/findings/import body.
+
+    Retention is left to the server's compactor, so this store only inserts.
+    Batches stored before a cancellation or failure are kept.
+    """
+    store = FindingsStore(database, retention=None, legacy_json=legacy_json)
+    size = max(1, os.path.getsize(source))
+    summary = {"rejected": 0, "errors": []}
+    with open(source, "rb") as f:
+        def lines():
+            read = 0
+            for line in f:
+                read += len(line)
+                yield line
+                report(read, size)
+
+        imported = store.add_many(parse_import(lines(), summary))
+    return {"imported": imported, **summary}
+
@@ -0,0 +1,24 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep the app's databases out of backend/data.
+_DATA = tempfile.mkdtemp(prefix="vlab-tests-")
+os.environ.setdefault("VLAB_FINDINGS_DB", os.path.join(_DATA, "findings.db"))
+os.environ.setdefault("VLAB_JOBS_DB", os.path.join(_DATA, "jobs.db"))
+
+
+@pytest.fixture(scope="session")
+def vlab():
+    import app
+
+    return app
+
+
+@pytest.fixture
+def client(vlab):
+    return vlab.app.test_client()
@@ -0,0 +1,43 @@
+import asyncio
+import json
+
+import pytest
+from starlette.testclient import TestClient
+
+BODY = {"chemicals": ["HCl", "NaOH"], "duration_s": 600, "frames": 100}
+
+
+@pytest.fixture(scope="module")
+def asgi_client(vlab):
+    import asgi
+
+    with TestClient(asgi.application) as client:
+        yield client
+
+
+def test_stream_frames_are_computed_off_the_event_loop(vlab, asgi_client, monkeypatch):
+    on_loop = []
+    frames = vlab.frames
+
+    def checked_frames(*args):
+        for frame in frames(*args):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(frame["t"])
+            except RuntimeError:
+                pass
+            yield frame
+
+    monkeypatch.setattr(vlab, "frames", checked_frames)
+    response = asgi_client.post("/api/run-experiment/stream", json=BODY)
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [e["event"] for e in events] == ["start"] + ["frame"] * 101 + ["end"]
+    assert on_loop == []
+
+
+@pytest.mark.parametrize("body", [[], ["HCl"], "HCl", 3])
+def test_stream_rejects_non_object_bodies(asgi_client, client, body):
+    response = asgi_client.post("/api/run-experiment/stream", json=body)
+    assert response.status_code == 400
+    assert response.json() == {"error": "Expected a JSON object"}
+    assert client.post("/api/run-experiment/stream", json=body).status_code == 400
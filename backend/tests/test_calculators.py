@@ -0,0 +1,70 @@
+import math
+import random
+
+import pytest
+
+from calculators import calculate, calculate_many
+
+
+def test_stoichiometry_rounds_like_python():
+    result = calculate("stoichiometry", {"reactant_moles": 5.83, "reactant_coeff": 8, "product_coeff": 7})
+    assert result["product_moles"] == 5.1013
+
+
+def test_batch_matches_scalar_arithmetic():
+    rng = random.Random(6)
+    params = [{"reactant_moles": round(rng.uniform(0.01, 100), 2), "reactant_coeff": rng.randint(1, 12),
+               "product_coeff": rng.randint(1, 12)} for _ in range(5000)]
+    results = calculate_many([{"op": "stoichiometry", **p} for p in params])
+    expected = [round(p["reactant_moles"] * p["product_coeff"] / p["reactant_coeff"], 4) for p in params]
+    assert [r["product_moles"] for r in results] == expected
+
+    concentrations = [10 ** rng.uniform(-14, 0) for _ in range(5000)]
+    results = calculate_many([{"op": "ph", "h_concentration": h} for h in concentrations])
+    assert [r["pH"] for r in results] == [round(-math.log10(h), 2) for h in concentrations]
+    assert [r["pOH"] for r in results] == [round(14 + math.log10(h), 2) for h in concentrations]
+
+
+def test_empirical_formula_from_masses():
+    result = calculate("empirical-formula", {"composition": {"C": 40.0, "H": 6.7, "O": 53.3, "N": 0}})
+    assert result["empirical_formula"] == "CH2O"
+
+
+@pytest.mark.parametrize("mass", [-6.7, float("nan"), float("inf"), "-1"])
+def test_empirical_formula_rejects_bad_masses(mass):
+    with pytest.raises(ValueError):
+        calculate("empirical-formula", {"composition": {"C": 40.0, "H": mass, "O": 53.3}})
+
+
+def test_empirical_formula_endpoint_rejects_negative_mass(client):
+    response = client.post("/api/calculate/empirical-formula", json={"composition": {"C": 40.0, "H": -6.7}})
+    assert response.status_code == 400
+    assert "negative" in response.get_json()["error"]
+
+
+def test_batch_endpoint_matches_single_endpoints(client):
+    operations = [
+        {"op": "stoichiometry", "reactant_moles": 5.83, "reactant_coeff": 8, "product_coeff": 7},
+        {"op": "molarity", "moles": 0.35, "volume": 0.75},
+        {"op": "ph", "h_concentration": 3.2e-5},
+        {"op": "molecular-weight", "formula": "C6H12O6"},
+        {"op": "molarity", "moles": 1},
+        {"op": "no-such-operation"},
+        {"op": "ph", "h_concentration": 1e-7},
+    ]
+    response = client.post("/api/calculate/batch", json={"operations": operations})
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+    assert results[0]["product_moles"] == 5.1013
+    for operation, result in zip(operations, results):
+        single = client.post(f"/api/calculate/{operation['op']}", json=operation)
+        if single.status_code == 404:
+            assert "error" in result
+        else:
+            assert result == (single.get_json() if single.status_code == 200 else {"error": single.get_json()["error"]})
+
+
+def test_batch_endpoint_rejects_bad_bodies(vlab, client):
+    assert client.post("/api/calculate/batch", json=[{"op": "ph"}]).status_code == 400
+    too_many = [{"op": "ph", "h_concentration": 0.1}] * (vlab.BATCH_MAX_OPERATIONS + 1)
+    assert client.post("/api/calculate/batch", json={"operations": too_many}).status_code == 400
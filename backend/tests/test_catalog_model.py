@@ -0,0 +1,53 @@
+import json
+import os
+
+import pytest
+
+from catalog_model import ReactionTable, positional
+
+CATALOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "catalog")
+
+RECORDS = [
+    {"id": "a", "name": "Alpha", "equation": "H₂ + O₂ → H₂O", "category": "Synthesis", "description": "",
+     "reactants": [{"symbol": "H₂", "name": "Hydrogen"}, {"symbol": "O₂", "name": "Oxygen"}],
+     "products": [{"symbol": "H₂O", "name": "Water"}], "type": "Exothermic", "energyRelease": -286,
+     "color": "none", "hazard": "high"},
+    {"id": "b", "name": "Beta", "category": "synthesis", "type": "Endothermic", "energyRelease": 12.5,
+     "reactants": [{"symbol": "H₂", "name": "Hydrogen"}], "notes": ["extra", "field"]},
+    {"id": "c", "name": "Gamma", "category": "Decomposition", "type": "Very Exothermic",
+     "reactants": "not a list", "products": [{"symbol": "X", "extra": 1}]},
+]
+
+
+def test_rows_round_trip():
+    table = ReactionTable.from_records(RECORDS)
+    assert list(table) == ["a", "b", "c"]
+    assert [table[r["id"]] for r in RECORDS] == RECORDS
+    assert list(table.values()) == RECORDS
+    assert isinstance(table["a"]["energyRelease"], int)
+    count, row = positional(table)
+    assert [row(i) for i in range(count)] == RECORDS
+
+
+def test_real_catalog_round_trips():
+    with open(os.path.join(CATALOG_DIR, "reactions.jsonl"), encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    table = ReactionTable.from_records(records)
+    assert list(table.values()) == records
+
+
+def test_column_queries():
+    table = ReactionTable.from_records(RECORDS)
+    assert list(table.category_rows("SYNTHESIS")) == [0, 1]
+    assert list(table.rows_with("category", "synthesis")) == [1]
+    assert table.count_type("Exothermic") == 2
+    assert list(table.mask("type", lambda value: value.startswith("Endo"))) == [False, True, False]
+    assert list(table.species_symbols("reactants")) == [("H₂", "O₂"), ("H₂",), ()]
+    assert table.column("equation") == ["H₂ + O₂ → H₂O", None, None]
+    assert table.column("hazard") == ["high", None, None]
+    assert table.vocabulary("category") == ["Synthesis", "synthesis", "Decomposition"]
+
+
+def test_duplicate_ids_are_rejected():
+    with pytest.raises(ValueError):
+        ReactionTable.from_records([{"id": "a"}, {"id": "a"}])
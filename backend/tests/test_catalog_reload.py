@@ -0,0 +1,59 @@
+import gc
+import shutil
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from catalog import CatalogLoader
+
+
+def test_reload_frees_previous_catalog(vlab):
+    vlab.reload_catalog()
+    previous = weakref.ref(vlab.CATALOG.reactions)
+    resolver = weakref.ref(vlab.CATALOG.chemical_resolver)
+    frozen = gc.get_freeze_count()
+    for _ in range(3):
+        vlab.reload_catalog()
+    gc.collect()
+    assert previous() is None
+    assert resolver() is None
+    # Reloads replace the frozen catalog instead of adding to it.
+    assert gc.get_freeze_count() - frozen < 100
+
+
+def test_table_rows_are_cached(vlab):
+    reaction_id = next(iter(vlab.CATALOG.reactions))
+    assert vlab.CATALOG.reactions[reaction_id] is vlab.CATALOG.reactions[reaction_id]
+
+
+def test_concurrent_requests_rebuild_once(vlab, monkeypatch, tmp_path):
+    directory = tmp_path / "catalog"
+    shutil.copytree(vlab.CATALOG_LOADER.directory, directory)
+    monkeypatch.setattr(vlab, "CATALOG_LOADER", CatalogLoader(str(directory), check_interval=0))
+    vlab.reload_catalog()
+    expected = vlab.app.test_client().get("/api/stats").get_json()
+
+    installs = []
+    install = vlab.install_catalog
+
+    def counting_install(catalog):
+        installs.append(catalog.version)
+        install(catalog)
+
+    monkeypatch.setattr(vlab, "install_catalog", counting_install)
+    manifest = directory / "manifest.json"
+    manifest.write_text(manifest.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+
+    barrier = threading.Barrier(8)
+
+    def fetch(_):
+        barrier.wait()
+        return vlab.app.test_client().get("/api/stats")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        responses = list(pool.map(fetch, range(8)))
+    assert [r.status_code for r in responses] == [200] * 8
+    assert all(r.get_json() == expected for r in responses)
+    assert len(installs) == 1
+    monkeypatch.undo()
+    vlab.reload_catalog()
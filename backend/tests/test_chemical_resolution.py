@@ -0,0 +1,40 @@
+import pytest
+
+
+def run(client, chemicals):
+    return client.post("/api/run-experiment", json={"chemicals": chemicals}).get_json()
+
+
+@pytest.mark.parametrize("typed", ["O", "Co", "CO", "Na", "acid", "ethan", "sodium chl"])
+def test_short_or_ambiguous_input_is_kept_as_typed(client, typed):
+    body = run(client, [typed])
+    assert body["chemicals"] == [typed]
+    assert body["symbols"] == [typed]
+    assert body["suggestions"][typed]
+
+
+@pytest.mark.parametrize("typed, name", [
+    ("HCl", "Hydrochloric Acid (HCl)"),
+    ("h2o", "Water (H₂O)"),
+    ("iron", "Iron (Fe)"),
+    ("hydrochloric", "Hydrochloric Acid (HCl)"),
+    ("catalse", "Catalase Enzyme"),
+])
+def test_exact_and_unambiguous_matches_are_replaced(client, typed, name):
+    body = run(client, [typed])
+    assert body["chemicals"] == [name]
+    assert "suggestions" not in body
+
+
+def test_resolve_reports_confidence(client):
+    results = client.post("/api/chemicals/resolve", json={"queries": ["Na", "NaOH"], "suggestions": 0}).get_json()
+    assert [r["confident"] for r in results["results"]] == [False, True]
+
+
+def test_overlong_queries_are_rejected(vlab, client):
+    long_name = "a" * (vlab.CHEMICAL_QUERY_MAX_LENGTH + 1)
+    response = client.post("/api/chemicals/resolve", json={"queries": ["HCl", long_name]})
+    assert response.status_code == 400
+    assert client.post("/api/run-experiment", json={"chemicals": [long_name]}).status_code == 400
+    body = client.post("/api/chemicals/resolve", json={"queries": [long_name[1:]], "suggestions": 0}).get_json()
+    assert body["results"][0]["match"] is None
@@ -0,0 +1,46 @@
+import gzip
+import json
+from datetime import datetime
+
+from compression import MIN_SIZE, negotiate
+from fast_json import FastJSONProvider
+
+
+def test_negotiate_honours_weights():
+    assert negotiate("gzip") == "gzip"
+    assert negotiate("gzip;q=0, identity") is None
+    assert negotiate("") is None
+
+
+def test_dynamic_responses_are_compressed(client):
+    plain = client.get("/api/search?q=acid")
+    assert len(plain.data) >= MIN_SIZE
+    assert "Content-Encoding" not in plain.headers
+    response = client.get("/api/search?q=acid", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert gzip.decompress(response.data) == plain.data
+
+
+def test_streams_are_not_compressed(client):
+    body = {"chemicals": ["HCl", "NaOH"], "frames": 200}
+    response = client.post("/api/run-experiment/stream", json=body, headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+    assert json.loads(response.get_data(as_text=True).splitlines()[0])["event"] == "start"
+
+
+def test_json_is_compact_and_unescaped(vlab, client):
+    text = client.get("/api/reactions?fields=equation").get_data(as_text=True)
+    assert "₂" in text
+    assert ", " not in text and '": ' not in text
+    provider = FastJSONProvider(vlab.app)
+    value = {"b": 1.5, "a": [2], "when": datetime(2024, 1, 2), "big": 2 ** 70}
+    assert provider.dumps(value) == '{"a":[2],"b":1.5,"big":1180591620717411303424,"when":"Tue, 02 Jan 2024 00:00:00 GMT"}'
+
+
+def test_fields_projects_list_items(vlab, client):
+    reactions = client.get("/api/reactions?fields=name,id,no_such_field").get_json()
+    assert len(reactions) == len(vlab.CATALOG.reactions)
+    assert all(set(r) == {"id", "name"} for r in reactions)
+    chemicals = client.get("/api/chemicals?fields=symbol").get_json()
+    assert all(set(c) == {"symbol"} for c in chemicals)
@@ -0,0 +1,22 @@
+import pytest
+
+from calculators import calculate
+from equations import split_equation
+
+
+@pytest.mark.parametrize("equation, reactants, products", [
+    ("2H2 + O2 → 2H2O", [(2, "H2"), (1, "O2")], [(2, "H2O")]),
+    ("H2+O2->H2O", [(1, "H2"), (1, "O2")], [(1, "H2O")]),
+    ("CH4 +2O2 → CO2+ 2H2O", [(1, "CH4"), (2, "O2")], [(1, "CO2"), (2, "H2O")]),
+    ("Na+ + Cl- -> NaCl", [(1, "Na+"), (1, "Cl-")], [(1, "NaCl")]),
+    ("Na++Cl- = NaCl", [(1, "Na+"), (1, "Cl-")], [(1, "NaCl")]),
+    ("NH4^+ + OH- -> NH3 + H2O", [(1, "NH4^+"), (1, "OH-")], [(1, "NH3"), (1, "H2O")]),
+    ("Fe3+ + e- -> Fe2+", [(1, "Fe3+"), (1, "e-")], [(1, "Fe2+")]),
+    ("H₂O + electrical energy → H₂ + O₂", [(1, "H₂O")], [(1, "H₂"), (1, "O₂")]),
+])
+def test_split_equation(equation, reactants, products):
+    assert split_equation(equation) == (reactants, products)
+
+
+def test_unspaced_plus_balances():
+    assert calculate("balance-equation", {"equation": "H2+O2->H2O"})["balanced"] == "2H2 + O2 -> 2H2O"
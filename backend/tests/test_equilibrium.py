@@ -0,0 +1,57 @@
+import math
+
+import numpy as np
+import pytest
+
+AMMONIA = {"reaction_id": "synthesis_ammonia", "temperature_c": {"start": 300, "stop": 600, "steps": 4},
+           "pressure_bar": [1, 200]}
+
+
+def solve(client, body):
+    response = client.post("/api/equilibrium", json=body)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def test_result_shape(client):
+    result = solve(client, AMMONIA)
+    assert result["shape"] == [4, 2]
+    assert result["temperature_c"] == [300.0, 400.0, 500.0, 600.0]
+    assert result["pressure_bar"] == [1.0, 200.0]
+    assert result["reaction"]["equation"] == "N₂ + 3H₂ ⇌ 2NH₃"
+    assert len(result["log10_k"]) == 4
+    for name in ("extent", "conversion"):
+        assert len(result[name]) == 8
+    assert set(result["composition"]) == {"N₂", "H₂", "NH₃"}
+    assert all(len(values) == 8 for values in result["composition"].values())
+    assert result["composition_unit"] == "mole_fraction"
+
+
+def test_ammonia_follows_van_t_hoff_and_le_chatelier(client):
+    result = solve(client, AMMONIA)
+    kelvin = np.array(result["temperature_c"]) + 273.15
+    expected = result["log10_k_25c"] - result["delta_h_kj"] * 1000 / (8.314462618 * math.log(10)) * (
+        1 / kelvin - 1 / 298.15)
+    assert result["log10_k"] == pytest.approx(expected, abs=1e-3)
+
+    conversion = np.array(result["conversion"]).reshape(result["shape"])
+    # Exothermic: less conversion when hotter. Fewer gas moles: more conversion at higher pressure.
+    assert (np.diff(conversion, axis=0) < 0).all()
+    assert (conversion[:, 1] > conversion[:, 0]).all()
+
+    x = {species: np.array(values).reshape(result["shape"]) for species, values in result["composition"].items()}
+    assert sum(x.values()) == pytest.approx(np.ones(result["shape"]), abs=1e-5)
+    pressure = np.array(result["pressure_bar"])[None, :]
+    log10_kp = np.log10(x["NH₃"] ** 2 / (x["N₂"] * x["H₂"] ** 3) / pressure ** 2)
+    assert log10_kp == pytest.approx(np.array(result["log10_k"])[:, None] * np.ones(result["shape"]), abs=0.01)
+
+
+@pytest.mark.parametrize("body", [
+    {"reaction_id": "no_such_reaction"},
+    {"equation": "A ⇌ B"},
+    {"equation": "A ⇌ B", "log10_k": 1, "phase": "plasma"},
+    dict(AMMONIA, initial={"N₂": -1}),
+    [AMMONIA],
+])
+def test_invalid_requests_are_rejected(client, body):
+    assert client.post("/api/equilibrium", json=body).status_code == 400
@@ -0,0 +1,16 @@
+import json
+
+
+def test_long_realtime_stream_is_rejected(vlab, client):
+    body = {"chemicals": ["HCl", "NaOH"], "duration_s": vlab.WSGI_REALTIME_MAX_S + 1, "realtime": True}
+    response = client.post("/api/run-experiment/stream", json=body)
+    assert response.status_code == 400
+    assert "/ws/run-experiment" in response.get_json()["error"]
+
+
+def test_stream_runs_every_frame(client):
+    body = {"chemicals": ["HCl", "NaOH"], "duration_s": 3600, "frames": 50}
+    events = [json.loads(line) for line in client.post("/api/run-experiment/stream", json=body).get_data(as_text=True)
+              .splitlines()]
+    assert [e["event"] for e in events] == ["start"] + ["frame"] * 51 + ["end"]
+    assert events[-1]["final_conversion"] == events[-2]["conversion"]
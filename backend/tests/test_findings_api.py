@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from findings_store import FindingsStore
+
+
+@pytest.fixture
+def store(vlab, monkeypatch, tmp_path):
+    store = FindingsStore(str(tmp_path / "findings.db"), retention=None)
+    for i in range(7):
+        store.add({"id": f"f{i}", "lab": "Chemistry" if i % 2 else "Biology", "experiment": f"titration {i}",
+                   "timestamp": f"2024-01-0{i + 1}T00:00:00"})
+    monkeypatch.setattr(vlab, "FINDINGS_STORE", store)
+    yield store
+    store.close()
+
+
+def test_pages_follow_the_cursor(client, store):
+    ids = []
+    url = "/api/findings?limit=3"
+    while url:
+        response = client.get(url)
+        ids += [f["id"] for f in response.get_json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        url = f"/api/findings?limit=3&after={cursor}" if cursor else None
+    assert ids == [f"f{i}" for i in reversed(range(7))]
+
+
+def test_filters(client, store):
+    def ids(query):
+        return [f["id"] for f in client.get(f"/api/findings?{query}").get_json()]
+
+    assert ids("lab=chemistry") == ["f5", "f3", "f1"]
+    assert ids("experiment=titration%203") == ["f3"]
+    assert ids("since=2024-01-03&until=2024-01-04T00:00:00") == ["f3", "f2"]
+    assert ids("lab=biology&limit=1") == ["f6"]
+
+
+def test_ndjson_streams_every_match(client, store):
+    response = client.get("/api/findings?format=ndjson&lab=Biology")
+    assert response.mimetype == "application/x-ndjson"
+    assert [json.loads(line)["id"] for line in response.get_data(as_text=True).splitlines()] == ["f6", "f4", "f2", "f0"]
+
+
+@pytest.mark.parametrize("query", ["limit=ten", "after=x", "since=yesterday"])
+def test_bad_parameters_are_rejected(client, store, query):
+    assert client.get(f"/api/findings?{query}").status_code == 400
+
+
+def test_import_then_export_round_trips(vlab, client, monkeypatch, tmp_path):
+    store = FindingsStore(str(tmp_path / "import.db"), retention=5, compact_interval=3600)
+    monkeypatch.setattr(vlab, "FINDINGS_STORE", store)
+    lines = [json.dumps({"id": f"n{i}", "lab": "Physics", "timestamp": f"2024-02-0{i + 1}T12:00:00"})
+             for i in range(8)]
+    lines.insert(3, "{broken")
+    response = client.post("/api/findings/import", data="\n".join(lines) + "\n",
+                           content_type="application/x-ndjson")
+    assert response.get_json() == {"imported": 8, "rejected": 1,
+                                   "errors": [{"line": 4, "error": response.get_json()["errors"][0]["error"]}]}
+
+    exported = client.get("/api/findings/export").get_data(as_text=True).splitlines()
+    assert [json.loads(line)["id"] for line in exported] == ["n3", "n4", "n5", "n6", "n7"]
+    assert json.loads(exported[0])["timestamp"] == "2024-02-04T12:00:00"
+    # The background compactor may already have run; either way three rows go.
+    store.compact()
+    assert store.compacted == 3
+    assert client.get("/api/findings/export").get_data(as_text=True).splitlines() == exported
+    store.close()
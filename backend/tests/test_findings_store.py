@@ -0,0 +1,61 @@
+import json
+
+from findings_store import FindingsStore, parse_import
+
+
+def test_parse_import_reports_invalid_lines():
+    lines = [
+        json.dumps({"id": "a", "title": "First", "timestamp": "2024-01-02T03:04:05"}),
+        "",
+        "not json",
+        json.dumps(["not", "an", "object"]),
+        json.dumps({"title": "Second"}).encode(),
+    ]
+    summary = {"rejected": 0, "errors": []}
+    findings = list(parse_import(lines, summary, max_errors=1))
+    assert [f["title"] for f in findings] == ["First", "Second"]
+    assert findings[0]["timestamp"] == "2024-01-02T03:04:05"
+    assert findings[1]["id"].endswith("_5")
+    assert summary["rejected"] == 2
+    assert [e["line"] for e in summary["errors"]] == [3]
+
+
+def test_add_many_stores_every_batch(tmp_path):
+    store = FindingsStore(str(tmp_path / "findings.db"), retention=None)
+    summary = {"rejected": 0, "errors": []}
+    lines = [json.dumps({"id": f"f{i}", "title": str(i)}) for i in range(25)]
+    try:
+        assert store.add_many(parse_import(lines, summary), batch_size=10) == 25
+        assert [f["id"] for f in store.recent(3)] == ["f24", "f23", "f22"]
+    finally:
+        store.close()
+
+
+def uncompacted_store(tmp_path, count, retention):
+    store = FindingsStore(str(tmp_path / "findings.db"), retention=retention)
+    # Insert past the retention limit without waking the compactor.
+    conn = store._connect()
+    for i in range(count):
+        store._insert(conn, {"id": f"f{i}", "lab": "chem" if i % 2 else "bio"})
+    return store
+
+
+def test_export_skips_rows_past_retention(tmp_path):
+    store = uncompacted_store(tmp_path, 10, retention=4)
+    try:
+        assert [json.loads(body)["id"] for body in store.export_json(batch_size=3)] == ["f6", "f7", "f8", "f9"]
+        assert [json.loads(body)["id"] for body in store.export_json(lab="chem")] == ["f7", "f9"]
+    finally:
+        store.close()
+
+
+def test_pages_skip_rows_past_retention(tmp_path):
+    store = uncompacted_store(tmp_path, 10, retention=4)
+    try:
+        assert [seq for seq, _ in store.page_json(limit=10, lab="bio")] == [9, 7]
+        assert [seq for seq, _ in store.page_json(limit=10, after=8)] == [7]
+        assert [json.loads(body)["id"] for body in store.iter_json(batch_size=1)] == ["f9", "f8", "f7", "f6"]
+        assert store.compact() == 6
+        assert [seq for seq, _ in store.page_json(lab="chem")] == [10, 8]
+    finally:
+        store.close()
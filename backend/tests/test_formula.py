@@ -0,0 +1,44 @@
+import pytest
+
+from balancer import balance_equation
+from formula import molar_mass, parse_formula
+
+
+@pytest.mark.parametrize("formula, elements, charge", [
+    ("Ca(OH)₂", {"Ca": 1, "O": 2, "H": 2}, 0),
+    ("CuSO4·5H2O", {"Cu": 1, "S": 1, "O": 9, "H": 10}, 0),
+    ("Fe3+", {"Fe": 1}, 3),
+    ("Cu2+", {"Cu": 1}, 2),
+    ("O2-", {"O": 1}, -2),
+    ("Cl-", {"Cl": 1}, -1),
+    ("NO3-", {"N": 1, "O": 3}, -1),
+    ("NH4+", {"N": 1, "H": 4}, 1),
+    ("SO₄²⁻", {"S": 1, "O": 4}, -2),
+    ("SO4^2-", {"S": 1, "O": 4}, -2),
+    ("N3^-", {"N": 3}, -1),
+    ("Hg2^2+", {"Hg": 2}, 2),
+])
+def test_parse_formula(formula, elements, charge):
+    parsed = parse_formula(formula)
+    assert dict(parsed.elements) == elements
+    assert parsed.charge == charge
+
+
+@pytest.mark.parametrize("formula", ["SO42-", "H0", "0H2O", "Xx2", "Ca(OH", ""])
+def test_invalid_formulas(formula):
+    with pytest.raises(ValueError):
+        parse_formula(formula)
+
+
+def test_molar_mass():
+    assert molar_mass("H2O") == pytest.approx(18.015)
+
+
+@pytest.mark.parametrize("equation, balanced", [
+    ("Fe3+ + e- -> Fe2+", "Fe3+ + e- -> Fe2+"),
+    ("Cu2+ + Zn -> Cu + Zn2+", "Cu2+ + Zn -> Cu + Zn2+"),
+    ("MnO4- + Fe2+ + H+ -> Mn2+ + Fe3+ + H2O", "MnO4- + 5Fe2+ + 8H+ -> Mn2+ + 5Fe3+ + 4H2O"),
+    ("Cr2O7^2- + Fe2+ + H+ -> Cr3+ + Fe3+ + H2O", "Cr2O7^2- + 6Fe2+ + 14H+ -> 2Cr3+ + 6Fe3+ + 7H2O"),
+])
+def test_balance_ionic_equations(equation, balanced):
+    assert balance_equation(equation).equation == balanced
@@ -0,0 +1,27 @@
+import time
+
+import pytest
+
+SIMULATION = {"chemicals": ["HCl", "NaOH"], "tools": ["Bunsen Burner"], "heat": 40, "duration_s": 30, "frames": 10}
+
+
+def wait(client, job_id, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        body = client.get(f"/api/jobs/{job_id}").get_json()
+        if body["state"] in ("done", "failed", "cancelled"):
+            return body
+        time.sleep(0.05)
+    pytest.fail(f"job {job_id} did not finish")
+
+
+def test_simulation_job_keeps_frame_count(client):
+    response = client.post("/api/jobs/simulation", json=SIMULATION)
+    assert response.status_code == 202
+    body = wait(client, response.get_json()["id"])
+    assert body["state"] == "done"
+    result = body["result"]
+    assert result["frames"] == 10
+    assert len(result["results"]) == 11
+    assert result["final_conversion"] == result["results"][-1]["conversion"]
+    assert result["peak_temperature_c"] == max(frame["temperature_c"] for frame in result["results"])
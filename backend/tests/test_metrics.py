@@ -0,0 +1,36 @@
+import re
+
+from metrics import Metrics
+
+
+def sample(text, series):
+    match = re.search(rf"^{re.escape(series)} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+def test_histogram_buckets_are_cumulative():
+    metrics = Metrics(prefix="t")
+    for value in (0.0002, 0.003, 0.003, 7.0, 60.0):
+        metrics.observe("work_seconds", value, (("kind", 'say "hi"'),))
+    text = metrics.render()
+    labels = 'kind="say \\"hi\\""'
+    assert "# TYPE t_work_seconds histogram" in text
+    assert sample(text, f't_work_seconds_bucket{{{labels},le="0.0005"}}') == 1
+    assert sample(text, f't_work_seconds_bucket{{{labels},le="0.005"}}') == 3
+    assert sample(text, f't_work_seconds_bucket{{{labels},le="10.0"}}') == 4
+    assert sample(text, f't_work_seconds_bucket{{{labels},le="+Inf"}}') == 5
+    assert sample(text, f"t_work_seconds_count{{{labels}}}") == 5
+
+
+def test_requests_are_counted_by_route_template(client):
+    series = 'vlab_http_requests_total{method="GET",route="/api/reactions/<reaction_id>",status="404"}'
+    before = sample(client.get("/api/metrics").get_data(as_text=True), series)
+    client.get("/api/reactions/no-such-reaction")
+    client.get("/api/reactions/another-missing-one")
+    response = client.get("/api/metrics")
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    text = response.get_data(as_text=True)
+    assert sample(text, series) == before + 2
+    assert "/api/reactions/no-such-reaction" not in text
+    assert 'vlab_http_request_duration_seconds_count{method="GET",route="/api/reactions/<reaction_id>"}' in text
+    assert 'vlab_cache_entries{cache="formula"}' in text
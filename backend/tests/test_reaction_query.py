@@ -0,0 +1,18 @@
+def query_ids(client, params):
+    body = client.get(f"/api/reactions/query?fields=id&limit=100&{params}").get_json()
+    return {reaction["id"] for reaction in body["reactions"]}
+
+
+def test_reactant_filter_reads_equations(client):
+    # O₂ is in these equations but missing from their reactants lists.
+    assert {"combustion_methane", "combustion_hydrogen", "rusting_iron"} <= query_ids(client, "reactant=O2")
+
+
+def test_product_filter_reads_equations(client):
+    assert {"combustion_methane", "neutralization", "titration_vinegar"} <= query_ids(client, "product=H2O")
+
+
+def test_sides_are_not_mixed(client):
+    assert "neutralization" not in query_ids(client, "reactant=H2O")
+    assert query_ids(client, "reactant=O2&product=CO2") == {"combustion_methane", "combustion_ethanol",
+                                                           "glucose_oxidation"}
@@ -0,0 +1,62 @@
+import gzip
+import shutil
+
+import pytest
+
+from catalog import CatalogLoader
+
+
+def test_matching_etag_gets_304(client):
+    first = client.get("/api/reactions")
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "public, max-age=60"
+    again = client.get("/api/reactions", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.data == b""
+    assert client.get("/api/reactions", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+
+def test_gzip_variant_has_its_own_etag(client):
+    plain = client.get("/api/reactions")
+    response = client.get("/api/reactions", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert gzip.decompress(response.data) == plain.data
+    assert response.headers["ETag"] == plain.headers["ETag"][:-1] + '-gzip"'
+    headers = {"Accept-Encoding": "gzip", "If-None-Match": response.headers["ETag"]}
+    assert client.get("/api/reactions", headers=headers).status_code == 304
+
+
+def test_brotli_is_preferred_when_accepted(client):
+    brotli = pytest.importorskip("brotli")
+    plain = client.get("/api/reactions")
+    response = client.get("/api/reactions", headers={"Accept-Encoding": "gzip, deflate, br"})
+    assert response.headers["Content-Encoding"] == "br"
+    assert brotli.decompress(response.data) == plain.data
+    weighted = client.get("/api/reactions", headers={"Accept-Encoding": "br;q=0.5, gzip"})
+    assert weighted.headers["Content-Encoding"] == "gzip"
+
+
+def test_small_bodies_are_not_compressed(client):
+    response = client.get("/api/categories", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+
+
+def test_reload_invalidates_cached_responses(vlab, client, monkeypatch, tmp_path):
+    directory = tmp_path / "catalog"
+    shutil.copytree(vlab.CATALOG_LOADER.directory, directory)
+    monkeypatch.setattr(vlab, "CATALOG_LOADER", CatalogLoader(str(directory), check_interval=0))
+    vlab.reload_catalog()
+    before = client.get("/api/stats")
+
+    tools = directory / "tools.jsonl"
+    tools.write_text("".join(tools.read_text(encoding="utf-8").splitlines(keepends=True)[1:]), encoding="utf-8")
+    manifest = directory / "manifest.json"
+    manifest.write_text(manifest.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+
+    after = client.get("/api/stats", headers={"If-None-Match": before.headers["ETag"]})
+    assert after.status_code == 200
+    assert after.headers["ETag"] != before.headers["ETag"]
+    assert after.get_json()["total_tools"] == before.get_json()["total_tools"] - 1
+    monkeypatch.undo()
+    vlab.reload_catalog()
@@ -0,0 +1,54 @@
+import pytest
+
+WATER = {"chemicals": ["Water"], "tools": ["Bunsen Burner"]}
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(vlab):
+    vlab.EXPERIMENT_CACHE.clear()
+
+
+def measurements_of(client, body):
+    return client.post("/api/run-experiment", json=body).get_json()["measurements"]
+
+
+def measurements(client, heat, volume_ml):
+    return measurements_of(client, dict(WATER, heat=heat, volume_ml=volume_ml))
+
+
+def test_model_runs_on_unrounded_inputs(client):
+    result = measurements(client, 33.33, 777.77)
+    assert result["temperature_c"] == 29.2
+    assert (result["heat_level"], result["volume_ml"]) == (33.3, 777.8)
+
+
+def test_inputs_are_clamped(client):
+    result = measurements(client, 250, 10)
+    assert (result["heat_level"], result["volume_ml"]) == (100, 50)
+
+
+def test_cache_key_is_quantized(vlab, client):
+    measurements(client, 33.33, 777.77)
+    misses = vlab.EXPERIMENT_CACHE.misses
+    measurements(client, 33.34, 777.78)
+    assert vlab.EXPERIMENT_CACHE.misses == misses
+
+
+def test_sweep_matches_single_runs(client):
+    mixture = {"chemicals": ["HCl", "NaOH"], "tools": ["Bunsen Burner", "pH Meter"]}
+    sweep = dict(mixture, heat={"start": 0, "stop": 100, "steps": 5}, volume_ml=[50, 333.3, 2000])
+    grid = client.post("/api/run-experiment/sweep", json=sweep).get_json()
+    assert grid["shape"] == [5, 3]
+    assert grid["heat"] == [0, 25, 50, 75, 100]
+    columns = grid["measurements"]
+    for i, (heat, volume) in enumerate(zip(columns["heat_level"], columns["volume_ml"])):
+        single = measurements_of(client, dict(mixture, heat=heat, volume_ml=volume))
+        assert (single["temperature_c"], single["rate"]) == (columns["temperature_c"][i], columns["rate"][i])
+        assert single["ph"] == columns["ph"]
+
+
+def test_sweep_rejects_oversized_grids(vlab, client):
+    steps = int(vlab.SWEEP_MAX_POINTS ** 0.5) + 1
+    body = {"chemicals": ["Water"], "heat": {"start": 0, "stop": 100, "steps": steps},
+            "volume_ml": {"start": 50, "stop": 2000, "steps": steps}}
+    assert client.post("/api/run-experiment/sweep", json=body).status_code == 400
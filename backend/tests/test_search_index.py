@@ -0,0 +1,42 @@
+import pytest
+
+from benchmarks.synthetic import synthetic_reactions
+from search_index import SearchIndex, _TOKEN_RE, normalize
+
+QUERIES = ["o", "s", "br", "acid", "acid-base of cl", "combustion h", "decomposition s", "synthesis of na", "h2o"]
+
+
+def exact_scores(index, query):
+    """Every document's score, best first, by scoring the whole catalog."""
+    groups = index._groups(_TOKEN_RE.findall(normalize(query)), prefix=True)
+    postings = [[index._postings[term] for term in terms] for terms in groups]
+    scores = (index._score(postings, doc) for doc in range(len(index)))
+    return sorted((score for score in scores if score is not None), reverse=True)
+
+
+@pytest.fixture(scope="module")
+def synthetic():
+    reactions = synthetic_reactions(5000)
+    return SearchIndex(reactions), {reaction_id: doc for doc, reaction_id in enumerate(reactions)}
+
+
+@pytest.mark.parametrize("query", QUERIES)
+@pytest.mark.parametrize("limit", [1, 10])
+def test_limited_search_returns_true_top_scores(synthetic, query, limit):
+    index, positions = synthetic
+    groups = index._groups(_TOKEN_RE.findall(normalize(query)), prefix=True)
+    postings = [[index._postings[term] for term in terms] for terms in groups]
+    found = [index._score(postings, positions[r["id"]]) for r in index.search(query, limit=limit)]
+    assert found == pytest.approx(exact_scores(index, query)[:limit])
+
+
+def test_unlimited_search_returns_every_match(synthetic):
+    index, _ = synthetic
+    assert len(index.search("acid-base of c")) == len(exact_scores(index, "acid-base of c"))
+
+
+def test_api_search_returns_every_match_without_limit(vlab, client):
+    everything = client.get("/api/search?q=").get_json()
+    assert len(everything) == len(vlab.CATALOG.reactions)
+    assert len(client.get("/api/search?q=&limit=5").get_json()) == 5
+    assert client.get("/api/search?q=x&limit=ten").status_code == 400
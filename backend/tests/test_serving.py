@@ -0,0 +1,84 @@
+import http.client
+import json
+import os
+import runpy
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG = os.path.join(BACKEND_DIR, "gunicorn.conf.py")
+
+
+def test_config_reads_environment(monkeypatch):
+    monkeypatch.setenv("VLAB_BIND", "127.0.0.1:8001")
+    monkeypatch.setenv("VLAB_WORKERS", "3")
+    monkeypatch.setenv("VLAB_THREADS", "16")
+    monkeypatch.setenv("VLAB_ACCESS_LOG", "")
+    monkeypatch.setenv("VLAB_PRELOAD", "0")
+    config = runpy.run_path(CONFIG)
+    assert (config["bind"], config["workers"], config["threads"]) == ("127.0.0.1:8001", 3, 16)
+    assert config["accesslog"] is None
+    assert config["preload_app"] is False
+    assert config["worker_class"] == "gthread"
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def get(port, path, timeout=10):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+    conn.request("GET", path)
+    response = conn.getresponse()
+    return response.status, response.read()
+
+
+@pytest.fixture
+def server():
+    pytest.importorskip("gunicorn")
+    port = free_port()
+    env = dict(os.environ, VLAB_WORKERS="1", VLAB_BIND=f"127.0.0.1:{port}", VLAB_ACCESS_LOG="")
+    process = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", CONFIG], env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while True:
+        try:
+            if get(port, "/api/health", timeout=1)[0] == 200:
+                break
+        except OSError:
+            pass
+        if process.poll() is not None or time.monotonic() > deadline:
+            process.kill()
+            pytest.fail("gunicorn did not start")
+        time.sleep(0.2)
+    yield process, port
+    process.terminate()
+    process.wait(timeout=30)
+
+
+def test_graceful_reload_finishes_running_streams(server):
+    process, port = server
+    streamed = {}
+
+    def stream():
+        streamed["result"] = get(port, "/api/run-experiment/stream?chemicals=HCl&chemicals=NaOH"
+                                       "&duration_s=2&frames=4&realtime=1")
+
+    thread = threading.Thread(target=stream)
+    thread.start()
+    time.sleep(0.5)
+    process.send_signal(signal.SIGHUP)
+    thread.join(timeout=30)
+    status, body = streamed["result"]
+    assert status == 200
+    assert json.loads(body.splitlines()[-1])["event"] == "end"
+    assert get(port, "/api/stats")[0] == 200
+    assert process.poll() is None
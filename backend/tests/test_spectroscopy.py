@@ -0,0 +1,47 @@
+import json
+
+import numpy as np
+import pytest
+
+import spectroscopy
+
+DYE = {"name": "dye", "concentration": 1e-4, "bands": [{"center_nm": 500, "epsilon": 10000, "width_nm": 40}]}
+BODY = {"species": [DYE, {"name": "KMnO4", "concentration": 2e-4}], "path_length_cm": 1,
+        "start_nm": 400, "stop_nm": 600, "resolution_nm": 1, "components": True}
+
+
+def test_gaussian_band_follows_beer_lambert(client):
+    body = client.post("/api/spectroscopy/spectrum", json=dict(BODY, path_length_cm=2)).get_json()
+    assert (body["points"], body["step_nm"]) == (201, 1.0)
+    dye = body["species"][0]
+    assert (dye["lambda_max_nm"], dye["max_absorbance"]) == (500.0, 2.0)
+    # width_nm is the full width at half maximum.
+    assert dye["absorbance"][80] == dye["absorbance"][120] == 1.0
+    total = np.array(body["absorbance"])
+    parts = sum(np.array(s["absorbance"]) for s in body["species"])
+    assert total == pytest.approx(parts, abs=1e-5)
+
+
+def test_binary_body_matches_json(client):
+    body = client.post("/api/spectroscopy/spectrum", json=BODY).get_json()
+    response = client.post("/api/spectroscopy/spectrum", json=BODY,
+                           headers={"Accept": "application/octet-stream"})
+    assert response.headers["X-Spectrum-Points"] == "201"
+    assert response.headers["X-Spectrum-Rows"] == "3"
+    assert json.loads(response.headers["X-Spectrum-Species"]) == ["dye", "KMnO4"]
+    rows = np.frombuffer(response.data, dtype="<f4").reshape(3, 201)
+    assert rows[0] == pytest.approx(body["absorbance"], abs=1e-6)
+    assert rows[2] == pytest.approx(body["species"][1]["absorbance"], abs=1e-6)
+
+
+def test_repeated_spectra_come_from_the_cache(client):
+    client.post("/api/spectroscopy/spectrum", json=dict(BODY, stop_nm=650))
+    hits = spectroscopy.cache_info().hits
+    client.post("/api/spectroscopy/spectrum", json=dict(BODY, stop_nm=650, format="binary"))
+    assert spectroscopy.cache_info().hits == hits + 1
+
+
+@pytest.mark.parametrize("change", [{"species": []}, {"start_nm": 700}, {"format": "xml"},
+                                    {"species": [{"name": "unobtainium", "concentration": 1}]}])
+def test_invalid_requests_are_rejected(client, change):
+    assert client.post("/api/spectroscopy/spectrum", json=dict(BODY, **change)).status_code == 400
@@ -0,0 +1,50 @@
+import math
+
+import pytest
+
+
+def titrate(client, **body):
+    return client.post("/api/calculate/titration-curve", json=body)
+
+
+def test_strong_acid_strong_base(client):
+    curve = titrate(client, analyte="strong_acid", concentration=0.1, volume_ml=25).get_json()
+    assert curve["initial_ph"] == 1.0
+    [point] = curve["equivalence_points"]
+    assert (point["volume_ml"], point["ph"], point["sharp"]) == (25.0, 7.0, True)
+    assert len(curve["volume_ml"]) == len(curve["ph"]) == 400
+
+
+def test_weak_acid_matches_closed_form(client):
+    curve = titrate(client, analyte="weak_acid", pka=4.76, concentration=0.1, volume_ml=25).get_json()
+    ka = 10 ** -4.76
+    assert curve["initial_ph"] == pytest.approx(-math.log10((-ka + math.sqrt(ka * ka + 0.4 * ka)) / 2), abs=1e-3)
+    [point] = curve["equivalence_points"]
+    # 0.05 M acetate at the equivalence point.
+    assert point["ph"] == pytest.approx(7 + 0.5 * (4.76 + math.log10(0.05)), abs=1e-3)
+    assert point["inflection_volume_ml"] == pytest.approx(25.0, abs=0.01)
+
+
+def test_polyprotic_equivalence_points(client):
+    curve = titrate(client, analyte="weak_acid", pka=[2.15, 7.2, 12.35], concentration=0.1, volume_ml=25).get_json()
+    points = curve["equivalence_points"]
+    assert [p["volume_ml"] for p in points] == [25.0, 50.0, 75.0]
+    # The third proton of phosphoric acid is too weak to show a jump.
+    assert [p["sharp"] for p in points] == [True, True, False]
+
+
+def test_fewer_points_than_default_plot_points(client):
+    response = titrate(client, analyte="weak_acid", pka=4.76, concentration=0.1, points=100)
+    assert response.status_code == 200
+    assert len(response.get_json()["ph"]) == 100
+    response = titrate(client, analyte="weak_acid", pka=4.76, concentration=0.1, points=100, plot_points=101)
+    assert response.status_code == 400
+
+
+def test_buffer_follows_henderson_hasselbalch(client):
+    body = {"analyte": "weak_acid", "pka": 4.76, "concentration": 0.1, "conjugate_concentration": 0.1}
+    result = client.post("/api/calculate/buffer", json=body).get_json()
+    assert result["pH"] == pytest.approx(4.76, abs=0.01)
+    assert result["buffer_capacity"] > 0.1
+    body["analyte"] = "strong_acid"
+    assert client.post("/api/calculate/buffer", json=body).status_code == 400
@@ -0,0 +1,10 @@
+"""WSGI entry point for production servers.
+
+Run from the repository root with the bundled configuration::
+
+    gunicorn -c backend/gunicorn.conf.py
+
+or point any WSGI server at ``wsgi:application`` with ``backend/`` on the
+Python path. ``python backend/app.py`` remains the development server.
+"""
+from app import app as application  # noqa: F401